@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# coding: utf8
+
+"""
+    benchmark.py
+    Times the stages of the workhour report pipeline.
+
+    Every stage (days_of_month, month_workdays, distribute_hours,
+    default_tabulation, HTML building and PDF rendering) runs over a batch
+    of synthetic person-months. Per stage the throughput, the p50/p99
+    latency and the peak memory are reported, optionally as JSON that a
+    later run can be compared against.
+
+    @licence: GNU GENERAL PUBLIC LICENSE
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+
+DATUM = '01.01.2017'
+
+
+def load_generator():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'workhour-report-generator.py')
+    spec = importlib.util.spec_from_file_location('workhour_report_generator', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_people(size, year, seed):
+    rng = random.Random(seed)
+    return [argparse.Namespace(
+        firstname='Vorname{}'.format(i),
+        lastname='Nachname{}'.format(i),
+        hours=rng.randint(8, 40),
+        monthly=40,
+        year=year + i // 12 % 5,
+        month=i % 12 + 1,
+        first=1,
+        last=31,
+        institution='FB Mathematik/Informatik, Institut für Informatik',
+        signature='',
+        logo='',
+        state='NI',
+        config_profile=None,
+        begin=8,
+        max_day=10,
+        max_week=48,
+        blocked='',
+        seed=seed,
+    ) for i in range(size)]
+
+
+def pipeline(w, renderer, tmpdir):
+    """Returns the stages as (name, function) pairs, each working on one item."""
+
+    def days(item):
+        item.days = w.days_of_month(item.year, item.month)
+
+    def workdays(item):
+        item.workdays = w.month_workdays(item.year, item.month, item.state)
+
+    def distribution(item):
+        # the same call report_table() makes
+        item.used_days, = w.distribute_hours(
+            [(item.year, item.month, item.hours, item.first, item.last, item.state,
+              w.blocked_dates(item.blocked, item.year, item.month))],
+            seed=w.report_seed(item), max_hours_per_day=item.max_day,
+            max_hours_per_week=item.max_week)
+
+    def tabulation(item):
+        day_to_hours = dict(item.used_days)
+        item.table = w.default_tabulation(
+            [(day, day_to_hours.get(day, 0)) for day in item.days], item.month, item.year,
+            w.get_profile(item.config_profile).language, item.begin)
+
+    def html(item):
+        item.html = w.build_html(item, item.table, DATUM)
+
+    def pdf(item):
+        if renderer == 'stub':
+            item.pdf = item.html.encode('utf-8')
+        elif renderer == 'native':
+            f = io.BytesIO()
+            doc = w.PDFDocument(f)
+            w.render_native(item, item.table, DATUM, doc)
+            doc.close()
+            item.pdf = f.getvalue()
+        else:
+            filename = os.path.join(tmpdir, w.report_filename(item))
+            if not w.write_pdf(item.html, filename):
+                raise RuntimeError('wkhtmltopdf failed')
+
+    return [
+        ('days_of_month', days),
+        ('month_workdays', workdays),
+        ('distribute_hours', distribution),
+        ('default_tabulation', tabulation),
+        ('build_html', html),
+        ('render_pdf_' + renderer, pdf),
+    ]
+
+
+def run_stage(w, name, stage, items, memory):
+    if name == 'month_workdays':
+        # include the one-time holiday and workday computation
+        w.HOLIDAYS.clear()
+        w.WORKDAYS.clear()
+
+    latencies = []
+    start = perf_counter()
+    for item in items:
+        t = perf_counter()
+        stage(item)
+        latencies.append(perf_counter() - t)
+    total = perf_counter() - start
+    latencies.sort()
+
+    result = {
+        'count': len(items),
+        'total_s': total,
+        'per_s': len(items) / total if total else None,
+        'p50_ms': 1000 * w.percentile(latencies, 50),
+        'p99_ms': 1000 * w.percentile(latencies, 99),
+    }
+
+    if memory:
+        # a second pass, tracemalloc would distort the timings above
+        tracemalloc.start()
+        for item in items:
+            stage(item)
+        result['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Returns the stages whose p50 latency got slower than the tolerance allows."""
+    regressions = []
+    for size, stages in results['sizes'].items():
+        for name, result in stages.items():
+            old = baseline.get('sizes', {}).get(size, {}).get(name)
+            if old and old['p50_ms'] and result['p50_ms'] > old['p50_ms'] * (1 + tolerance):
+                regressions.append((size, name, old['p50_ms'], result['p50_ms']))
+    return regressions
+
+
+def read_args():
+    opts = argparse.ArgumentParser(description='Benchmark the workhour report pipeline.')
+    opts.add_argument('--sizes', dest='sizes', type=str, default='10,100',
+                      help='comma separated batch sizes of synthetic person-months')
+    opts.add_argument('--year', dest='year', type=int, default=2017,
+                      help='first year of the synthetic reports')
+    opts.add_argument('--renderer', dest='renderer', type=str, default='stub',
+                      choices=['stub', 'native', 'wkhtmltopdf'],
+                      help='PDF renderer, stub only encodes the HTML')
+    opts.add_argument('--seed', dest='seed', type=int, default=0,
+                      help='seed for the synthetic data and the distribution')
+    opts.add_argument('--no-memory', dest='memory', action='store_false',
+                      help='skip measuring the peak memory per stage')
+    opts.add_argument('--json', dest='json', type=str,
+                      help='write the results as JSON to this file, - for stdout')
+    opts.add_argument('--compare', dest='compare', type=str,
+                      help='JSON results of an earlier run to compare with')
+    opts.add_argument('--tolerance', dest='tolerance', type=float, default=0.25,
+                      help='allowed slowdown of the p50 latency against --compare')
+    return opts.parse_args()
+
+
+def main():
+    args = read_args()
+    w = load_generator()
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'renderer': args.renderer,
+        'sizes': {},
+    }
+
+    out = sys.stderr if args.json == '-' else sys.stdout
+    print('{:>6}  {:<24} {:>12} {:>10} {:>10} {:>10}'.format(
+        'size', 'stage', 'items/s', 'p50 ms', 'p99 ms', 'peak KiB'), file=out)
+
+    with tempfile.TemporaryDirectory(prefix='workhour-bench-') as tmpdir:
+        for size in map(int, args.sizes.split(',')):
+            random.seed(args.seed)
+            items = synthetic_people(size, args.year, args.seed)
+            stages = results['sizes'][str(size)] = {}
+            for name, stage in pipeline(w, args.renderer, tmpdir):
+                result = stages[name] = run_stage(w, name, stage, items, args.memory)
+                print('{:>6}  {:<24} {:>12.1f} {:>10.3f} {:>10.3f} {:>10}'.format(
+                    size, name, result['per_s'] or 0, result['p50_ms'], result['p99_ms'],
+                    '{:.1f}'.format(result['peak_kib']) if 'peak_kib' in result else '-'),
+                    file=out)
+
+    if args.json == '-':
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for size, name, old, new in regressions:
+            print('REGRESSION size {} {}: p50 {:.3f}ms -> {:.3f}ms'.format(size, name, old, new),
+                  file=out)
+        if regressions:
+            exit(1)
+
+
+if __name__ == '__main__':
+    main()
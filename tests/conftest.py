@@ -0,0 +1,36 @@
+import importlib.util
+import os
+import stat
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def w():
+    """The generator script, loaded as a module."""
+    path = os.path.join(ROOT, 'workhour-report-generator.py')
+    spec = importlib.util.spec_from_file_location('workhour_report_generator', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fake_wkhtmltopdf(tmp_path, monkeypatch):
+    """
+    Puts a wkhtmltopdf on the PATH that runs the given Python source, with
+    sys, time and shlex imported. Returns the directory it is in.
+    """
+    def install(source):
+        bindir = tmp_path / 'bin'
+        bindir.mkdir()
+        script = bindir / 'wkhtmltopdf'
+        script.write_text('#!{}\nimport shlex, sys, time\n{}'.format(sys.executable, source))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv('PATH', '{}{}{}'.format(bindir, os.pathsep, os.environ['PATH']))
+        return bindir
+    return install
@@ -0,0 +1,51 @@
+import sys
+
+
+FAKE_WKHTMLTOPDF = '''
+def convert(args):
+    args = [a for a in args if not a.startswith('--')]
+    open(args[-1], 'wb').write(b'%PDF-fake\\n')
+    sys.stderr.write('Done\\n')
+    sys.stderr.flush()
+
+if sys.argv[1:] == ['--read-args-from-stdin']:
+    for line in sys.stdin:
+        convert(shlex.split(line))
+else:
+    sys.stdin.buffer.read()
+    convert(sys.argv[1:])
+'''
+
+
+def run_batch(w, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['workhour-report-generator.py', '--batch', 'roster.csv',
+                                      '--checkpoint', 'roster.done', '--workers', '1'])
+    args = w.read_args()
+    w.apply_profile(args)
+    return w.run(args, '01.01.2017')
+
+
+def test_checkpoint_creates_edited_rows_again(w, tmp_path, fake_wkhtmltopdf, monkeypatch, capsys):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    monkeypatch.chdir(tmp_path)
+    roster = tmp_path / 'roster.csv'
+    roster.write_text('firstname,lastname,hours,year,month\n'
+                      'Jane,Roe,20,2017,1\n'
+                      'John,Doe,20,2017,1\n')
+    rows = list(w.manifest_rows('roster.csv'))
+    # as left behind by a run that stopped after the first two rows
+    (tmp_path / 'roster.done').write_text(''.join(
+        '{}\t{}\tx.pdf\n'.format(num, w.row_digest(row)) for num, row in rows))
+    roster.write_text('firstname,lastname,hours,year,month\n'
+                      'Jane,Roe,20,2017,1\n'
+                      'John,Doe,30,2017,1\n'
+                      'Max,Mustermann,20,2017,1\n')
+
+    assert run_batch(w, monkeypatch)
+
+    out = capsys.readouterr().out
+    assert '[1]' not in out
+    assert '[2] Row changed since it was done' in out
+    assert '[2] Report written to "doe-2017-01.pdf"' in out
+    assert '[3] Report written to "mustermann-2017-01.pdf"' in out
+    assert not (tmp_path / 'roster.done').exists()
@@ -0,0 +1,64 @@
+# --read-args-from-stdin mode: one conversion per line, "hang" in the output
+# name never finishes, "missing" fails like a missing image does, after "Done",
+# "late" too but prints its exit line only a while after "Done"
+FAKE_WKHTMLTOPDF = '''
+for line in sys.stdin:
+    html, path = shlex.split(line)[-2:]
+    out = path.rsplit('/', 1)[-1]
+    if 'hang' in out:
+        time.sleep(60)
+    with open(path, 'wb') as f:
+        f.write(b'%PDF fake')
+    sys.stderr.write('Loading pages (1/6)\\r[====]  100%\\r')
+    if 'missing' in out or 'late' in out:
+        sys.stderr.write('Warning: Failed to load file:///missing.png (ignore)\\n')
+    sys.stderr.write('Done\\n')
+    if 'late' in out:
+        sys.stderr.flush()
+        time.sleep(0.5)
+    if 'missing' in out or 'late' in out:
+        sys.stderr.write('Exit with code 1 due to network error: ContentNotFoundError\\n')
+    sys.stderr.flush()
+'''
+
+
+def convert_all(w, tmp_path, names, timeout=120):
+    pool = w.ConverterPool(workers=1, timeout=timeout)
+    try:
+        for num, name in enumerate(names):
+            pool.submit(num, '<html></html>', str(tmp_path / name))
+        results = dict(pool.result() for _ in names)
+    finally:
+        pool.close()
+    return [results[num] for num in range(len(names))]
+
+
+def test_worker_restarts_after_timeout(w, tmp_path, fake_wkhtmltopdf):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    errors = convert_all(w, tmp_path, ['hang.pdf', 'ok1.pdf', 'ok2.pdf'], timeout=2)
+    assert errors == ['timed out after 2s', None, None]
+
+
+def test_exit_code_after_done_fails_its_own_report(w, tmp_path, fake_wkhtmltopdf):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    errors = convert_all(w, tmp_path, ['missing.pdf', 'ok1.pdf', 'ok2.pdf'])
+    assert errors[0] == 'Exit with code 1 due to network error: ContentNotFoundError'
+    assert errors[1:] == [None, None]
+
+
+def test_late_exit_line_still_fails_its_own_report(w, tmp_path, fake_wkhtmltopdf):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    errors = convert_all(w, tmp_path, ['late.pdf', 'ok1.pdf', 'late2.pdf'])
+    assert errors == ['Exit with code 1 due to network error: ContentNotFoundError', None,
+                      'Exit with code 1 due to network error: ContentNotFoundError']
+
+
+def test_single_conversion_without_next_job(w, tmp_path, fake_wkhtmltopdf):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    pool = w.ConverterPool(workers=1)
+    try:
+        assert pool.convert('<html></html>', str(tmp_path / 'late.pdf')) == \
+            'Exit with code 1 due to network error: ContentNotFoundError'
+        assert pool.convert('<html></html>', str(tmp_path / 'ok.pdf')) is None
+    finally:
+        pool.close()
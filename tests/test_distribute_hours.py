@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+
+def week_sums(used_days):
+    weeks = {}
+    for date, hours in used_days:
+        week = date.isocalendar()[1]
+        weeks[week] = weeks.get(week, 0) + hours
+    return weeks
+
+
+@pytest.mark.parametrize('hours, max_day, max_week', [
+    (40, 10, 48),       # enough room, days are drawn at random
+    (150, 10, 40),      # weeks fill up, blocks are given out round by round
+    (170, 10, 48),
+    (90, 6, 30),
+])
+def test_limits_and_sum(w, hours, max_day, max_week):
+    blocked = w.blocked_dates('3,10-12', 2017, 1)
+    used_days, = w.distribute_hours([(2017, 1, hours, 1, 31, 'NI', blocked)], seed=1,
+                                    max_hours_per_day=max_day, max_hours_per_week=max_week)
+
+    assert sum(hours for _, hours in used_days) == hours
+    assert all(hours <= max_day for _, hours in used_days)
+    assert all(hours <= max_week for hours in week_sums(used_days).values())
+    worked = {date for date, hours in used_days if hours}
+    assert not worked & blocked
+    assert all(date.weekday() < 5 for date in worked)
+
+
+def test_range_of_days(w):
+    used_days, = w.distribute_hours([(2017, 1, 40, 10, 20, 'NI', set())], seed=1)
+    assert {date.day for date, _ in used_days} <= set(range(10, 21))
+    assert sum(hours for _, hours in used_days) == 40
+
+
+def test_same_seed_same_days(w):
+    plans = [(2017, 3, 60, 1, 31, 'NI', set())]
+    assert w.distribute_hours(plans, seed=7) == w.distribute_hours(plans, seed=7)
+
+
+def test_infeasible_plan_names_the_limit(w):
+    blocked = w.blocked_dates('2017-01-02:2017-01-06', 2017, 1)
+    error, = w.distribute_hours([(2017, 1, 200, 1, 31, 'NI', blocked)], seed=1,
+                                max_hours_per_week=20)
+    assert isinstance(error, ValueError)
+    assert str(error) == (
+        '200h do not fit into 01/2017: 17 free workdays (5 blocked) with at most 10h '
+        'per day and 20h in each of the calendar weeks 2, 3, 4 allow at most 80h')
+
+
+def test_infeasible_plan_fails_alone(w):
+    plans = [(2017, 1, 40, 1, 31, 'NI', set()),
+             (2017, 2, 300, 1, 28, 'NI', set()),
+             (2017, 3, 60, 1, 31, 'NI', set())]
+    january, february, march = w.distribute_hours(plans, seed=1)
+    assert isinstance(february, ValueError)
+    assert str(february).startswith('300h do not fit into 02/2017')
+    assert sum(hours for _, hours in january) == 40
+    assert sum(hours for _, hours in march) == 60
+
+
+@pytest.mark.parametrize('first, last, message', [
+    (30, 31, '20h do not fit into 02/2017: the first day 30 leaves no workdays'),
+    (25, 26, '20h do not fit into 02/2017: there are no workdays from day 25 to day 26'),
+])
+def test_range_without_workdays(w, first, last, message):
+    error, = w.distribute_hours([(2017, 2, 20, first, last, 'NI', set())], seed=1)
+    assert str(error) == message
+
+
+def test_report_table_raises_the_error(w):
+    args = w.argparse.Namespace(firstname='John', lastname='Doe', hours=300, year=2017, month=2,
+                                first=1, last=31, state='NI', blocked='', seed=None, begin=8,
+                                max_day=10, max_week=48, config_profile=None)
+    with pytest.raises(ValueError, match='300h do not fit into 02/2017'):
+        w.report_table(args)
+
+
+def test_invalid_blocked_day(w):
+    with pytest.raises(ValueError, match='invalid blocked day "32"'):
+        w.blocked_dates('1,32', 2017, 1)
+    assert w.blocked_dates('2017-01-30:2017-02-01', 2017, 1) == {
+        datetime.date(2017, 1, 30), datetime.date(2017, 1, 31), datetime.date(2017, 2, 1)}
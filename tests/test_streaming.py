@@ -0,0 +1,119 @@
+import asyncio
+import faulthandler
+import sys
+import time
+
+import pytest
+
+
+# stdin mode: creates the PDF right away and converts what it read on EOF
+FAKE_WKHTMLTOPDF = '''
+with open(sys.argv[-1], 'wb') as f:
+    f.write(b'%PDF partial')
+    f.flush()
+    f.write(sys.stdin.buffer.read())
+'''
+
+
+def broken_html():
+    yield '<html><head>'
+    raise ValueError('broken signature')
+
+
+def test_write_pdf_kills_wkhtmltopdf_when_html_fails(w, tmp_path, fake_wkhtmltopdf):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    filename = tmp_path / 'doe-2017-01.pdf'
+    with pytest.raises(ValueError, match='broken signature'):
+        w.write_pdf(broken_html(), str(filename))
+    time.sleep(0.5)
+    assert not filename.exists()
+
+
+def test_write_pdf_async_kills_wkhtmltopdf_when_html_fails(w, tmp_path, fake_wkhtmltopdf):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    filename = tmp_path / 'doe-2017-01.pdf'
+    with pytest.raises(ValueError, match='broken signature'):
+        asyncio.run(w.write_pdf_async(broken_html(), str(filename), timeout=10))
+    assert not filename.exists()
+
+
+def test_asyncio_batch_reports_html_errors(w, tmp_path, fake_wkhtmltopdf, monkeypatch, capsys):
+    fake_wkhtmltopdf(FAKE_WKHTMLTOPDF)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'roster.csv').write_text(
+        'firstname,lastname,hours,year,month\n'
+        'Jane,Broken,20,2017,1\n'
+        'John,Doe,20,2017,1\n')
+    iter_html = w.iter_html
+
+    def failing_iter_html(args, table, datum):
+        pieces = iter_html(args, table, datum)
+        yield next(pieces)
+        if args.lastname == 'Broken':
+            raise ValueError('broken signature')
+        yield from pieces
+
+    monkeypatch.setattr(w, 'iter_html', failing_iter_html)
+    monkeypatch.setattr(sys, 'argv', ['workhour-report-generator.py', '--batch', 'roster.csv',
+                                      '--asyncio', '--workers', '2'])
+    args = w.read_args()
+    w.apply_profile(args)
+
+    # the batch used to hang for good when the HTML failed
+    faulthandler.dump_traceback_later(60, exit=True, file=sys.__stderr__)
+    try:
+        assert not w.run(args, '01.01.2017')
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+
+    out = capsys.readouterr().out
+    assert '[1] FAILED: broken signature' in out
+    assert '[2] Report written to "doe-2017-01.pdf"' in out
+    assert not (tmp_path / 'broken-2017-01.pdf').exists()
+    assert (tmp_path / 'doe-2017-01.pdf').read_bytes().endswith(b'</html>')
+
+
+def test_asyncio_batch_builds_while_converting(w, tmp_path, fake_wkhtmltopdf, monkeypatch, capsys):
+    fake_wkhtmltopdf('time.sleep(0.3)\n' + FAKE_WKHTMLTOPDF)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'roster.csv').write_text(
+        'firstname,lastname,hours,year,month\n'
+        + ''.join('Jane,Roe{},20,2017,1\n'.format(i) for i in range(4)))
+    report_table = w.report_table
+
+    def slow_report_table(args):
+        time.sleep(0.3)
+        return report_table(args)
+
+    monkeypatch.setattr(w, 'report_table', slow_report_table)
+    monkeypatch.setattr(sys, 'argv', ['workhour-report-generator.py', '--batch', 'roster.csv',
+                                      '--asyncio', '--workers', '1'])
+    args = w.read_args()
+    w.apply_profile(args)
+
+    start = time.perf_counter()
+    assert w.run(args, '01.01.2017')
+    elapsed = time.perf_counter() - start
+
+    # one after the other would be 4 x (0.3s build + 0.3s conversion) = 2.4s
+    assert elapsed < 2.0
+    assert capsys.readouterr().out.count('Report written') == 4
+
+
+def test_timings_of_streamed_html_and_pages(w, tmp_path, fake_wkhtmltopdf, monkeypatch):
+    fake_wkhtmltopdf(
+        'sources, out = sys.argv[2:-1], sys.argv[-1]\n'
+        'open(out, "wb").write(b"".join(open(s, "rb").read() for s in sources))\n')
+    monkeypatch.setattr(w, 'TIMINGS', w.Timings())
+    monkeypatch.setattr(sys, 'argv', ['workhour-report-generator.py', 'John', 'Doe', '20', '2017', '1'])
+    args = w.read_args()
+    w.apply_profile(args)
+    args.logo = w.write_builtin_logo(str(tmp_path))
+    table = w.report_table(args)
+    filename = str(tmp_path / 'doe-2017.pdf')
+
+    assert w.write_pdf_pages([w.iter_html(args, table, '01.01.2017') for _ in range(2)], filename)
+
+    timings = w.TIMINGS.collected()
+    assert timings['calls']['html'] == 2
+    assert timings['counters']['pdf_bytes'] == (tmp_path / 'doe-2017.pdf').stat().st_size > 0
@@ -0,0 +1,27 @@
+import sys
+
+import pytest
+
+
+def run_check(w, monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['workhour-report-generator.py', '--all-months', '--check']
+                        + list(argv))
+    args = w.read_args()
+    w.apply_profile(args)
+    return w.run_check(args)
+
+
+def test_annual_contract_without_monthly(w, monkeypatch, capsys):
+    assert run_check(w, monkeypatch, '--annual', 'John', 'Doe', '500', '2017')
+    out = capsys.readouterr().out
+    assert '500h in 2017, contracted are 500h' in out
+    assert 'Warning' not in out
+
+
+@pytest.mark.parametrize('argv, warning', [
+    (['--annual', '--monthly', '40', 'John', 'Doe', '500', '2017'], 'Warning: 20h more than contracted'),
+    (['--monthly', '40', 'John', 'Doe', '30', '2017'], 'Warning: 120h less than contracted'),
+])
+def test_year_differs_from_contract(w, monkeypatch, capsys, argv, warning):
+    assert run_check(w, monkeypatch, *argv)
+    assert warning in capsys.readouterr().out
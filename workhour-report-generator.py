@@ -14,268 +14,431 @@
 """
 
 import argparse
-from calendar import Calendar
+import atexit
+import base64
+from array import array
+from bisect import bisect_left, bisect_right
+from calendar import Calendar, monthrange
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from fnmatch import fnmatch
 from math import ceil
 from time import *
+import csv
+import datetime
+import functools
+import hashlib
+import inspect
+import io
+import json
+import queue
 import random
+import shutil
 import subprocess
+import tempfile
+import threading
 import os
+import re
+import sys
+import zlib
 
 
-try:
-    from yattag import Doc, indent
-except ImportError:
-    print('The "yattag" package is missing, install with python-pip:')
-    print('  $ sudo python3 -m pip install yattag')
-    exit(1)
-
-try:
-    import holidays
-except ImportError:
-    print('The "holidays" package is missing, install with python-pip:')
-    print('  $ sudo python3 -m pip install holidays')
-    exit(1)
-
-
-UNI_LOGO = ''.join([
-    "PD94bWwgdmVyc2lvbj0iMS4wIiBlbmNvZGluZz0iVVRGLTgiPz4KPCEtLSBHZW5lcmF0b3I6IEFkb2Jl"
-    "IElsbHVzdHJhdG9yIDEyLjAuMSwgU1ZHIEV4cG9ydCBQbHVnLUluIC4gU1ZHIFZlcnNpb246IDYuMDAg"
-    "QnVpbGQgNTE0NDgpICAtLT4KPCFET0NUWVBFIHN2ZyBQVUJMSUMgIi0vL1czQy8vRFREIFNWRyAxLjEv"
-    "L0VOIiAiaHR0cDovL3d3dy53My5vcmcvR3JhcGhpY3MvU1ZHLzEuMS9EVEQvc3ZnMTEuZHRkIiBbCgk8"
-    "IUVOVElUWSBuc19zdmcgImh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KCTwhRU5USVRZIG5zX3hs"
-    "aW5rICJodHRwOi8vd3d3LnczLm9yZy8xOTk5L3hsaW5rIj4KXT4KPHN2ZyB2ZXJzaW9uPSIxLjEiIGlk"
-    "PSJMYXllcl8xIiB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHhtbG5zOnhsaW5rPSJo"
-    "dHRwOi8vd3d3LnczLm9yZy8xOTk5L3hsaW5rIiB3aWR0aD0iMjMxMS4yNSIgaGVpZ2h0PSI3NjAuMDE4"
-    "IiB2aWV3Qm94PSIwIDAgMjMxMS4yNSA3NjAuMDE4IiBvdmVyZmxvdz0idmlzaWJsZSIgZW5hYmxlLWJh"
-    "Y2tncm91bmQ9Im5ldyAwIDAgMjMxMS4yNSA3NjAuMDE4IiB4bWw6c3BhY2U9InByZXNlcnZlIj4KPGc+"
-    "Cgk8cGF0aCBmaWxsPSJub25lIiBzdHJva2U9IiNBNzFGM0MiIHN0cm9rZS13aWR0aD0iOS40MTciIGQ9"
-    "Ik0yODUuNjI2LDc0LjgyOWMtOC45MzksMC0xNi4xNjQtNy4xNzctMTYuMTY0LTE2LjAwOSAgIGMwLTgu"
-    "ODI5LDcuMjI1LTE2LjAwNCwxNi4xNjQtMTYuMDA0YzguOTE4LDAsMTYuMTQzLDcuMTc1LDE2LjE0Mywx"
-    "Ni4wMDRDMzAxLjc3LDY3LjY1MiwyOTQuNTQ1LDc0LjgyOSwyODUuNjI2LDc0LjgyOXoiLz4KCTxwYXRo"
-    "IGZpbGw9Im5vbmUiIHN0cm9rZT0iI0E3MUYzQyIgc3Ryb2tlLXdpZHRoPSIxNC41MDk4IiBkPSJNMTkz"
-    "LjkxMSw1MDIuNzk1VjI4MS4xODZsLTE4Ni42NSw5Ny42MnYyMjQuNjQxbDI3Ny43NDQsMTQ1LjQxOSAg"
-    "IGwyNzcuNzI5LTE0NS40MTlWMzc4LjgwNmwtMTg2LjctOTcuNjJ2MjIxLjYwOGwtOTEuMDI5LDQ4LjI3"
-    "NkwxOTMuOTExLDUwMi43OTVMMTkzLjkxMSw1MDIuNzk1eiBNNy4yMjYsNjIuOTM1djI4Ni40NTcgICBs"
-    "MTg2LjczNi05OC4yMTlWNjYuODYxIE0zNzUuMTg4LDY2Ljg0MWgxODguMjg4TDQ1Mi43MzgsNy4yMzhI"
-    "MTE1LjgzMUw1LjQ0Myw2Ni44NDFoMTg4LjI4OCBNNTYyLjc3MSw2Mi45MzV2Mjg2LjQ1NyAgIGwtMTg2"
-    "LjczNS05Ny42NjlWNjYuODYxIE0xOTMuOTYzLDY3LjYwM3YxODMuMzk1bDQ2LjE1Ny0yMy45NzF2LTg1"
-    "LjM1NmMwLTI0LjUyMSwyMC4xMDUtNDQuNDEsNDQuODg2LTQ0LjQxICAgYzI0Ljc2NywwLDQ0Ljg3Miwx"
-    "OS44OSw0NC44NzIsNDQuNDFsLTAuMTQxLDg1Ljg4OGw0Ni4yOTgsMjQuMjVsMC4wNzEtMTg0LjA1Mmwt"
-    "OTEuMTAxLTQ3LjU4NUwxOTMuOTYzLDY3LjYwM0wxOTMuOTYzLDY3LjYwM3oiLz4KCTxwYXRoIGQ9Ik01"
-    "OTkuOTksNjEuNTI0YzIyLjQ1MywyLjczNyw0MC41MjQtNS40NzUsNjAuNzg1LDIuNzM3Yy03LjEyMSw3"
-    "LjEyMS0yNC42NDIsNC45MjgtMjEuMzU2LDIwLjgxMWwxLjA5NiwxNjQuODI4ICAgYzMuMjg1LDEzLjE0"
-    "NiwxMi41OTQsMjUuNzM5LDI1LjE4OCwzMi44NThjMjEuOTA4LDguNzY0LDQ4LjE5MSwxMS41MDIsNjku"
-    "MDAyLTIuMTg4YzE2Ljk3NS0xMC45NTcsMjUuMTkxLTI3LjkzMiwyNC42NDItNDcuMDk0ICAgVjc2Ljg1"
-    "NWMwLjU1LTE0Ljc4MS0yNy45MjctMS42NDItMTUuODc5LTE2LjQyOWMxNi40MjksMS4wOTcsMzQuNDk1"
-    "LTIuMTg4LDQ5LjI4MiwyLjczOWMtMy44Myw4LjIxNy0yMS45MDEsMi43MzktMjAuODExLDE2Ljk3NSAg"
-    "IGwtMS42NDIsMTYyLjA5NWMtMy4yODUsMTcuNTI1LTkuODU1LDM2LjE0My0yNy45MjcsNDUuNDUyYy0z"
-    "MC42NjYsMTYuOTc1LTc3LjIxNCwxNy41MjUtMTA1LjE0MS00LjkyOSAgIGMtMTUuODgzLTEzLjE0NC0x"
-    "OS43MTQtMzEuMjE1LTIxLjM1NS01MC4zNzlWNzcuOTUzQzYxNi40MTksNjMuNzE3LDU4OS4wNCw3NC42"
-    "NjgsNTk5Ljk5LDYxLjUyNEw1OTkuOTksNjEuNTI0eiIvPgoJPHBhdGggZD0iTTgwMy43LDYwLjQyN2Mx"
-    "MC45NTUtMi4xODgsMjMuNTQ5LTAuNTQ2LDM1LjA1MS0xLjA5MmM0NS40NDcsNTkuNjg4LDg0Ljg3Niwx"
-    "MjEuNTY5LDEyOS43ODIsMTgxLjgwOGwyLjE5My0zLjgzNlY3My4wMjYgICBjLTIuMTkzLTEyLjA0OC0y"
-    "MS4zNjItMS42NDQtMTguNjIzLTEzLjY5MWMxNi40My0xLjY0MiwzNS41OTgtMi43MzksNTAuOTMsMS4w"
-    "OTJjLTIuNzM4LDguNzYzLTIwLjI2NSwyLjE5My0xOC42MTcsMTYuNDI5ICAgbC0yLjczOSwyMTcuNDA1"
-    "Yy0xNi40MjksMTAuNDAxLTkuMzA5LTE0LjI0LTE4LjA3MS0xOS43MTNjLTQxLjA3LTU3LjUtNzkuOTUz"
-    "LTExNi42NDItMTIyLjY2Ni0xNzEuOTUzICAgYy0zLjgzNSw1OC41OTctMy44MzUsMTIwLjQ3OCwwLDE4"
-    "MC4xNjVjMy44MzEsOS4zMSwxNi45NzYsMi4xODksMTcuNTI1LDExLjUwMmMtMTYuNDI5LDEuNjQ0LTM0"
-    "LjUsMS42NDQtNTAuOTMsMCAgIGMxLjY0My04Ljc2MywxOC42MTctMi43MzcsMTkuNzE0LTE0Ljc4NVY4"
-    "MS43ODljLTUuNDc4LTguNzYzLTE0LjIzNi0xNC43ODctMjMuNTQ5LTE3LjUyNlY2MC40MjdMODAzLjcs"
-    "NjAuNDI3eiIvPgoJPHBhdGggZD0iTTEwNDIuNDYxLDI4MC41NzFsMS4wOTctMjAzLjcxNmMxLjY0My0x"
-    "NS4zMzEtMzUuNTk4LTYuMDIzLTEzLjY5LTE3LjUyMWMzOS40MjksMC41NDYsNzUuMDIxLTEuMDk2LDEx"
-    "My45MDMsMS4wOTIgICBjLTAuNTUxLDguMjE3LTEzLjY5LDMuODM2LTE1Ljg4MywxMi42YzE1Ljg4Myw2"
-    "My41MjIsNDAuNTI0LDEyNC4zMDgsNjIuOTc3LDE4NS4wOTNsNC45MjgtNC45MjhsNjAuMjM5LTE3Ni4z"
-    "MzUgICBjLTAuNTUxLTMuODI5LTIuNzM5LTcuNjY2LTYuMDI0LTEwLjQwNGMtNC45MzMsMS4wOTYtOC43"
-    "NjMtMC41NDYtMTIuMDQ3LTMuMjg1bDEuMDkyLTMuODMxaDE3OS4wNzMgICBjMi43MzQsMTAuNDA2LDEy"
-    "LjU5MywyMC44MDYsNy42NjYsMzAuNjY2Yy0xNi45NzktMzEuMjE3LTU2Ljk1NC0yMS45MDgtODguMTY5"
-    "LTIxLjkwOGwtNy4xMTYsOC43NjNsLTEuMDk3LDczLjkyOSAgIGMxMy4xNDUsMTAuOTUyLDMzLjQwNC0w"
-    "LjU0Niw1MC4zOCw0LjkyOWMyLjE5MywxLjA5NiwzLjgzNSw0LjM4MSwxLjA5Niw2LjAyM2MtMTUuMzMx"
-    "LDcuMTItMzkuNDI3LTQuMzgyLTUwLjM3OSw5Ljg2ICAgbC0xLjA5NywxMDQuMDQyYzAuNTQ2LDUuNDc5"
-    "LDcuMTIxLDkuMzA5LDEyLjA0OSw5Ljg1OWMzMS4yMTUtNC4zODEsNzUuMDIsMTMuMTQ1LDg5LjI2LTI0"
-    "LjY0Mmg2LjAyNSAgIGMtMi43NCwxMi4wNDgtNi4wMjUsMjMuNTQ2LTEzLjY5LDMzLjQwNGMtNDUuNDUy"
-    "LTAuNTUxLTkxLjQ1LDEuMDkyLTEzNS44MTItMS4wOTZjMC41NTItMTIuNTk0LDIwLjgxMi0wLjU0Niwx"
-    "OS43MTUtMTYuNDMgICBsLTEuMDkyLTIwNi40NDljLTcuNjcxLTQuOTI4LTE4LjA3MS02LjAyNC0yNy4z"
-    "ODUtMy44MzZsLTEwLjk1MSwxMi41OTlsLTc1LjU3MiwyMTUuMjEyYy0yLjE4OCwyLjczNC00LjkyNyw0"
-    "LjM4Mi04Ljc1OCwzLjgzMSAgIGwtNi4wMjMtOC43NjNsLTczLjkyOS0yMTIuNDc0Yy02LjU3LTEwLjQw"
-    "NC0yMC44MTEtMTEuNDk2LTMyLjMwOC04Ljc2M2wtNC45MzIsNi4wMjR2MjA2LjQ1NCAgIGMxLjY0Miw4"
-    "LjIxMiwxMi4wNDYsNy4xMTUsMTguNjIxLDguNzU4djQuOTMyYy0yMC4yNjUsMS4wOTItNDUuNDUyLDMu"
-    "ODMxLTYyLjk3Ny0yLjczOCAgIEMxMDI3LjEyOSwyODQuNDAyLDEwMzkuNzIyLDI5MS41MjMsMTA0Mi40"
-    "NjEsMjgwLjU3MUwxMDQyLjQ2MSwyODAuNTcxeiIvPgoJPHBhdGggZD0iTTE0NjAuMjkyLDI3OS40NzVs"
-    "MS4wOTctMTg5LjQ3NWMwLjU0Ni0xMC40MDYtMTQuNzg3LTMuMjg1LTEzLjY5LTEzLjE0NmMzNy43ODYt"
-    "MjIuNDUyLDg5LjI2MS0yOS41NjgsMTI4LjY4OS02LjU2OCAgIGMxNy41MjEsMTUuMzMxLDIzLjU0NCwz"
-    "Ny4yMzQsMTguNjE3LDYwLjc4NGMtMy44MywxNS4zMzItMTUuMzMyLDMyLjMwNy0zMS4yMTEsMzguMzMx"
-    "bC0yOS41NzMsOC43NjNsNzEuNzM1LDEwMS4zMTEgICBjNS40NzgsOS44NTQsMTguNjIzLDQuOTI3LDIz"
-    "LjU1LDEzLjY4OWMtMTIuMDQ4LDMuODMxLTI3LjkyNywyLjE4OC00MC41MjQsMS4wOTdjLTI4LjQ3OC00"
-    "MS4wNzEtNjEuMzMxLTc5LjQwNy04NC4zMy0xMjIuNjY1ICAgYzI1LjE4Ny0yLjE5NCw1Mi4wMjEtNy4x"
-    "MjEsNjQuNjE1LTMxLjc2M2M2LjAyNC0xNi45NzUsNC45MjctMzkuNDI5LTMuODMxLTU0Ljc2MmMtMTIu"
-    "MDQ4LTE0LjI0LTI3LjM4LTIxLjM1Ni00Ni4wMDItMTkuNzEzICAgYy05Ljg1NCwxLjA5Mi0yMC4yNjEs"
-    "Mi4xODgtMjguNDczLDguNzU4bC02LjAyMywxMC45NTVsLTIuMTkzLDE5MC41NjdjMC41NTEsNi4wMjMs"
-    "NC45MjcsMTAuOTU3LDEwLjk1MSwxMi4wNDggICBjNC4zODItMC41NDYsNy4xMiwxLjY0MywxMC45NTYs"
-    "Mi43Mzh2My44MzZjLTIwLjgxMSwxLjA5MS00NC4zNTksMi43MzQtNjQuMDc0LTEuMDk3ICAgQzE0NDMu"
-    "MzE1LDI4NC40MDIsMTQ1OC42NDgsMjkwLjQyNiwxNDYwLjI5MiwyNzkuNDc1TDE0NjAuMjkyLDI3OS40"
-    "NzV6Ii8+Cgk8cGF0aCBkPSJNMTYyOS41MDIsMjQ4LjI1OWMxMi41OTQsMTYuNDMsMjguNDc4LDMzLjk1"
-    "NSw0OS4yODMsMzguMzM4YzE4LjA3MSwzLjgyOSwzNi4xNDQsMCw0OS44MzMtMTAuOTU3ICAgYzExLjUw"
-    "Mi0xMi4wNDgsMTYuNDMtMjYuODMsMTQuNzg3LTQ0LjM1NWMtMTYuOTc2LTUyLjAyMi03OC44NTctNTku"
-    "MTQyLTEwNS4xNDEtMTA0LjA0OGMtNi41NzQtMTcuNTIxLTQuMzgxLTM5Ljk3NSw3LjExNi01NC4yMSAg"
-    "IGMyMi40NTItMjYuMjg5LDYxLjMzNS0xNy41MjYsOTAuMzU4LTEyLjZjNC45MjcsMCw4LjIxMi03LjY2"
-    "NiwxMi41OTQtNC45MjdjMi4xOTIsMTQuNzg3LDExLjUwMiwyOS41NzMsNi4wMjMsNDQuMzU1ICAgYy0x"
-    "Mi41OTQtMTMuMTQtMjQuNjQyLTMwLjExNC00My4yNTktMzQuNDk1Yy0xNS4zMzMtMi4xOTQtMzMuNDA0"
-    "LTIuNzQtNDQuMzU1LDkuODU0Yy0xMi4wNDgsOS4zMDktMTIuNTk5LDI0LjY0Mi05Ljg2LDM4LjMzMSAg"
-    "IGMzMC4xMiw0OC43NDIsMTI3LjA0OCw2My41MjQsMTA2LjIzNywxMzguNTVjLTYuMDIzLDIyLjQ1My0y"
-    "Ny45MjYsNDAuNTI0LTUwLjkzLDQ0LjM1NWMtMjIuOTk5LDUuNDc4LTQzLjI2LTMuODMxLTY1LjE2MS02"
-    "LjAyNCAgIGMtNC45MzMsMS42NDQtNC45MzMsMTEuNTAyLTExLjUwMiw2LjAyNGMtMy4yODQtMTUuMzMz"
-    "LTguMjEzLTI5LjU2OC05Ljg1OS00NS40NTJMMTYyOS41MDIsMjQ4LjI1OUwxNjI5LjUwMiwyNDguMjU5"
-    "eiIvPgoJPHBhdGggZD0iTTE3OTIuNjk2LDI3Ni43MzVWNzAuMjg2Yy0yLjczOS05LjMwOS0yNi4yODkt"
-    "MC41NDYtMTQuNzg3LTEyLjA0OGMxOS4xNjMtMS4wOTYsNDQuMzU1LTMuODM2LDU5LjE0MiwyLjE4OCAg"
-    "IGMtNC45MjcsNi41NzUtMTkuMTY3LDEuNjQ4LTIwLjgxMSwxMy42OTFjLTEuNjQyLDY1LjE2NS0xLjY0"
-    "MiwxNDQuMDIyLDAsMjA3LjU0NWM0LjM4Miw2LjAyNCwxMi41OTQsNC4zODIsMTguNjE4LDYuMDI0ICAg"
-    "YzEuMDk3LDcuNjY1LTcuNjY2LDYuMDIzLTEyLjU5NCw2LjU3NGMtMTYuNDI5LTEuMDk3LTM0LjUwMSwy"
-    "LjE4OC00OS4yODItMi43MzggICBDMTc3NS43MTYsMjgyLjc1OSwxNzkxLjU5OSwyODkuMzI5LDE3OTIu"
-    "Njk2LDI3Ni43MzVMMTc5Mi42OTYsMjc2LjczNXoiLz4KCTxwYXRoIGQ9Ik0xODU1LjY2Myw1Ni41OTVs"
-    "MTU3LjE2NywyLjczOWMzLjI4NSwxMi4wNDgsMTEuNDk3LDIzLjU0NSw5Ljg1NCwzNS41OTNjLTkuMzA5"
-    "LTEuNjQzLTkuODU0LTEzLjEzOS0xOC42MTctMTguMDcyICAgYy0xMi4wNDgtMTQuNzgxLTMyLjg1OC04"
-    "Ljc2My01MC45My0xMC40MDRsLTkuODU1LDEwLjQwNGMwLDY3LjkwNi00LjM4MSwxMzcuOTk5LTEuMDk2"
-    "LDIwNC44MDggICBjNC4zODEsNy42NjYsMjIuOTk4LDAsMTcuNTI1LDExLjUwMmMtMjEuMzU2LTAuNTQ2"
-    "LTQyLjcxMywwLjU0Ni02Mi45NzgtMS42NDNjMi4xOTItMTAuOTUxLDI0LjY0Mi0yLjE5MywyMS45MDYt"
-    "MTkuNzE0ICAgbDEuNjQ0LTE5Ny42OTFjLTEwLjk1Ni0xMS40OTgtMzIuMzEyLTkuODU1LTQ3LjA5NS02"
-    "LjAyNGMtMTMuNjksMS42NDctMjAuMjY1LDE2LjQyOS0yOC40NzgsMjUuNzM3bC00LjkyNy0yLjE4OCAg"
-    "IEMxODQzLjA3LDc5LjA0OSwxODQ2LjkwMSw2NS45MDUsMTg1NS42NjMsNTYuNTk1TDE4NTUuNjYzLDU2"
-    "LjU5NXoiLz4KCTxwYXRoIGQ9Ik0yMDM2LjM3OCwyMi4wOTVjNi41NzQsMC41NSwxNS44ODMsMS42NDIs"
-    "MTYuOTc1LDkuODU5YzEuNjQ3LDguNzU3LTEuMDkyLDE3LjUyMS05Ljg1NCwxOS43MTQgICBjLTguMjEy"
-    "LDEuNjQzLTE3LjUyNi0xLjA5Ny0xOS43MTQtOS44NTlDMjAyMS41OTUsMzIuNTAxLDIwMjcuNjE1LDIz"
-    "LjczNywyMDM2LjM3OCwyMi4wOTVMMjAzNi4zNzgsMjIuMDk1eiIvPgoJPHBhdGggZD0iTTIxNDEuNTI0"
-    "LDI4MC41NzFsLTYzLjUyMy0yMTAuMjg1Yy0zLjI4NS00LjM4MS0yLjc0LTE0LjIzNi0xMC45NTctMTMu"
-    "NjljLTI0LjY0Miw3My4zNzgtNDkuMjgzLDE0Ni4yMTEtNzMuOTI0LDIxOS4wNDMgICBsLTExLjUwMywx"
-    "MC45NTdjLTIuNzM3LDIuMTg4LTEwLjQwNCwwLjU0Ni04LjIxMSw2LjU2OGwzOC4zMzEsMi4xODhsNC45"
-    "MjgtMy44M2MtMS42NDMtNS40NzktMTEuNDk4LTMuMjg1LTEzLjY4OS05Ljg2ICAgYzYuNTczLTI0LjY0"
-    "MSw5Ljg1OC01MC45MjUsMjUuNzM3LTcxLjczNWMyMC4yNjUsMCwzOC44ODMsMCw2MC43ODQsMGw3LjEy"
-    "MSw0LjkyOGM3LjY2NSwyMS45MDYsMTcuNTI1LDQyLjcxMiwxOC42MTcsNjYuODA4ICAgYy0yLjc0LDgu"
-    "MjE3LTEyLjA0OCw0LjkzNC0xOC42MTcsNy42Njd2NC45MzJjMjAuMjU5LDEuNjQ0LDQ0LjM1NCwxLjY0"
-    "NCw2Mi45NzgsMCAgIEMyMTU4LjQ5OSwyODYuMDQ0LDIxNDUuMzU0LDI5MC40MjUsMjE0MS41MjQsMjgw"
-    "LjU3MUwyMTQxLjUyNCwyODAuNTcxeiBNMjA4Ny44NTQsMjAwLjA3MmwtNTguMDQ1LTEuMDk3bDMxLjIx"
-    "Ni05Ni4zODEgICBjMTIuMDQzLDI5LjU3MywyMC4yNjEsNjMuNTIyLDMwLjY2NSw5NS4yODVMMjA4Ny44"
-    "NTQsMjAwLjA3MkwyMDg3Ljg1NCwyMDAuMDcyeiIvPgoJPHBhdGggZD0iTTIwOTMuMzI5LDIyLjA5NWM5"
-    "LjMwOC0yLjE4OCwxOC4wNyw0LjM4MSwxOS43MTQsMTIuNTk0Yy0wLjU1Miw2LjU3NC0zLjI4NSwxNC4y"
-    "NDEtOS44NiwxNi45NzkgICBjLTguMjEyLDEuMDkxLTE2LjQyOS0wLjU1MS0yMC4yNi04LjIxN0MyMDc5"
-    "LjA4NywzNC42ODksMjA4NC41NjUsMjQuODM1LDIwOTMuMzI5LDIyLjA5NUwyMDkzLjMyOSwyMi4wOTV6"
-    "Ii8+Cgk8cGF0aCBkPSJNMjEzNC45NTEsNTguMjM5bDE1Ni4wNywxLjA5NmM2LjAyMywxMS40OTcsMTEu"
-    "NTAyLDI0LjY0MiwxMC45NSwzNy4yMzVjLTEwLjk1LTQuOTI4LTE0Ljc4MS0yMi40NTMtMjguNDcxLTI2"
-    "LjI4MyAgIGMtMTUuMzMzLTEuMDk4LTQyLjE2OC05Ljg2LTUwLjM4Niw3LjY2NmwtMi43MzMsMjAxLjUy"
-    "MmMyLjE4OCwxMC45NSwyNy4zOCwzLjgzMSwxNy41MjEsMTQuNzg2aC01OS42ODlsLTMuODM1LTMuODM2"
-    "ICAgYzUuNDc5LTcuNjY2LDE5LjcxNCwwLDIyLjQ1My0xMi41OTRsMy44MzYtMTk4Ljc4MmMtMC41NTEt"
-    "Ny4xMi04LjIxNy0xMi4wNDgtMTQuNzg3LTEyLjU5OSAgIGMtMTYuOTc2LTAuNTQ1LTMyLjg1OCwwLjU1"
-    "MS00NS45OTgsOC43NjRjLTcuNjcxLDYuMDIyLTkuODU4LDIwLjgxMS0xOS43MTQsMTguNjE2ICAgQzIx"
-    "MjEuMjYxLDgwLjY5MiwyMTI2LjE4OCw2Ny41NDgsMjEzNC45NTEsNTguMjM5TDIxMzQuOTUxLDU4LjIz"
-    "OXoiLz4KCTxwYXRoIGQ9Ik04MjIuMDM4LDU0NS42MTJjMTAuNDA0LDMuODM2LDE2Ljk3NSwxNy41MjYs"
-    "MjYuMjg4LDI0LjY0N2MxNi45NzUsMTMuNjg5LDQzLjI1OSwxOS43MTMsNjQuMDY5LDkuODU0ICAgYzE0"
-    "Ljc4Ni04Ljc2MywyNC4xMS0yMy41NDYsMjUuNzM4LTM5Ljk3NWMtMi43MzktNjIuNDI3LTc3Ljc2LTY3"
-    "LjM1OC0xMDMuNDk3LTExNi4wOTZjLTUuNDc4LTEzLjY5LTUuNDc4LTMwLjEyLDAtNDQuMzU1ICAgYzEw"
-    "Ljk1MS0yMS4zNTYsMzQuNDk1LTI5LjU3Myw1OC4wNDUtMjguNDc4YzE2LjQzLTEuMDk2LDMxLjc2Mywx"
-    "My42OSw0Ny4xMDksMS4wOTdoMy4yNzFjMy44MzUsMTQuMjM2LDguMjEyLDI5LjU2OSw3LjY2Niw0My4y"
-    "NTkgICBjLTEwLjkzNy0zLjI4NS0xMy4xNDUtMTYuNDI0LTIzLjU0NS0yMi45OTljLTE2Ljk4LTEyLjU5"
-    "NC00MS42MjEtMTUuODc4LTYwLjc5LTUuNDczYy0xMC4zOTksOC4yMTItMTQuMjM1LDE4LjYxOC0xNS44"
-    "NzcsMzAuMTE5ICAgYzEyLjU5Myw1My42NjQsNzguMzEsNTUuODUzLDEwMi40MDUsMTA1LjE0MWMxMS41"
-    "MTYsMTkuNzE0LDYuNTY5LDQ4LjE5MS00LjkxMyw2Ni4yNjJjLTE5LjE4MywyNi4yODUtNTEuNDk1LDI3"
-    "LjkyNy03OS45NjgsMjMuNTQ2ICAgYy0xMC45NTYsMS4wOTYtMjUuMTkxLTE0Ljc4Ny0zMi4zMTIsMS42"
-    "NDJoLTQuOTI3QzgyNS4zNDIsNTc4LjQ3MSw4MjIuNTg5LDU2MC45NDUsODIyLjAzOCw1NDUuNjEyTDgy"
-    "Mi4wMzgsNTQ1LjYxMnoiLz4KCTxwYXRoIGQ9Ik0xMDAyLjc1MSwzNTMuOTQ5YzQ2LjAwMiw1OC4wNDYs"
-    "ODMuMjM3LDEyMy4yMTIsMTI5Ljc4NSwxODEuMjYyYzMuODM2LTU0Ljc2NSwyLjczOS0xMTUsMS4xMTEt"
-    "MTY5LjIxNCAgIGMtMi43NTMtOS4zMDktMjUuMjA3LTEuMDk4LTE0LjgwMS0xMi4wNDhjMTUuODc5LDAs"
-    "MzIuODU4LTEuMDk3LDQ4LjE5MSwxLjA5N2MtMi43MzksOC43NTgtMTguNjIzLDIuMTg4LTE5LjcxNSwx"
-    "NC43ODIgICBsLTIuNzI0LDIyMS4yMzVjLTEyLjYwOCw2LjU3NC05LjMyNC04Ljc1Ny0xMy43MDUtMTQu"
-    "NzgxYy00MS42MjEtNTkuNjkzLTgyLjE0Mi0xMjEuNTc1LTEyNS45NTEtMTc5LjA3ICAgYy0zLjgzNiw1"
-    "NS44NTQtMi43MTgsMTIzLjIxMi0xLjA5NiwxODEuMjU5YzQuMzgxLDcuMTIsMTUuODgzLDEuMDk3LDE3"
-    "LjUyNCwxMC40MDVjLTE1LjMzMSwzLjI4NS0zNi42OTMsMy4yODUtNTAuOTI5LDAgICBjMS42NDItOC43"
-    "NjMsMTguNjE2LTIuNzM5LDE5LjcxNC0xNS4zMzNsMS4wOTctMTk3LjY5MmMtNi41NzUtOC4yMTItMTIu"
-    "NTk0LTE1Ljg3OS0yMy0xNi45NzV2LTMuODMxTDEwMDIuNzUxLDM1My45NDkgICBMMTAwMi43NTEsMzUz"
-    "Ljk0OXoiLz4KCTxwYXRoIGQ9Ik03NTEuOTQ0LDM1OC44NzdjLTM3LjIzOS0xMi4wNDgtODMuNzg0LTcu"
-    "NjY3LTExMi44MDcsMTguNjIyYy00Mi43MTcsMzguMzMxLTQ1LjQ1MiwxMDUuNjg2LTI4LjQ3NywxNTYu"
-    "NjE2ICAgYzE0Ljc4NywzMy45NSw0OS44MzQsNTkuNjg4LDg2LjUzNyw2MC43ODVjNDEuMDc2LDMuMjg0"
-    "LDc3Ljc0NS0xMC40MDYsMTAxLjI5NS00My4yNjVjMjMuNTQ1LTM0LjQ5NSwyNS43MzctODUuNDI2LDE0"
-    "Ljc4Mi0xMjUuOTUxICAgQzgwNS4wNjMsMzk3LjIxMyw3ODAuOTg3LDM2Ny42MzksNzUxLjk0NCwzNTgu"
-    "ODc3TDc1MS45NDQsMzU4Ljg3N3ogTTc2NC4wMDcsNTYyLjU5MmMtMTkuMTgzLDIxLjM1Ni00OC43NTIs"
-    "MjYuMjg0LTc2LjY4MywxOS43MTUgICBjLTI3LjM4MS03LjEyMS00NC4zNTUtMzUuMDUyLTU0LjIxLTU5"
-    "LjE0NGMtMTMuMTI0LTUzLjExOC03LjY2Ni0xMTUuNTUsMzguMzMxLTE0OS41YzE2LjQzLTEyLjA0OCw0"
-    "MC41MjUtMTMuMTQ2LDYwLjIzOS04Ljc2NCAgIGMzNi42ODksOC4yMTgsNTYuNDAzLDQ3LjY0Niw2MC43"
-    "OTksODEuNTk2Qzc5Ny45NDIsNDg5Ljc1OSw3OTEuMzcyLDUzMS4zNzUsNzY0LjAwNyw1NjIuNTkyTDc2"
-    "NC4wMDcsNTYyLjU5MnoiLz4KCTxwYXRoIGQ9Ik0xMzI2LjM5MSw1ODAuMTE0bC02Ny45MDYtMjE5LjA0"
-    "NGwtNi4wMjMtNy4xMmwtMy44MzEsMi4xODhsLTcxLjc0LDIxNi4zMDlsLTguNzY0LDEwLjk1MiAgIGMt"
-    "Mi43MzQsNS40NzgtMTMuNjg5LTEuNjQ0LTEwLjk1MSw3LjY2NWw0NS40NzIsMS4wOThjMy44MTUtMTEu"
-    "NTAyLTEzLjcxLTIuNzM5LTE1Ljg5Ny0xMi4wNDggICBjNi41NjktMjQuNjQyLDkuODU0LTUyLjAyMiwy"
-    "NS43MzctNzEuNzM2YzIyLjQ1MywwLDUwLjkyNS03LjEyLDY5LjU0OCw2LjAyNGM3LjY2NiwyMS4zNTYs"
-    "MTUuMzMzLDQyLjE2NywxNi45NzUsNjUuNzEyICAgYy0yLjczOSw5LjMwOS0xNy41MDUsMS42NDItMTku"
-    "NzE0LDEwLjk1YzE4LjYxOCw0LjM4Myw0MC41MjEsMS42NDQsNjAuNzg1LDIuNzM5ICAgQzEzNTEuMDMx"
-    "LDU4My4zOTgsMTMyOS42NzQsNTg4LjMzLDEzMjYuMzkxLDU4MC4xMTRMMTMyNi4zOTEsNTgwLjExNHog"
-    "TTEyMTIuNDg3LDQ5NS43ODQgICBjMTAuNDA0LTMyLjMxMiwyMC44MDYtNjUuNzE3LDMyLjMwOC05Ni4z"
-    "ODJjMTEuNTAyLDMxLjc2MywyMS45MDIsNjQuNjIsMjkuNTczLDk3LjQ3NUwxMjEyLjQ4Nyw0OTUuNzg0"
-    "TDEyMTIuNDg3LDQ5NS43ODR6Ii8+Cgk8cGF0aCBkPSJNMTUwOS4yOTUsNDg4LjY2NGMtMTAuMzk5LTE3"
-    "LjUyNi0yOS4wMjItMjQuMDk2LTQ3LjA5NC0yOC40NzdjMy44MzYtMy4yODUsOC4yMTgtNC4zODIsMTIu"
-    "NTk5LTYuNTcgICBjMjAuODI2LTkuODU5LDMwLjY2NC0zMS4yMTcsMjkuNTY4LTU0LjIxNWMtMy4yODUt"
-    "MTcuNTI1LTEzLjY4OS0zOC44ODMtMzMuNDA0LTQzLjI2NWMtMzguMzMyLTkuODU0LTg1LjQyNi01LjQ3"
-    "My0xMTMuOTAzLDE5LjcxNSAgIGwxMi41OTQsNy42NjZsMy44MzYsMTc5LjA3NWMtMS4wOTcsOC4yMTIt"
-    "MTEuNTAzLDguNzU4LTE0Ljc4NywxMy42ODljNC4zODIsNi4wMjQsMTIuMDQ4LDEwLjk1MSwxOS43MTQs"
-    "MTIuNTk0ICAgYzQyLjE2OCw5Ljg1NCw5OC4wMjQsMTIuMDQ4LDEyNy4wNDgtMjYuMjgzQzE1MTkuMTU1"
-    "LDU0Mi44NzksMTUyMS4zNDMsNTA5LjQ3NCwxNTA5LjI5NSw0ODguNjY0TDE1MDkuMjk1LDQ4OC42NjR6"
-    "ICAgIE0xNDc1Ljg5Miw1NjguNjE2Yy0xNi45NzYsMTcuNTIxLTQ3LjY0MiwxOC4wNjYtNjguOTk4LDku"
-    "ODU1bC05LjgzOC0xMC45NTFjLTEuMTEyLTYxLjg4Mi0zLjg1Mi0xMjUuOTUxLTIuNzU1LTE5MC4wMjEg"
-    "ICBjNy4xMTYtMTMuMTQ2LDIyLjQ0Ny0xNi40MywzNy4yMzQtMTYuNDNjMTIuNTk0LDAuNTQ2LDI0LjY0"
-    "MiwyLjczMywzNC41MDIsOS44NTRjMTkuNzEzLDE1Ljg4MywxNS4zMzIsNDIuNzEyLDguNzYzLDYyLjk3"
-    "OCAgIGMtMTMuMTQ1LDIxLjM1Ny0zOC4zMzgsMjIuOTk5LTYxLjg2NywyNS4xODhjLTYuMDM5LDMuMjg0"
-    "LDAuNTMxLDguMjE4LDMuODE1LDkuODU5YzI1LjczOS0xLjY0Miw1My4xMTgtMS4wOTYsNjYuODEsMjEu"
-    "OTAyICAgQzE0OTUuNjI2LDUxMy44NSwxNDkzLjQxNyw1NDguOTAxLDE0NzUuODkyLDU2OC42MTZMMTQ3"
-    "NS44OTIsNTY4LjYxNnoiLz4KCTxwYXRoIGQ9Ik0xNTUxLjQ1Niw1NzUuMTg2bDIuMTkzLTE4OS40NzVj"
-    "MC04Ljc2NC0xMC45NTYtNC4zODMtMTMuMTQ1LTEwLjk1MmMyMC4yNjEtMjEuMzU1LDU0LjIxNS0yNC42"
-    "NDYsODQuODgtMjIuNDUzICAgYzIxLjkwMy0wLjU0Niw0MS4wNyw4LjIxMiw1NC43NjIsMjYuMjg0Yzgu"
-    "NzYzLDE0LjI0LDEyLjU5MywzMy40MDQsNy4xMTksNTAuMzhjLTQuOTI3LDI0LjY0Ni0zMS43NDcsMzku"
-    "OTc5LTU0LjIxNSw0My4yNjQgICBjLTIuNzM4LDAuNTQ2LTYuMDIyLTAuNTQ2LTcuNjY2LDIuNzM4bDc2"
-    "LjY2OCwxMDYuMjM3YzUuNDc0LDYuMDI0LDE3LjUyMSwwLDE4LjYxOCw5Ljg1NGMtMTMuNjksMC0yOS41"
-    "NzQsNS40NzktNDAuNTI0LDAgICBsLTg0LjMzNS0xMTkuOTI4YzMuODM1LTEyLjA0OCwyNC4wOTYtMi4x"
-    "ODgsMzMuNDA4LTguNzYzYzEyLjA0NC00LjM3NiwyNS43MzMtMTMuMTM5LDMwLjY2Ni0yNS43MzIgICBj"
-    "OC43NjMtMTkuMTY5LDcuNjY3LTQ2LjU0OS04LjIxNy02MS44ODJjLTE0LjIzNi0xNS44ODMtMzguODc4"
-    "LTE1LjMzMy01OC4wNDYtMTAuOTU2Yy01LjQ1OCwyLjczOS0xMi4wNDgsNi4wMjQtMTQuNzg3LDEyLjA0"
-    "OCAgIGMtMi43MzksNjUuMTY2LTUuNDczLDEzNS4yNjUtMi43MzksMjAyLjYyYzMuMjksOS44NTgsMjYu"
-    "ODM1LDEuMDk2LDE3LjUyNywxMi41OTJjLTIwLjgxMS0wLjU0NS00Mi43MTQsMi4xOTQtNjEuODgyLTIu"
-    "MTg4ICAgQzE1MzMuOTM1LDU3OC40NzEsMTU1MC45MSw1ODguODc2LDE1NTEuNDU2LDU3NS4xODZMMTU1"
-    "MS40NTYsNTc1LjE4NnoiLz4KCTxwYXRoIGQ9Ik0xNzA4LjA3NiwzNTUuMDQ2bDU5LjY4OCwxLjA5MmMt"
-    "NC4zODEsNy42NjYtMjAuMjYsNC4zODEtMjEuMzQxLDE3LjUyNmwxLjYyNywxNzUuMjM4ICAgYzMuMjg1"
-    "LDE0LjIzNiwxNS44OTgsMjUuMTg3LDI4LjQ3NywzMi4zMDhjMjAuMjgsOS4zMDksNDYuNTQ0LDMuODMx"
-    "LDY1LjE2Ni00LjkyN2MxMy4xNC05LjMxMywyMi40NDgtMjEuOTA3LDIzLjU0Ni0zNy4yNCAgIGMwLTU4"
-    "LjU5Niw1LjQ5Mi0xMTMuOTAzLDAtMTcxLjk0OWMtMi43Mi03LjY2Ni0xNi45NzYtMi4xOTMtMTYuOTc2"
-    "LTEwLjk1NmMxNi45NzYsMCwzNS4wNDctNS40NzMsNTEuNDc2LDAgICBjLTEuMDk2LDEwLjQwNi0xNy41"
-    "MjUsMC41NTItMTkuNzE0LDEzLjY5bC0zLjgzNiwxNzMuMDUxYy0xLjY0MiwxNy41MjEtMTQuMjM1LDMy"
-    "LjMwOC0yOS41NjgsNDIuMTYxICAgYy0zMS43NjEsMTQuMjQyLTc4Ljg1NSwxNi45OC0xMDYuMjM3LTku"
-    "ODU0Yy0xMy4xNDQtMTAuOTUyLTE1LjMzMi0yNi44MzUtMTYuOTc1LTQyLjE2OFYzNjcuMDk0ICAgQzE3"
-    "MjAuNjcsMzU3Ljc4NSwxNjk3LjEyLDM2Ni41NDMsMTcwOC4wNzYsMzU1LjA0NkwxNzA4LjA3NiwzNTUu"
-    "MDQ2eiIvPgoJPHBhdGggZD0iTTE3NzEuNjAyLDMxMy45NzRjNi41NzUsMS4wOTIsMTUuMzM3LDEuNjQ0"
-    "LDE2Ljk3OSwxMC40MDFjMi4xODgsNy42NzEtMi4xOTIsMTguMDcxLTEwLjk1NywyMC44MTEgICBjLTcu"
-    "NjY1LTAuNTQ2LTE2LjQyMy0yLjczOS0xOC42MTYtMTAuOTUxQzE3NTYuODE4LDMyNC45MjcsMTc2Mi44"
-    "NDMsMzE1LjYxOCwxNzcxLjYwMiwzMTMuOTc0eiIvPgoJPHBhdGggZD0iTTE4MjkuNjY4LDMxMy45NzRj"
-    "OC4yMTctMi4xOTIsMTUuODYzLDMuMjg1LDE4LjYwMywxMC40MDFjMC41NDYsOC4yMTctMS4wOTgsMTUu"
-    "ODg0LTguNzY0LDE5LjcxMyAgIGMtNy4xMTksMC41NTItMTkuMTYyLDAtMjEuMzU2LTkuODU0QzE4MTUu"
-    "NDEyLDMyNC45MjcsMTgyMS45ODYsMzE3LjI2LDE4MjkuNjY4LDMxMy45NzRMMTgyOS42NjgsMzEzLjk3"
-    "NHoiLz4KCTxwYXRoIGQ9Ik0xOTcwLjM4MywzNTYuMTM3YzIzLjAwNC03LjExNSw1MC45MzEtOC4yMTIs"
-    "NzIuODM3LDEuMDk4YzYuMDE5LDIuMTkyLDkuMzA5LTMuODMxLDEzLjY5MS02LjAyNCAgIGM5LjMwOSwx"
-    "MC40MDUsMTIuNTk0LDI3LjM4LDE1Ljg3OCw0Mi4xNjZjLTEyLjA0OCw4Ljc2NS0xMi41OTQtMTIuMDQ4"
-    "LTIxLjkwMi0xNC43ODZjLTE3LjUyNS0xNy41MjEtNDUuNDUyLTI0LjA5Ni02Ny45MDUtMTMuNjkgICBj"
-    "LTQ1LjQ1MiwyMi45OTktNTAuOTMsNzIuODMzLTUzLjExNywxMTguODM3YzMuMjgzLDM0LjQ5NSwxMC45"
-    "NSw2OC45OTYsNDEuNjE2LDg5LjgwN2MxNi40MjksNy42NjYsMzcuMjM5LDExLjQ5Nyw1NS44NTYsNi41"
-    "NjkgICBjMTcuNTI2LTQuMzgxLDMwLjY2Ni0yMC44MTEsNDQuMzU1LTMyLjMwOGM4Ljc2Myw0LjM4Mi0w"
-    "LjU0NSw5Ljg1NC0xLjA5MiwxNC43ODdjLTI1LjE5MSwyOS4wMjMtNjUuMTY2LDM3Ljc4MS0xMDEuMjk0"
-    "LDI2LjI4MyAgIGMtNDUuNDY3LTE2LjQyOS02MS44OTYtNjMuNTIyLTY1LjcxMi0xMDYuNzg2QzE5MDMu"
-    "NTk1LDQzMS4xNjUsMTkyMC4wMDQsMzc4LjA0NiwxOTcwLjM4MywzNTYuMTM3TDE5NzAuMzgzLDM1Ni4x"
-    "Mzd6Ii8+Cgk8cGF0aCBkPSJNMjEwNC4wMDYsNTc1LjE4NmMyLjE4OC02OC40NTEsMC41NDYtMTQxLjgz"
-    "NCwxLjA5MS0yMDguMDkyYy00LjkyNy01LjQ3OC0xMi4wNDctNi4wMjMtMTguNjE2LTcuMTIxdi00Ljky"
-    "NyAgIGMxOS43MTMtMS42NDMsNDIuMTY3LTEuNjQzLDYxLjg4MSwwYy0wLjU1MiwxMi4wNDgtMTcuNTI2"
-    "LDEuMDkyLTE5LjcxNCwxNC43ODJjLTEuNjQzLDI5LjU3My0xLjY0Myw2MS44ODIsMCw5MS40NTVsODMu"
-    "NzgzLTkwLjM1OCAgIGMzLjgzNi0xMi41OTQtMTMuMTQ1LTcuNjY3LTEzLjE0NS0xNS44NzljMTYuOTc5"
-    "LTEuNjQzLDM2LjY5NC0xLjY0Myw1NC4yMTUsMGMtMS42NDMsOS44NTQtMTUuMzMyLDUuNDczLTIxLjM1"
-    "NiwxMi4wNDggICBsLTc5Ljk1Miw4NC4zM3YzLjgzNmwxMDAuMjEzLDEyMS4wMjJjNC45MzIsOC43NTgs"
-    "MTYuOTc5LDYuMDI0LDIwLjgxMSwxMy42ODljLTEwLjk1MiwzLjgzMS0yNS43MzgsMi43MzUtMzcuMjM1"
-    "LDEuMDkyICAgYy0zOC44ODItNDIuNzEzLTcwLjA5OC04Ny4wNjgtMTA3LjMzMy0xMjkuNzhjLTQuMzY1"
-    "LDM3Ljc4NS0yLjczOSw3OC44NTUtMS4wOTYsMTE3LjE4OGMzLjgzNiw5LjMwOSwxOC42MTctMC41NDcs"
-    "MTguMDcxLDExLjUwMSAgIGgtNjIuOTczQzIwODMuNzQyLDU3Ny4zNzUsMjEwMS44MTMsNTg5LjQyMywy"
-    "MTA0LjAwNiw1NzUuMTg2TDIxMDQuMDA2LDU3NS4xODZ6Ii8+CjwvZz4KPC9zdmc+"
-])
+# Slow to import, only imported once holidays have to be computed
+holidays = None
+
+
+def holidays_module():
+    global holidays
+    if holidays is None:
+        try:
+            import holidays
+        except ImportError:
+            print('The "holidays" package is missing, install with python-pip:')
+            print('  $ sudo python3 -m pip install holidays')
+            exit(1)
+    return holidays
+
+
+# Timings
+
+class Timings:
+    """
+    Sums up the wall time spent in the stages of the report pipeline and
+    counters like the HTML and PDF bytes. Stages may nest, the time of a
+    stage includes the stages it calls.
+    """
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.lock = threading.Lock()
+        self.seconds = {}
+        self.calls = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def add(self, name, seconds):
+        """Records one call of stage name that took seconds."""
+        with self.lock:
+            self.seconds[name] = self.seconds.get(name, 0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def collected(self):
+        """The sums so far, for merge() in another process."""
+        with self.lock:
+            return {'seconds': dict(self.seconds), 'calls': dict(self.calls),
+                    'counters': dict(self.counters)}
+
+    def merge(self, collected):
+        """Adds the sums of collected() of e.g. a worker process."""
+        with self.lock:
+            for sums, values in [(self.seconds, collected['seconds']), (self.calls, collected['calls']),
+                                 (self.counters, collected['counters'])]:
+                for name, value in values.items():
+                    sums[name] = sums.get(name, 0) + value
+
+    def summary(self):
+        return {
+            'wall_s': perf_counter() - self.start,
+            'stages': {
+                name: {'calls': self.calls[name], 'seconds': seconds}
+                for name, seconds in self.seconds.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+    def write(self, filename='-'):
+        """Prints a table to stderr, or writes JSON if a filename is given."""
+        summary = self.summary()
+        if filename != '-':
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=1, sort_keys=True)
+            return
+        print('{:<14} {:>8} {:>10} {:>10}'.format('stage', 'calls', 'total s', 'mean ms'),
+              file=sys.stderr)
+        for name, stage in sorted(summary['stages'].items(), key=lambda item: -item[1]['seconds']):
+            print('{:<14} {:>8} {:>10.3f} {:>10.3f}'.format(
+                name, stage['calls'], stage['seconds'], 1000 * stage['seconds'] / stage['calls']),
+                file=sys.stderr)
+        for name, value in sorted(summary['counters'].items()):
+            print('{:<14} {:>8}'.format(name, value), file=sys.stderr)
+        print('{:<14} {:>8} {:>10.3f}'.format('wall', '', summary['wall_s']), file=sys.stderr)
+
+
+# Set by --timings, stays None otherwise so the hooks below cost next to nothing
+TIMINGS = None
+NOT_TIMED = nullcontext()
+
+
+def timed(name):
+    return NOT_TIMED if TIMINGS is None else TIMINGS.stage(name)
+
+
+def count(name, value=1):
+    if TIMINGS is not None:
+        TIMINGS.count(name, value)
+
+
+def instrumented(name):
+    """
+    Decorator, records every call of the function as stage name. Of a
+    generator function only the time spent producing its items counts, not
+    the time the caller spends between them.
+    """
+    def decorate(function):
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator(*args, **kwargs):
+                timings = TIMINGS
+                if timings is None:
+                    return (yield from function(*args, **kwargs))
+                items = function(*args, **kwargs)
+                seconds = 0
+                try:
+                    while True:
+                        start = perf_counter()
+                        try:
+                            item = next(items)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            seconds += perf_counter() - start
+                        yield item
+                finally:
+                    items.close()
+                    timings.add(name, seconds)
+            return generator
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if TIMINGS is None:
+                return function(*args, **kwargs)
+            with TIMINGS.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+UNI_LOGO = None
+
+
+def uni_logo():
+    """
+    Returns the built-in logo as base64 encoded SVG. It is only put together
+    when a report actually embeds it.
+    """
+    global UNI_LOGO
+    if UNI_LOGO is None:
+        UNI_LOGO = ''.join([
+            "PD94bWwgdmVyc2lvbj0iMS4wIiBlbmNvZGluZz0iVVRGLTgiPz4KPCEtLSBHZW5lcmF0b3I6IEFkb2Jl"
+            "IElsbHVzdHJhdG9yIDEyLjAuMSwgU1ZHIEV4cG9ydCBQbHVnLUluIC4gU1ZHIFZlcnNpb246IDYuMDAg"
+            "QnVpbGQgNTE0NDgpICAtLT4KPCFET0NUWVBFIHN2ZyBQVUJMSUMgIi0vL1czQy8vRFREIFNWRyAxLjEv"
+            "L0VOIiAiaHR0cDovL3d3dy53My5vcmcvR3JhcGhpY3MvU1ZHLzEuMS9EVEQvc3ZnMTEuZHRkIiBbCgk8"
+            "IUVOVElUWSBuc19zdmcgImh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KCTwhRU5USVRZIG5zX3hs"
+            "aW5rICJodHRwOi8vd3d3LnczLm9yZy8xOTk5L3hsaW5rIj4KXT4KPHN2ZyB2ZXJzaW9uPSIxLjEiIGlk"
+            "PSJMYXllcl8xIiB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHhtbG5zOnhsaW5rPSJo"
+            "dHRwOi8vd3d3LnczLm9yZy8xOTk5L3hsaW5rIiB3aWR0aD0iMjMxMS4yNSIgaGVpZ2h0PSI3NjAuMDE4"
+            "IiB2aWV3Qm94PSIwIDAgMjMxMS4yNSA3NjAuMDE4IiBvdmVyZmxvdz0idmlzaWJsZSIgZW5hYmxlLWJh"
+            "Y2tncm91bmQ9Im5ldyAwIDAgMjMxMS4yNSA3NjAuMDE4IiB4bWw6c3BhY2U9InByZXNlcnZlIj4KPGc+"
+            "Cgk8cGF0aCBmaWxsPSJub25lIiBzdHJva2U9IiNBNzFGM0MiIHN0cm9rZS13aWR0aD0iOS40MTciIGQ9"
+            "Ik0yODUuNjI2LDc0LjgyOWMtOC45MzksMC0xNi4xNjQtNy4xNzctMTYuMTY0LTE2LjAwOSAgIGMwLTgu"
+            "ODI5LDcuMjI1LTE2LjAwNCwxNi4xNjQtMTYuMDA0YzguOTE4LDAsMTYuMTQzLDcuMTc1LDE2LjE0Mywx"
+            "Ni4wMDRDMzAxLjc3LDY3LjY1MiwyOTQuNTQ1LDc0LjgyOSwyODUuNjI2LDc0LjgyOXoiLz4KCTxwYXRo"
+            "IGZpbGw9Im5vbmUiIHN0cm9rZT0iI0E3MUYzQyIgc3Ryb2tlLXdpZHRoPSIxNC41MDk4IiBkPSJNMTkz"
+            "LjkxMSw1MDIuNzk1VjI4MS4xODZsLTE4Ni42NSw5Ny42MnYyMjQuNjQxbDI3Ny43NDQsMTQ1LjQxOSAg"
+            "IGwyNzcuNzI5LTE0NS40MTlWMzc4LjgwNmwtMTg2LjctOTcuNjJ2MjIxLjYwOGwtOTEuMDI5LDQ4LjI3"
+            "NkwxOTMuOTExLDUwMi43OTVMMTkzLjkxMSw1MDIuNzk1eiBNNy4yMjYsNjIuOTM1djI4Ni40NTcgICBs"
+            "MTg2LjczNi05OC4yMTlWNjYuODYxIE0zNzUuMTg4LDY2Ljg0MWgxODguMjg4TDQ1Mi43MzgsNy4yMzhI"
+            "MTE1LjgzMUw1LjQ0Myw2Ni44NDFoMTg4LjI4OCBNNTYyLjc3MSw2Mi45MzV2Mjg2LjQ1NyAgIGwtMTg2"
+            "LjczNS05Ny42NjlWNjYuODYxIE0xOTMuOTYzLDY3LjYwM3YxODMuMzk1bDQ2LjE1Ny0yMy45NzF2LTg1"
+            "LjM1NmMwLTI0LjUyMSwyMC4xMDUtNDQuNDEsNDQuODg2LTQ0LjQxICAgYzI0Ljc2NywwLDQ0Ljg3Miwx"
+            "OS44OSw0NC44NzIsNDQuNDFsLTAuMTQxLDg1Ljg4OGw0Ni4yOTgsMjQuMjVsMC4wNzEtMTg0LjA1Mmwt"
+            "OTEuMTAxLTQ3LjU4NUwxOTMuOTYzLDY3LjYwM0wxOTMuOTYzLDY3LjYwM3oiLz4KCTxwYXRoIGQ9Ik01"
+            "OTkuOTksNjEuNTI0YzIyLjQ1MywyLjczNyw0MC41MjQtNS40NzUsNjAuNzg1LDIuNzM3Yy03LjEyMSw3"
+            "LjEyMS0yNC42NDIsNC45MjgtMjEuMzU2LDIwLjgxMWwxLjA5NiwxNjQuODI4ICAgYzMuMjg1LDEzLjE0"
+            "NiwxMi41OTQsMjUuNzM5LDI1LjE4OCwzMi44NThjMjEuOTA4LDguNzY0LDQ4LjE5MSwxMS41MDIsNjku"
+            "MDAyLTIuMTg4YzE2Ljk3NS0xMC45NTcsMjUuMTkxLTI3LjkzMiwyNC42NDItNDcuMDk0ICAgVjc2Ljg1"
+            "NWMwLjU1LTE0Ljc4MS0yNy45MjctMS42NDItMTUuODc5LTE2LjQyOWMxNi40MjksMS4wOTcsMzQuNDk1"
+            "LTIuMTg4LDQ5LjI4MiwyLjczOWMtMy44Myw4LjIxNy0yMS45MDEsMi43MzktMjAuODExLDE2Ljk3NSAg"
+            "IGwtMS42NDIsMTYyLjA5NWMtMy4yODUsMTcuNTI1LTkuODU1LDM2LjE0My0yNy45MjcsNDUuNDUyYy0z"
+            "MC42NjYsMTYuOTc1LTc3LjIxNCwxNy41MjUtMTA1LjE0MS00LjkyOSAgIGMtMTUuODgzLTEzLjE0NC0x"
+            "OS43MTQtMzEuMjE1LTIxLjM1NS01MC4zNzlWNzcuOTUzQzYxNi40MTksNjMuNzE3LDU4OS4wNCw3NC42"
+            "NjgsNTk5Ljk5LDYxLjUyNEw1OTkuOTksNjEuNTI0eiIvPgoJPHBhdGggZD0iTTgwMy43LDYwLjQyN2Mx"
+            "MC45NTUtMi4xODgsMjMuNTQ5LTAuNTQ2LDM1LjA1MS0xLjA5MmM0NS40NDcsNTkuNjg4LDg0Ljg3Niwx"
+            "MjEuNTY5LDEyOS43ODIsMTgxLjgwOGwyLjE5My0zLjgzNlY3My4wMjYgICBjLTIuMTkzLTEyLjA0OC0y"
+            "MS4zNjItMS42NDQtMTguNjIzLTEzLjY5MWMxNi40My0xLjY0MiwzNS41OTgtMi43MzksNTAuOTMsMS4w"
+            "OTJjLTIuNzM4LDguNzYzLTIwLjI2NSwyLjE5My0xOC42MTcsMTYuNDI5ICAgbC0yLjczOSwyMTcuNDA1"
+            "Yy0xNi40MjksMTAuNDAxLTkuMzA5LTE0LjI0LTE4LjA3MS0xOS43MTNjLTQxLjA3LTU3LjUtNzkuOTUz"
+            "LTExNi42NDItMTIyLjY2Ni0xNzEuOTUzICAgYy0zLjgzNSw1OC41OTctMy44MzUsMTIwLjQ3OCwwLDE4"
+            "MC4xNjVjMy44MzEsOS4zMSwxNi45NzYsMi4xODksMTcuNTI1LDExLjUwMmMtMTYuNDI5LDEuNjQ0LTM0"
+            "LjUsMS42NDQtNTAuOTMsMCAgIGMxLjY0My04Ljc2MywxOC42MTctMi43MzcsMTkuNzE0LTE0Ljc4NVY4"
+            "MS43ODljLTUuNDc4LTguNzYzLTE0LjIzNi0xNC43ODctMjMuNTQ5LTE3LjUyNlY2MC40MjdMODAzLjcs"
+            "NjAuNDI3eiIvPgoJPHBhdGggZD0iTTEwNDIuNDYxLDI4MC41NzFsMS4wOTctMjAzLjcxNmMxLjY0My0x"
+            "NS4zMzEtMzUuNTk4LTYuMDIzLTEzLjY5LTE3LjUyMWMzOS40MjksMC41NDYsNzUuMDIxLTEuMDk2LDEx"
+            "My45MDMsMS4wOTIgICBjLTAuNTUxLDguMjE3LTEzLjY5LDMuODM2LTE1Ljg4MywxMi42YzE1Ljg4Myw2"
+            "My41MjIsNDAuNTI0LDEyNC4zMDgsNjIuOTc3LDE4NS4wOTNsNC45MjgtNC45MjhsNjAuMjM5LTE3Ni4z"
+            "MzUgICBjLTAuNTUxLTMuODI5LTIuNzM5LTcuNjY2LTYuMDI0LTEwLjQwNGMtNC45MzMsMS4wOTYtOC43"
+            "NjMtMC41NDYtMTIuMDQ3LTMuMjg1bDEuMDkyLTMuODMxaDE3OS4wNzMgICBjMi43MzQsMTAuNDA2LDEy"
+            "LjU5MywyMC44MDYsNy42NjYsMzAuNjY2Yy0xNi45NzktMzEuMjE3LTU2Ljk1NC0yMS45MDgtODguMTY5"
+            "LTIxLjkwOGwtNy4xMTYsOC43NjNsLTEuMDk3LDczLjkyOSAgIGMxMy4xNDUsMTAuOTUyLDMzLjQwNC0w"
+            "LjU0Niw1MC4zOCw0LjkyOWMyLjE5MywxLjA5NiwzLjgzNSw0LjM4MSwxLjA5Niw2LjAyM2MtMTUuMzMx"
+            "LDcuMTItMzkuNDI3LTQuMzgyLTUwLjM3OSw5Ljg2ICAgbC0xLjA5NywxMDQuMDQyYzAuNTQ2LDUuNDc5"
+            "LDcuMTIxLDkuMzA5LDEyLjA0OSw5Ljg1OWMzMS4yMTUtNC4zODEsNzUuMDIsMTMuMTQ1LDg5LjI2LTI0"
+            "LjY0Mmg2LjAyNSAgIGMtMi43NCwxMi4wNDgtNi4wMjUsMjMuNTQ2LTEzLjY5LDMzLjQwNGMtNDUuNDUy"
+            "LTAuNTUxLTkxLjQ1LDEuMDkyLTEzNS44MTItMS4wOTZjMC41NTItMTIuNTk0LDIwLjgxMi0wLjU0Niwx"
+            "OS43MTUtMTYuNDMgICBsLTEuMDkyLTIwNi40NDljLTcuNjcxLTQuOTI4LTE4LjA3MS02LjAyNC0yNy4z"
+            "ODUtMy44MzZsLTEwLjk1MSwxMi41OTlsLTc1LjU3MiwyMTUuMjEyYy0yLjE4OCwyLjczNC00LjkyNyw0"
+            "LjM4Mi04Ljc1OCwzLjgzMSAgIGwtNi4wMjMtOC43NjNsLTczLjkyOS0yMTIuNDc0Yy02LjU3LTEwLjQw"
+            "NC0yMC44MTEtMTEuNDk2LTMyLjMwOC04Ljc2M2wtNC45MzIsNi4wMjR2MjA2LjQ1NCAgIGMxLjY0Miw4"
+            "LjIxMiwxMi4wNDYsNy4xMTUsMTguNjIxLDguNzU4djQuOTMyYy0yMC4yNjUsMS4wOTItNDUuNDUyLDMu"
+            "ODMxLTYyLjk3Ny0yLjczOCAgIEMxMDI3LjEyOSwyODQuNDAyLDEwMzkuNzIyLDI5MS41MjMsMTA0Mi40"
+            "NjEsMjgwLjU3MUwxMDQyLjQ2MSwyODAuNTcxeiIvPgoJPHBhdGggZD0iTTE0NjAuMjkyLDI3OS40NzVs"
+            "MS4wOTctMTg5LjQ3NWMwLjU0Ni0xMC40MDYtMTQuNzg3LTMuMjg1LTEzLjY5LTEzLjE0NmMzNy43ODYt"
+            "MjIuNDUyLDg5LjI2MS0yOS41NjgsMTI4LjY4OS02LjU2OCAgIGMxNy41MjEsMTUuMzMxLDIzLjU0NCwz"
+            "Ny4yMzQsMTguNjE3LDYwLjc4NGMtMy44MywxNS4zMzItMTUuMzMyLDMyLjMwNy0zMS4yMTEsMzguMzMx"
+            "bC0yOS41NzMsOC43NjNsNzEuNzM1LDEwMS4zMTEgICBjNS40NzgsOS44NTQsMTguNjIzLDQuOTI3LDIz"
+            "LjU1LDEzLjY4OWMtMTIuMDQ4LDMuODMxLTI3LjkyNywyLjE4OC00MC41MjQsMS4wOTdjLTI4LjQ3OC00"
+            "MS4wNzEtNjEuMzMxLTc5LjQwNy04NC4zMy0xMjIuNjY1ICAgYzI1LjE4Ny0yLjE5NCw1Mi4wMjEtNy4x"
+            "MjEsNjQuNjE1LTMxLjc2M2M2LjAyNC0xNi45NzUsNC45MjctMzkuNDI5LTMuODMxLTU0Ljc2MmMtMTIu"
+            "MDQ4LTE0LjI0LTI3LjM4LTIxLjM1Ni00Ni4wMDItMTkuNzEzICAgYy05Ljg1NCwxLjA5Mi0yMC4yNjEs"
+            "Mi4xODgtMjguNDczLDguNzU4bC02LjAyMywxMC45NTVsLTIuMTkzLDE5MC41NjdjMC41NTEsNi4wMjMs"
+            "NC45MjcsMTAuOTU3LDEwLjk1MSwxMi4wNDggICBjNC4zODItMC41NDYsNy4xMiwxLjY0MywxMC45NTYs"
+            "Mi43Mzh2My44MzZjLTIwLjgxMSwxLjA5MS00NC4zNTksMi43MzQtNjQuMDc0LTEuMDk3ICAgQzE0NDMu"
+            "MzE1LDI4NC40MDIsMTQ1OC42NDgsMjkwLjQyNiwxNDYwLjI5MiwyNzkuNDc1TDE0NjAuMjkyLDI3OS40"
+            "NzV6Ii8+Cgk8cGF0aCBkPSJNMTYyOS41MDIsMjQ4LjI1OWMxMi41OTQsMTYuNDMsMjguNDc4LDMzLjk1"
+            "NSw0OS4yODMsMzguMzM4YzE4LjA3MSwzLjgyOSwzNi4xNDQsMCw0OS44MzMtMTAuOTU3ICAgYzExLjUw"
+            "Mi0xMi4wNDgsMTYuNDMtMjYuODMsMTQuNzg3LTQ0LjM1NWMtMTYuOTc2LTUyLjAyMi03OC44NTctNTku"
+            "MTQyLTEwNS4xNDEtMTA0LjA0OGMtNi41NzQtMTcuNTIxLTQuMzgxLTM5Ljk3NSw3LjExNi01NC4yMSAg"
+            "IGMyMi40NTItMjYuMjg5LDYxLjMzNS0xNy41MjYsOTAuMzU4LTEyLjZjNC45MjcsMCw4LjIxMi03LjY2"
+            "NiwxMi41OTQtNC45MjdjMi4xOTIsMTQuNzg3LDExLjUwMiwyOS41NzMsNi4wMjMsNDQuMzU1ICAgYy0x"
+            "Mi41OTQtMTMuMTQtMjQuNjQyLTMwLjExNC00My4yNTktMzQuNDk1Yy0xNS4zMzMtMi4xOTQtMzMuNDA0"
+            "LTIuNzQtNDQuMzU1LDkuODU0Yy0xMi4wNDgsOS4zMDktMTIuNTk5LDI0LjY0Mi05Ljg2LDM4LjMzMSAg"
+            "IGMzMC4xMiw0OC43NDIsMTI3LjA0OCw2My41MjQsMTA2LjIzNywxMzguNTVjLTYuMDIzLDIyLjQ1My0y"
+            "Ny45MjYsNDAuNTI0LTUwLjkzLDQ0LjM1NWMtMjIuOTk5LDUuNDc4LTQzLjI2LTMuODMxLTY1LjE2MS02"
+            "LjAyNCAgIGMtNC45MzMsMS42NDQtNC45MzMsMTEuNTAyLTExLjUwMiw2LjAyNGMtMy4yODQtMTUuMzMz"
+            "LTguMjEzLTI5LjU2OC05Ljg1OS00NS40NTJMMTYyOS41MDIsMjQ4LjI1OUwxNjI5LjUwMiwyNDguMjU5"
+            "eiIvPgoJPHBhdGggZD0iTTE3OTIuNjk2LDI3Ni43MzVWNzAuMjg2Yy0yLjczOS05LjMwOS0yNi4yODkt"
+            "MC41NDYtMTQuNzg3LTEyLjA0OGMxOS4xNjMtMS4wOTYsNDQuMzU1LTMuODM2LDU5LjE0MiwyLjE4OCAg"
+            "IGMtNC45MjcsNi41NzUtMTkuMTY3LDEuNjQ4LTIwLjgxMSwxMy42OTFjLTEuNjQyLDY1LjE2NS0xLjY0"
+            "MiwxNDQuMDIyLDAsMjA3LjU0NWM0LjM4Miw2LjAyNCwxMi41OTQsNC4zODIsMTguNjE4LDYuMDI0ICAg"
+            "YzEuMDk3LDcuNjY1LTcuNjY2LDYuMDIzLTEyLjU5NCw2LjU3NGMtMTYuNDI5LTEuMDk3LTM0LjUwMSwy"
+            "LjE4OC00OS4yODItMi43MzggICBDMTc3NS43MTYsMjgyLjc1OSwxNzkxLjU5OSwyODkuMzI5LDE3OTIu"
+            "Njk2LDI3Ni43MzVMMTc5Mi42OTYsMjc2LjczNXoiLz4KCTxwYXRoIGQ9Ik0xODU1LjY2Myw1Ni41OTVs"
+            "MTU3LjE2NywyLjczOWMzLjI4NSwxMi4wNDgsMTEuNDk3LDIzLjU0NSw5Ljg1NCwzNS41OTNjLTkuMzA5"
+            "LTEuNjQzLTkuODU0LTEzLjEzOS0xOC42MTctMTguMDcyICAgYy0xMi4wNDgtMTQuNzgxLTMyLjg1OC04"
+            "Ljc2My01MC45My0xMC40MDRsLTkuODU1LDEwLjQwNGMwLDY3LjkwNi00LjM4MSwxMzcuOTk5LTEuMDk2"
+            "LDIwNC44MDggICBjNC4zODEsNy42NjYsMjIuOTk4LDAsMTcuNTI1LDExLjUwMmMtMjEuMzU2LTAuNTQ2"
+            "LTQyLjcxMywwLjU0Ni02Mi45NzgtMS42NDNjMi4xOTItMTAuOTUxLDI0LjY0Mi0yLjE5MywyMS45MDYt"
+            "MTkuNzE0ICAgbDEuNjQ0LTE5Ny42OTFjLTEwLjk1Ni0xMS40OTgtMzIuMzEyLTkuODU1LTQ3LjA5NS02"
+            "LjAyNGMtMTMuNjksMS42NDctMjAuMjY1LDE2LjQyOS0yOC40NzgsMjUuNzM3bC00LjkyNy0yLjE4OCAg"
+            "IEMxODQzLjA3LDc5LjA0OSwxODQ2LjkwMSw2NS45MDUsMTg1NS42NjMsNTYuNTk1TDE4NTUuNjYzLDU2"
+            "LjU5NXoiLz4KCTxwYXRoIGQ9Ik0yMDM2LjM3OCwyMi4wOTVjNi41NzQsMC41NSwxNS44ODMsMS42NDIs"
+            "MTYuOTc1LDkuODU5YzEuNjQ3LDguNzU3LTEuMDkyLDE3LjUyMS05Ljg1NCwxOS43MTQgICBjLTguMjEy"
+            "LDEuNjQzLTE3LjUyNi0xLjA5Ny0xOS43MTQtOS44NTlDMjAyMS41OTUsMzIuNTAxLDIwMjcuNjE1LDIz"
+            "LjczNywyMDM2LjM3OCwyMi4wOTVMMjAzNi4zNzgsMjIuMDk1eiIvPgoJPHBhdGggZD0iTTIxNDEuNTI0"
+            "LDI4MC41NzFsLTYzLjUyMy0yMTAuMjg1Yy0zLjI4NS00LjM4MS0yLjc0LTE0LjIzNi0xMC45NTctMTMu"
+            "NjljLTI0LjY0Miw3My4zNzgtNDkuMjgzLDE0Ni4yMTEtNzMuOTI0LDIxOS4wNDMgICBsLTExLjUwMywx"
+            "MC45NTdjLTIuNzM3LDIuMTg4LTEwLjQwNCwwLjU0Ni04LjIxMSw2LjU2OGwzOC4zMzEsMi4xODhsNC45"
+            "MjgtMy44M2MtMS42NDMtNS40NzktMTEuNDk4LTMuMjg1LTEzLjY4OS05Ljg2ICAgYzYuNTczLTI0LjY0"
+            "MSw5Ljg1OC01MC45MjUsMjUuNzM3LTcxLjczNWMyMC4yNjUsMCwzOC44ODMsMCw2MC43ODQsMGw3LjEy"
+            "MSw0LjkyOGM3LjY2NSwyMS45MDYsMTcuNTI1LDQyLjcxMiwxOC42MTcsNjYuODA4ICAgYy0yLjc0LDgu"
+            "MjE3LTEyLjA0OCw0LjkzNC0xOC42MTcsNy42Njd2NC45MzJjMjAuMjU5LDEuNjQ0LDQ0LjM1NCwxLjY0"
+            "NCw2Mi45NzgsMCAgIEMyMTU4LjQ5OSwyODYuMDQ0LDIxNDUuMzU0LDI5MC40MjUsMjE0MS41MjQsMjgw"
+            "LjU3MUwyMTQxLjUyNCwyODAuNTcxeiBNMjA4Ny44NTQsMjAwLjA3MmwtNTguMDQ1LTEuMDk3bDMxLjIx"
+            "Ni05Ni4zODEgICBjMTIuMDQzLDI5LjU3MywyMC4yNjEsNjMuNTIyLDMwLjY2NSw5NS4yODVMMjA4Ny44"
+            "NTQsMjAwLjA3MkwyMDg3Ljg1NCwyMDAuMDcyeiIvPgoJPHBhdGggZD0iTTIwOTMuMzI5LDIyLjA5NWM5"
+            "LjMwOC0yLjE4OCwxOC4wNyw0LjM4MSwxOS43MTQsMTIuNTk0Yy0wLjU1Miw2LjU3NC0zLjI4NSwxNC4y"
+            "NDEtOS44NiwxNi45NzkgICBjLTguMjEyLDEuMDkxLTE2LjQyOS0wLjU1MS0yMC4yNi04LjIxN0MyMDc5"
+            "LjA4NywzNC42ODksMjA4NC41NjUsMjQuODM1LDIwOTMuMzI5LDIyLjA5NUwyMDkzLjMyOSwyMi4wOTV6"
+            "Ii8+Cgk8cGF0aCBkPSJNMjEzNC45NTEsNTguMjM5bDE1Ni4wNywxLjA5NmM2LjAyMywxMS40OTcsMTEu"
+            "NTAyLDI0LjY0MiwxMC45NSwzNy4yMzVjLTEwLjk1LTQuOTI4LTE0Ljc4MS0yMi40NTMtMjguNDcxLTI2"
+            "LjI4MyAgIGMtMTUuMzMzLTEuMDk4LTQyLjE2OC05Ljg2LTUwLjM4Niw3LjY2NmwtMi43MzMsMjAxLjUy"
+            "MmMyLjE4OCwxMC45NSwyNy4zOCwzLjgzMSwxNy41MjEsMTQuNzg2aC01OS42ODlsLTMuODM1LTMuODM2"
+            "ICAgYzUuNDc5LTcuNjY2LDE5LjcxNCwwLDIyLjQ1My0xMi41OTRsMy44MzYtMTk4Ljc4MmMtMC41NTEt"
+            "Ny4xMi04LjIxNy0xMi4wNDgtMTQuNzg3LTEyLjU5OSAgIGMtMTYuOTc2LTAuNTQ1LTMyLjg1OCwwLjU1"
+            "MS00NS45OTgsOC43NjRjLTcuNjcxLDYuMDIyLTkuODU4LDIwLjgxMS0xOS43MTQsMTguNjE2ICAgQzIx"
+            "MjEuMjYxLDgwLjY5MiwyMTI2LjE4OCw2Ny41NDgsMjEzNC45NTEsNTguMjM5TDIxMzQuOTUxLDU4LjIz"
+            "OXoiLz4KCTxwYXRoIGQ9Ik04MjIuMDM4LDU0NS42MTJjMTAuNDA0LDMuODM2LDE2Ljk3NSwxNy41MjYs"
+            "MjYuMjg4LDI0LjY0N2MxNi45NzUsMTMuNjg5LDQzLjI1OSwxOS43MTMsNjQuMDY5LDkuODU0ICAgYzE0"
+            "Ljc4Ni04Ljc2MywyNC4xMS0yMy41NDYsMjUuNzM4LTM5Ljk3NWMtMi43MzktNjIuNDI3LTc3Ljc2LTY3"
+            "LjM1OC0xMDMuNDk3LTExNi4wOTZjLTUuNDc4LTEzLjY5LTUuNDc4LTMwLjEyLDAtNDQuMzU1ICAgYzEw"
+            "Ljk1MS0yMS4zNTYsMzQuNDk1LTI5LjU3Myw1OC4wNDUtMjguNDc4YzE2LjQzLTEuMDk2LDMxLjc2Mywx"
+            "My42OSw0Ny4xMDksMS4wOTdoMy4yNzFjMy44MzUsMTQuMjM2LDguMjEyLDI5LjU2OSw3LjY2Niw0My4y"
+            "NTkgICBjLTEwLjkzNy0zLjI4NS0xMy4xNDUtMTYuNDI0LTIzLjU0NS0yMi45OTljLTE2Ljk4LTEyLjU5"
+            "NC00MS42MjEtMTUuODc4LTYwLjc5LTUuNDczYy0xMC4zOTksOC4yMTItMTQuMjM1LDE4LjYxOC0xNS44"
+            "NzcsMzAuMTE5ICAgYzEyLjU5Myw1My42NjQsNzguMzEsNTUuODUzLDEwMi40MDUsMTA1LjE0MWMxMS41"
+            "MTYsMTkuNzE0LDYuNTY5LDQ4LjE5MS00LjkxMyw2Ni4yNjJjLTE5LjE4MywyNi4yODUtNTEuNDk1LDI3"
+            "LjkyNy03OS45NjgsMjMuNTQ2ICAgYy0xMC45NTYsMS4wOTYtMjUuMTkxLTE0Ljc4Ny0zMi4zMTIsMS42"
+            "NDJoLTQuOTI3QzgyNS4zNDIsNTc4LjQ3MSw4MjIuNTg5LDU2MC45NDUsODIyLjAzOCw1NDUuNjEyTDgy"
+            "Mi4wMzgsNTQ1LjYxMnoiLz4KCTxwYXRoIGQ9Ik0xMDAyLjc1MSwzNTMuOTQ5YzQ2LjAwMiw1OC4wNDYs"
+            "ODMuMjM3LDEyMy4yMTIsMTI5Ljc4NSwxODEuMjYyYzMuODM2LTU0Ljc2NSwyLjczOS0xMTUsMS4xMTEt"
+            "MTY5LjIxNCAgIGMtMi43NTMtOS4zMDktMjUuMjA3LTEuMDk4LTE0LjgwMS0xMi4wNDhjMTUuODc5LDAs"
+            "MzIuODU4LTEuMDk3LDQ4LjE5MSwxLjA5N2MtMi43MzksOC43NTgtMTguNjIzLDIuMTg4LTE5LjcxNSwx"
+            "NC43ODIgICBsLTIuNzI0LDIyMS4yMzVjLTEyLjYwOCw2LjU3NC05LjMyNC04Ljc1Ny0xMy43MDUtMTQu"
+            "NzgxYy00MS42MjEtNTkuNjkzLTgyLjE0Mi0xMjEuNTc1LTEyNS45NTEtMTc5LjA3ICAgYy0zLjgzNiw1"
+            "NS44NTQtMi43MTgsMTIzLjIxMi0xLjA5NiwxODEuMjU5YzQuMzgxLDcuMTIsMTUuODgzLDEuMDk3LDE3"
+            "LjUyNCwxMC40MDVjLTE1LjMzMSwzLjI4NS0zNi42OTMsMy4yODUtNTAuOTI5LDAgICBjMS42NDItOC43"
+            "NjMsMTguNjE2LTIuNzM5LDE5LjcxNC0xNS4zMzNsMS4wOTctMTk3LjY5MmMtNi41NzUtOC4yMTItMTIu"
+            "NTk0LTE1Ljg3OS0yMy0xNi45NzV2LTMuODMxTDEwMDIuNzUxLDM1My45NDkgICBMMTAwMi43NTEsMzUz"
+            "Ljk0OXoiLz4KCTxwYXRoIGQ9Ik03NTEuOTQ0LDM1OC44NzdjLTM3LjIzOS0xMi4wNDgtODMuNzg0LTcu"
+            "NjY3LTExMi44MDcsMTguNjIyYy00Mi43MTcsMzguMzMxLTQ1LjQ1MiwxMDUuNjg2LTI4LjQ3NywxNTYu"
+            "NjE2ICAgYzE0Ljc4NywzMy45NSw0OS44MzQsNTkuNjg4LDg2LjUzNyw2MC43ODVjNDEuMDc2LDMuMjg0"
+            "LDc3Ljc0NS0xMC40MDYsMTAxLjI5NS00My4yNjVjMjMuNTQ1LTM0LjQ5NSwyNS43MzctODUuNDI2LDE0"
+            "Ljc4Mi0xMjUuOTUxICAgQzgwNS4wNjMsMzk3LjIxMyw3ODAuOTg3LDM2Ny42MzksNzUxLjk0NCwzNTgu"
+            "ODc3TDc1MS45NDQsMzU4Ljg3N3ogTTc2NC4wMDcsNTYyLjU5MmMtMTkuMTgzLDIxLjM1Ni00OC43NTIs"
+            "MjYuMjg0LTc2LjY4MywxOS43MTUgICBjLTI3LjM4MS03LjEyMS00NC4zNTUtMzUuMDUyLTU0LjIxLTU5"
+            "LjE0NGMtMTMuMTI0LTUzLjExOC03LjY2Ni0xMTUuNTUsMzguMzMxLTE0OS41YzE2LjQzLTEyLjA0OCw0"
+            "MC41MjUtMTMuMTQ2LDYwLjIzOS04Ljc2NCAgIGMzNi42ODksOC4yMTgsNTYuNDAzLDQ3LjY0Niw2MC43"
+            "OTksODEuNTk2Qzc5Ny45NDIsNDg5Ljc1OSw3OTEuMzcyLDUzMS4zNzUsNzY0LjAwNyw1NjIuNTkyTDc2"
+            "NC4wMDcsNTYyLjU5MnoiLz4KCTxwYXRoIGQ9Ik0xMzI2LjM5MSw1ODAuMTE0bC02Ny45MDYtMjE5LjA0"
+            "NGwtNi4wMjMtNy4xMmwtMy44MzEsMi4xODhsLTcxLjc0LDIxNi4zMDlsLTguNzY0LDEwLjk1MiAgIGMt"
+            "Mi43MzQsNS40NzgtMTMuNjg5LTEuNjQ0LTEwLjk1MSw3LjY2NWw0NS40NzIsMS4wOThjMy44MTUtMTEu"
+            "NTAyLTEzLjcxLTIuNzM5LTE1Ljg5Ny0xMi4wNDggICBjNi41NjktMjQuNjQyLDkuODU0LTUyLjAyMiwy"
+            "NS43MzctNzEuNzM2YzIyLjQ1MywwLDUwLjkyNS03LjEyLDY5LjU0OCw2LjAyNGM3LjY2NiwyMS4zNTYs"
+            "MTUuMzMzLDQyLjE2NywxNi45NzUsNjUuNzEyICAgYy0yLjczOSw5LjMwOS0xNy41MDUsMS42NDItMTku"
+            "NzE0LDEwLjk1YzE4LjYxOCw0LjM4Myw0MC41MjEsMS42NDQsNjAuNzg1LDIuNzM5ICAgQzEzNTEuMDMx"
+            "LDU4My4zOTgsMTMyOS42NzQsNTg4LjMzLDEzMjYuMzkxLDU4MC4xMTRMMTMyNi4zOTEsNTgwLjExNHog"
+            "TTEyMTIuNDg3LDQ5NS43ODQgICBjMTAuNDA0LTMyLjMxMiwyMC44MDYtNjUuNzE3LDMyLjMwOC05Ni4z"
+            "ODJjMTEuNTAyLDMxLjc2MywyMS45MDIsNjQuNjIsMjkuNTczLDk3LjQ3NUwxMjEyLjQ4Nyw0OTUuNzg0"
+            "TDEyMTIuNDg3LDQ5NS43ODR6Ii8+Cgk8cGF0aCBkPSJNMTUwOS4yOTUsNDg4LjY2NGMtMTAuMzk5LTE3"
+            "LjUyNi0yOS4wMjItMjQuMDk2LTQ3LjA5NC0yOC40NzdjMy44MzYtMy4yODUsOC4yMTgtNC4zODIsMTIu"
+            "NTk5LTYuNTcgICBjMjAuODI2LTkuODU5LDMwLjY2NC0zMS4yMTcsMjkuNTY4LTU0LjIxNWMtMy4yODUt"
+            "MTcuNTI1LTEzLjY4OS0zOC44ODMtMzMuNDA0LTQzLjI2NWMtMzguMzMyLTkuODU0LTg1LjQyNi01LjQ3"
+            "My0xMTMuOTAzLDE5LjcxNSAgIGwxMi41OTQsNy42NjZsMy44MzYsMTc5LjA3NWMtMS4wOTcsOC4yMTIt"
+            "MTEuNTAzLDguNzU4LTE0Ljc4NywxMy42ODljNC4zODIsNi4wMjQsMTIuMDQ4LDEwLjk1MSwxOS43MTQs"
+            "MTIuNTk0ICAgYzQyLjE2OCw5Ljg1NCw5OC4wMjQsMTIuMDQ4LDEyNy4wNDgtMjYuMjgzQzE1MTkuMTU1"
+            "LDU0Mi44NzksMTUyMS4zNDMsNTA5LjQ3NCwxNTA5LjI5NSw0ODguNjY0TDE1MDkuMjk1LDQ4OC42NjR6"
+            "ICAgIE0xNDc1Ljg5Miw1NjguNjE2Yy0xNi45NzYsMTcuNTIxLTQ3LjY0MiwxOC4wNjYtNjguOTk4LDku"
+            "ODU1bC05LjgzOC0xMC45NTFjLTEuMTEyLTYxLjg4Mi0zLjg1Mi0xMjUuOTUxLTIuNzU1LTE5MC4wMjEg"
+            "ICBjNy4xMTYtMTMuMTQ2LDIyLjQ0Ny0xNi40MywzNy4yMzQtMTYuNDNjMTIuNTk0LDAuNTQ2LDI0LjY0"
+            "MiwyLjczMywzNC41MDIsOS44NTRjMTkuNzEzLDE1Ljg4MywxNS4zMzIsNDIuNzEyLDguNzYzLDYyLjk3"
+            "OCAgIGMtMTMuMTQ1LDIxLjM1Ny0zOC4zMzgsMjIuOTk5LTYxLjg2NywyNS4xODhjLTYuMDM5LDMuMjg0"
+            "LDAuNTMxLDguMjE4LDMuODE1LDkuODU5YzI1LjczOS0xLjY0Miw1My4xMTgtMS4wOTYsNjYuODEsMjEu"
+            "OTAyICAgQzE0OTUuNjI2LDUxMy44NSwxNDkzLjQxNyw1NDguOTAxLDE0NzUuODkyLDU2OC42MTZMMTQ3"
+            "NS44OTIsNTY4LjYxNnoiLz4KCTxwYXRoIGQ9Ik0xNTUxLjQ1Niw1NzUuMTg2bDIuMTkzLTE4OS40NzVj"
+            "MC04Ljc2NC0xMC45NTYtNC4zODMtMTMuMTQ1LTEwLjk1MmMyMC4yNjEtMjEuMzU1LDU0LjIxNS0yNC42"
+            "NDYsODQuODgtMjIuNDUzICAgYzIxLjkwMy0wLjU0Niw0MS4wNyw4LjIxMiw1NC43NjIsMjYuMjg0Yzgu"
+            "NzYzLDE0LjI0LDEyLjU5MywzMy40MDQsNy4xMTksNTAuMzhjLTQuOTI3LDI0LjY0Ni0zMS43NDcsMzku"
+            "OTc5LTU0LjIxNSw0My4yNjQgICBjLTIuNzM4LDAuNTQ2LTYuMDIyLTAuNTQ2LTcuNjY2LDIuNzM4bDc2"
+            "LjY2OCwxMDYuMjM3YzUuNDc0LDYuMDI0LDE3LjUyMSwwLDE4LjYxOCw5Ljg1NGMtMTMuNjksMC0yOS41"
+            "NzQsNS40NzktNDAuNTI0LDAgICBsLTg0LjMzNS0xMTkuOTI4YzMuODM1LTEyLjA0OCwyNC4wOTYtMi4x"
+            "ODgsMzMuNDA4LTguNzYzYzEyLjA0NC00LjM3NiwyNS43MzMtMTMuMTM5LDMwLjY2Ni0yNS43MzIgICBj"
+            "OC43NjMtMTkuMTY5LDcuNjY3LTQ2LjU0OS04LjIxNy02MS44ODJjLTE0LjIzNi0xNS44ODMtMzguODc4"
+            "LTE1LjMzMy01OC4wNDYtMTAuOTU2Yy01LjQ1OCwyLjczOS0xMi4wNDgsNi4wMjQtMTQuNzg3LDEyLjA0"
+            "OCAgIGMtMi43MzksNjUuMTY2LTUuNDczLDEzNS4yNjUtMi43MzksMjAyLjYyYzMuMjksOS44NTgsMjYu"
+            "ODM1LDEuMDk2LDE3LjUyNywxMi41OTJjLTIwLjgxMS0wLjU0NS00Mi43MTQsMi4xOTQtNjEuODgyLTIu"
+            "MTg4ICAgQzE1MzMuOTM1LDU3OC40NzEsMTU1MC45MSw1ODguODc2LDE1NTEuNDU2LDU3NS4xODZMMTU1"
+            "MS40NTYsNTc1LjE4NnoiLz4KCTxwYXRoIGQ9Ik0xNzA4LjA3NiwzNTUuMDQ2bDU5LjY4OCwxLjA5MmMt"
+            "NC4zODEsNy42NjYtMjAuMjYsNC4zODEtMjEuMzQxLDE3LjUyNmwxLjYyNywxNzUuMjM4ICAgYzMuMjg1"
+            "LDE0LjIzNiwxNS44OTgsMjUuMTg3LDI4LjQ3NywzMi4zMDhjMjAuMjgsOS4zMDksNDYuNTQ0LDMuODMx"
+            "LDY1LjE2Ni00LjkyN2MxMy4xNC05LjMxMywyMi40NDgtMjEuOTA3LDIzLjU0Ni0zNy4yNCAgIGMwLTU4"
+            "LjU5Niw1LjQ5Mi0xMTMuOTAzLDAtMTcxLjk0OWMtMi43Mi03LjY2Ni0xNi45NzYtMi4xOTMtMTYuOTc2"
+            "LTEwLjk1NmMxNi45NzYsMCwzNS4wNDctNS40NzMsNTEuNDc2LDAgICBjLTEuMDk2LDEwLjQwNi0xNy41"
+            "MjUsMC41NTItMTkuNzE0LDEzLjY5bC0zLjgzNiwxNzMuMDUxYy0xLjY0MiwxNy41MjEtMTQuMjM1LDMy"
+            "LjMwOC0yOS41NjgsNDIuMTYxICAgYy0zMS43NjEsMTQuMjQyLTc4Ljg1NSwxNi45OC0xMDYuMjM3LTku"
+            "ODU0Yy0xMy4xNDQtMTAuOTUyLTE1LjMzMi0yNi44MzUtMTYuOTc1LTQyLjE2OFYzNjcuMDk0ICAgQzE3"
+            "MjAuNjcsMzU3Ljc4NSwxNjk3LjEyLDM2Ni41NDMsMTcwOC4wNzYsMzU1LjA0NkwxNzA4LjA3NiwzNTUu"
+            "MDQ2eiIvPgoJPHBhdGggZD0iTTE3NzEuNjAyLDMxMy45NzRjNi41NzUsMS4wOTIsMTUuMzM3LDEuNjQ0"
+            "LDE2Ljk3OSwxMC40MDFjMi4xODgsNy42NzEtMi4xOTIsMTguMDcxLTEwLjk1NywyMC44MTEgICBjLTcu"
+            "NjY1LTAuNTQ2LTE2LjQyMy0yLjczOS0xOC42MTYtMTAuOTUxQzE3NTYuODE4LDMyNC45MjcsMTc2Mi44"
+            "NDMsMzE1LjYxOCwxNzcxLjYwMiwzMTMuOTc0eiIvPgoJPHBhdGggZD0iTTE4MjkuNjY4LDMxMy45NzRj"
+            "OC4yMTctMi4xOTIsMTUuODYzLDMuMjg1LDE4LjYwMywxMC40MDFjMC41NDYsOC4yMTctMS4wOTgsMTUu"
+            "ODg0LTguNzY0LDE5LjcxMyAgIGMtNy4xMTksMC41NTItMTkuMTYyLDAtMjEuMzU2LTkuODU0QzE4MTUu"
+            "NDEyLDMyNC45MjcsMTgyMS45ODYsMzE3LjI2LDE4MjkuNjY4LDMxMy45NzRMMTgyOS42NjgsMzEzLjk3"
+            "NHoiLz4KCTxwYXRoIGQ9Ik0xOTcwLjM4MywzNTYuMTM3YzIzLjAwNC03LjExNSw1MC45MzEtOC4yMTIs"
+            "NzIuODM3LDEuMDk4YzYuMDE5LDIuMTkyLDkuMzA5LTMuODMxLDEzLjY5MS02LjAyNCAgIGM5LjMwOSwx"
+            "MC40MDUsMTIuNTk0LDI3LjM4LDE1Ljg3OCw0Mi4xNjZjLTEyLjA0OCw4Ljc2NS0xMi41OTQtMTIuMDQ4"
+            "LTIxLjkwMi0xNC43ODZjLTE3LjUyNS0xNy41MjEtNDUuNDUyLTI0LjA5Ni02Ny45MDUtMTMuNjkgICBj"
+            "LTQ1LjQ1MiwyMi45OTktNTAuOTMsNzIuODMzLTUzLjExNywxMTguODM3YzMuMjgzLDM0LjQ5NSwxMC45"
+            "NSw2OC45OTYsNDEuNjE2LDg5LjgwN2MxNi40MjksNy42NjYsMzcuMjM5LDExLjQ5Nyw1NS44NTYsNi41"
+            "NjkgICBjMTcuNTI2LTQuMzgxLDMwLjY2Ni0yMC44MTEsNDQuMzU1LTMyLjMwOGM4Ljc2Myw0LjM4Mi0w"
+            "LjU0NSw5Ljg1NC0xLjA5MiwxNC43ODdjLTI1LjE5MSwyOS4wMjMtNjUuMTY2LDM3Ljc4MS0xMDEuMjk0"
+            "LDI2LjI4MyAgIGMtNDUuNDY3LTE2LjQyOS02MS44OTYtNjMuNTIyLTY1LjcxMi0xMDYuNzg2QzE5MDMu"
+            "NTk1LDQzMS4xNjUsMTkyMC4wMDQsMzc4LjA0NiwxOTcwLjM4MywzNTYuMTM3TDE5NzAuMzgzLDM1Ni4x"
+            "Mzd6Ii8+Cgk8cGF0aCBkPSJNMjEwNC4wMDYsNTc1LjE4NmMyLjE4OC02OC40NTEsMC41NDYtMTQxLjgz"
+            "NCwxLjA5MS0yMDguMDkyYy00LjkyNy01LjQ3OC0xMi4wNDctNi4wMjMtMTguNjE2LTcuMTIxdi00Ljky"
+            "NyAgIGMxOS43MTMtMS42NDMsNDIuMTY3LTEuNjQzLDYxLjg4MSwwYy0wLjU1MiwxMi4wNDgtMTcuNTI2"
+            "LDEuMDkyLTE5LjcxNCwxNC43ODJjLTEuNjQzLDI5LjU3My0xLjY0Myw2MS44ODIsMCw5MS40NTVsODMu"
+            "NzgzLTkwLjM1OCAgIGMzLjgzNi0xMi41OTQtMTMuMTQ1LTcuNjY3LTEzLjE0NS0xNS44NzljMTYuOTc5"
+            "LTEuNjQzLDM2LjY5NC0xLjY0Myw1NC4yMTUsMGMtMS42NDMsOS44NTQtMTUuMzMyLDUuNDczLTIxLjM1"
+            "NiwxMi4wNDggICBsLTc5Ljk1Miw4NC4zM3YzLjgzNmwxMDAuMjEzLDEyMS4wMjJjNC45MzIsOC43NTgs"
+            "MTYuOTc5LDYuMDI0LDIwLjgxMSwxMy42ODljLTEwLjk1MiwzLjgzMS0yNS43MzgsMi43MzUtMzcuMjM1"
+            "LDEuMDkyICAgYy0zOC44ODItNDIuNzEzLTcwLjA5OC04Ny4wNjgtMTA3LjMzMy0xMjkuNzhjLTQuMzY1"
+            "LDM3Ljc4NS0yLjczOSw3OC44NTUtMS4wOTYsMTE3LjE4OGMzLjgzNiw5LjMwOSwxOC42MTctMC41NDcs"
+            "MTguMDcxLDExLjUwMSAgIGgtNjIuOTczQzIwODMuNzQyLDU3Ny4zNzUsMjEwMS44MTMsNTg5LjQyMywy"
+            "MTA0LjAwNiw1NzUuMTg2TDIxMDQuMDA2LDU3NS4xODZ6Ii8+CjwvZz4KPC9zdmc+"
+        ])
+    return UNI_LOGO
 
 
 def days_of_month(year, month):
@@ -288,79 +451,278 @@ def days_of_month(year, month):
     return list(filter(is_in_correct_month, dates))
 
 
-def is_workday(date):
-    return date.weekday() < 5 and date not in holidays.DE(state='NI', years=date.year)
+# Holiday index, one set of dates per (state, year)
+HOLIDAYS = {}
+holidays_changed = False
+
+
+def holiday_dates(state, year):
+    global holidays_changed
+    key = (state, year)
+    if key not in HOLIDAYS:
+        with timed('holidays'):
+            HOLIDAYS[key] = frozenset(holidays_module().DE(state=state, years=year))
+        holidays_changed = True
+    return HOLIDAYS[key]
+
+
+def load_holiday_cache(filename):
+    """
+    Fills the holiday index from a JSON file written by save_holiday_cache(),
+    so the holidays package does not need to compute those years again.
+    """
+    global holidays_changed
+    try:
+        with open(filename, encoding='utf-8') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return
+    for key, dates in cache.items():
+        state, year = key.rsplit('-', 1)
+        HOLIDAYS[(state, int(year))] = frozenset(
+            datetime.date.fromisoformat(date) for date in dates)
+    holidays_changed = False
+
+
+def save_holiday_cache(filename):
+    if not holidays_changed:
+        return
+    cache = {
+        '{}-{}'.format(state, year): sorted(date.isoformat() for date in dates)
+        for (state, year), dates in HOLIDAYS.items()
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+
+def is_workday(date, state='NI'):
+    return date.weekday() < 5 and date not in holiday_dates(state, date.year)
 
 
 #def is_in_working_day_range(date, first, last):
 #    return date.day >= first and date.day >= last
 
 
-def random_distribution(days, hours, **kwargs):
+# Workdays per (state, year, month): sorted dates and their day numbers
+WORKDAYS = {}
+
+
+def month_workdays(year, month, state='NI'):
+    key = (state, year, month)
+    if key not in WORKDAYS:
+        dates = [day for day in days_of_month(year, month) if is_workday(day, state)]
+        WORKDAYS[key] = (dates, [day.day for day in dates])
+    return WORKDAYS[key]
+
+
+@instrumented('distribution')
+def distribute_hours(plans, min_hours_per_day=4, seed=None,
+                     max_hours_per_day=10, max_hours_per_week=48):
+    """
+    Distributes the hours of many person-months in one pass.
+
+    Args:
+        plans (list):               Tuples (year, month, hours, first, last,
+                                    state, blocked), first and last being
+                                    the range of days of the month that may
+                                    be used and blocked a set of dates that
+                                    may not (vacation, sick leave).
+        min_hours_per_day (int):    Hours per selected day, the last
+                                    selected day gets the rest.
+        seed:                       Seed of the random generator, the same
+                                    seed gives the same distribution.
+        max_hours_per_day (int):    Upper limit of every day.
+        max_hours_per_week (int):   Upper limit of every calendar week
+                                    (of the part within the month).
+
+    As long as these limits can not be reached with min_hours_per_day, as
+    many days as needed are drawn at random. Otherwise the hours are given
+    out in blocks of min_hours_per_day to the days in random order, round
+    after round, skipping full days and weeks.
+
+    Returns one list of (date, hours) per plan with all workdays in range.
+    A plan that does not fit gets a ValueError naming the limiting
+    constraint instead, the other plans are distributed all the same.
+    """
+    rng = random.Random(seed)
+    min_h = min_hours_per_day
+    unconstrained = min_h <= max_hours_per_day and 5 * min_h <= max_hours_per_week
+
+    # All workday slots of all plans in one flat array, plan i owns
+    # slots[offsets[i]:offsets[i + 1]]
+    offsets = array('L', [0])
+    ranges = []
+    for year, month, hours, first, last, state, blocked in plans:
+        dates, day_numbers = month_workdays(year, month, state)
+        lo, hi = bisect_left(day_numbers, first), bisect_right(day_numbers, last)
+        ranges.append((dates, lo, hi, hours, blocked, (year, month, first, last)))
+        offsets.append(offsets[-1] + hi - lo)
+
+    slots = array('H', [0]) * offsets[-1]
+    errors = {}
+    for num, ((dates, lo, hi, hours, blocked, period), offset) in enumerate(zip(ranges, offsets)):
+        if not hours:
+            continue
+        if blocked:
+            free = [offset + i for i in range(hi - lo) if dates[lo + i] not in blocked]
+        else:
+            free = range(offset, offset + hi - lo)
+        num_required = ceil(hours / min_h)
+
+        if unconstrained and num_required <= len(free):
+            selected = sorted(rng.sample(free, num_required))
+            for slot in selected[:-1]:
+                slots[slot] = min_h
+            slots[selected[-1]] = hours - min_h * (num_required - 1)
+            continue
+
+        weeks = {slot: dates[lo + slot - offset].isocalendar()[:2] for slot in free}
+        week_left = dict.fromkeys(weeks.values(), max_hours_per_week)
+        try:
+            check_capacity(hours, dates[lo:hi], [dates[lo + slot - offset] for slot in free],
+                           max_hours_per_day, max_hours_per_week, period)
+        except ValueError as e:
+            errors[num] = e
+            continue
+        order = rng.sample(free, len(free))
+        left = hours
+        while left:
+            for slot in order:
+                give = min(min_h, left, max_hours_per_day - slots[slot], week_left[weeks[slot]])
+                if give > 0:
+                    slots[slot] += give
+                    week_left[weeks[slot]] -= give
+                    left -= give
+                    if not left:
+                        break
+
+    return [errors[num] if num in errors else list(zip(dates[lo:hi], slots[offset:offset + hi - lo]))
+            for num, ((dates, lo, hi, _, _, _), offset) in enumerate(zip(ranges, offsets))]
+
+
+def check_capacity(hours, workdays, free, max_hours_per_day, max_hours_per_week, period):
+    """
+    Raises a ValueError explaining why hours do not fit into the free dates
+    out of workdays (the workdays between first and last). period is
+    (year, month, first, last).
+    """
+    weeks = {}
+    for date in free:
+        week = date.isocalendar()[1]
+        weeks[week] = weeks.get(week, 0) + 1
+    capacity = sum(min(max_hours_per_week, num * max_hours_per_day) for num in weeks.values())
+    if hours <= capacity:
+        return
+
+    year, month, first, last = period
+    label = '{:02d}/{:04d}'.format(month, year)
+    if not workdays:
+        if last >= monthrange(year, month)[1]:
+            raise ValueError('{}h do not fit into {}: the first day {} leaves no workdays'.format(
+                hours, label, first))
+        raise ValueError('{}h do not fit into {}: there are no workdays from day {} to day {}'.format(
+            hours, label, first, last))
+    if not free:
+        raise ValueError('{}h do not fit into {}: there is no workday left between the first '
+                         'and last day ({} workdays, all blocked)'.format(hours, label, len(workdays)))
+    reason = '{} free workdays ({} blocked) with at most {}h per day'.format(
+        len(free), len(workdays) - len(free), max_hours_per_day)
+    capped = [week for week, num in sorted(weeks.items())
+              if num * max_hours_per_day > max_hours_per_week]
+    if capped:
+        reason += ' and {}h in each of the calendar weeks {}'.format(
+            max_hours_per_week, ', '.join(map(str, capped)))
+    raise ValueError('{}h do not fit into {}: {} allow at most {}h'.format(hours, label, reason, capacity))
+
+
+def report_seed(args):
+    """
+    Returns the seed of the distribution of one report, None if args.seed is
+    not set. The seed is derived from args.seed, the person and the month,
+    so every report of a batch gets its own days, but the same ones on every
+    run and in every process.
+    """
+    if args.seed is None:
+        return None
+    inputs = json.dumps([str(args.seed), args.firstname, args.lastname, args.year, args.month])
+    return int.from_bytes(hashlib.sha256(inputs.encode('utf-8')).digest()[:8], 'big')
+
+
+# Date labels, independent of locale and timezone
+
+WEEKDAY_LABELS = {
+    'de': ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So'],
+    'en': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+}
+DATE_FORMATS = {
+    'de': '{weekday}., {day}.{month}.{year:04d}',
+    'en': '{weekday}, {month}/{day}/{year:04d}',
+}
+TWO_DIGITS = ['{:02d}'.format(i) for i in range(32)]
+
+# Labels of all days of a month per (language, year, month), index is the day
+DAY_LABELS = {}
+
+
+def day_labels(year, month, language='de'):
+    key = (language, year, month)
+    if key not in DAY_LABELS:
+        weekdays, fmt = WEEKDAY_LABELS[language], DATE_FORMATS[language]
+        first_weekday, num_days = monthrange(year, month)
+        DAY_LABELS[key] = [None] + [
+            fmt.format(weekday=weekdays[(first_weekday + day - 1) % 7], day=TWO_DIGITS[day],
+                       month=TWO_DIGITS[month], year=year)
+            for day in range(1, num_days + 1)]
+    return DAY_LABELS[key]
+
+
+def day_label(date, language='de'):
+    """Returns e.g. 'Mo., 02.01.2017' for German or 'Mon, 01/02/2017' for English."""
+    return day_labels(date.year, date.month, language)[date.day]
+
+
+class ReportRow:
     """
+    One day of the report table.
+
     Args:
-        days (list):    List of dates.
-        hours (int):    Number of hours to distribute.
-
-    Kwargs:
-        min_hours_per_day (int):    Minimum number of hours per day.
-    """
-    min_h_per_day = kwargs.get('min_hours_per_day', 4)
-    num_days_required = ceil(hours / min_h_per_day)
-    print(len(days))
-    print(num_days_required)
-    selected_days = sorted(random.sample(days, num_days_required))
-
-    day_to_hours = {}
-    for day in selected_days:
-        assigned_hours = min(min_h_per_day, hours)
-        day_to_hours[day] = assigned_hours
-        hours -= assigned_hours
-
-    return [(day, day_to_hours.get(day, 0)) for day in days]
-
-def getDay(day, month, year):
-    timestamp = mktime((year, month, day, 0, 0, 0, 0, 0, 0))
-    lt = localtime(timestamp)
-    monat = strftime('%a',lt)
-    if monat == 'Mon':
-        monat = 'Mo'
-    elif monat == 'Tue':
-        monat = 'Di'
-    elif monat == 'Wed':
-        monat = 'Mi'
-    elif monat == 'Thu':
-        monat = 'Do'
-    elif monat == 'Fri':
-        monat = 'Fr'
-    elif monat == 'Sat':
-        monat = 'Sa'
-    elif monat == 'Sun':
-        monat = 'So'
-
-    datum = strftime('., %d.%m.%Y', localtime(timestamp))
-    return monat + datum
-
-
-def default_tabulation(days_and_hours, monat, jahr):
-    args = read_args
+        date (datetime.date):   The day.
+        day (str):              Its label, e.g. 'Mo., 02.01.2017'.
+        begin (int):            Hour work begins, None on days off.
+        end (int):              Hour work ends, None on days off.
+        pause (int):            Hours of break, None on days off.
+        duration (int):         Hours worked, None on days off.
+        noted (datetime.date):  Date the hours were noted, None on days off.
+    """
+
+    __slots__ = ('date', 'day', 'begin', 'end', 'pause', 'duration', 'noted')
+
+    def __init__(self, date, day, begin=None, end=None, pause=None, duration=None, noted=None):
+        self.date = date
+        self.day = day
+        self.begin = begin
+        self.end = end
+        self.pause = pause
+        self.duration = duration
+        self.noted = noted
+
+
+@instrumented('tabulation')
+def default_tabulation(days_and_hours, monat, jahr, language='de', begin=8):
+    """
+    Returns one ReportRow per (date, hours), 0 hours being a day off. Work
+    starts at hour begin, days of more than 4 hours get an hour of break.
+    """
+    labels = day_labels(jahr, monat, language)
     table = []
 
     for day, hours in days_and_hours:
 
         if hours == 0:
-            row = {'day': getDay(day.day,monat,jahr), 'begin': None, 'end': None, 'pause': None,
-                   'duration': None, 'noted': None}
+            row = ReportRow(day, labels[day.day])
         else:
             pause = 1 if hours > 4 else 0
-            row = {
-                'day': getDay(day.day,monat,jahr),
-                'begin': 8,
-                'end': 8 + hours + pause,
-                'pause': pause,
-                'duration': hours,
-                'noted': day
-            }
+            row = ReportRow(day, labels[day.day], begin, begin + hours + pause, pause, hours, day)
 
         table.append(row)
 
@@ -369,15 +731,15 @@ def default_tabulation(days_and_hours, monat, jahr):
 
 def read_args():
     opts = argparse.ArgumentParser(description='Create workhour reports.')
-    opts.add_argument('firstname', metavar='FIRSTNAME', type=str,
+    opts.add_argument('firstname', metavar='FIRSTNAME', type=str, nargs='?',
                       help='your first name')
-    opts.add_argument('lastname', metavar='LASTNAME', type=str,
+    opts.add_argument('lastname', metavar='LASTNAME', type=str, nargs='?',
                       help='your last name')
-    opts.add_argument('hours', metavar='HOURS', type=int,
+    opts.add_argument('hours', metavar='HOURS', type=int, nargs='?',
                       help='number of actual working hours in this month')
-    opts.add_argument('year', metavar='YEAR', type=int,
+    opts.add_argument('year', metavar='YEAR', type=int, nargs='?',
                       help='which Year')
-    opts.add_argument('month', metavar='MONTH', type=int,
+    opts.add_argument('month', metavar='MONTH', type=int, nargs='?',
                       help='which month')
 
 
@@ -389,190 +751,2444 @@ def read_args():
                       help='number of monthly working hours of your contract, '
                            'if different to your actual hours in this month')
 
+    opts.add_argument('--begin', dest='begin', type=int,
+                      help='hour the work starts on every day (default: 8)')
+    opts.add_argument('--max-day', dest='max_day', type=int,
+                      help='maximum working hours per day (default: 10)')
+    opts.add_argument('--max-week', dest='max_week', type=int,
+                      help='maximum working hours per calendar week (default: 48)')
+    opts.add_argument('--blocked', dest='blocked', type=str, default='',
+                      metavar='DAYS',
+                      help='days off like vacation or sick leave, as days of '
+                           'the month and ISO dates, e.g. "3,10-14,2017-02-01:2017-02-03"')
+    opts.add_argument('--all-months', dest='all_months', action='store_true',
+                      help='create the reports of all months of YEAR as the '
+                           'pages of one PDF, MONTH is not needed')
+    opts.add_argument('--annual', dest='annual', action='store_true',
+                      help='with --all-months, HOURS are the hours of the whole '
+                           'year and spread across the months by their workdays')
+
     opts.add_argument('--institution', dest='institution', type=str,
-                      default='FB Mathematik/Informatik, Institut für Informatik',
                       help='the institute where you work')
 
     opts.add_argument('--signature', dest='signature', type=str,
                       default='', help='path and filename of signature picture')
 
+    opts.add_argument('--logo', dest='logo', type=str,
+                      help='path and filename of a logo picture to use instead '
+                           'of the built-in one')
+
+    opts.add_argument('--state', dest='state', type=str,
+                      help='federal state whose public holidays are no '
+                           'working days (e.g. NI, NW, BY, default: NI)')
+    opts.add_argument('--config', dest='config', type=str, metavar='FILE',
+                      help='JSON file of profiles, each with the state, '
+                           'institution, logo, stylesheet, labels, language '
+                           'and working-time rules of a department')
+    opts.add_argument('--config-profile', dest='config_profile', type=str,
+                      metavar='NAME',
+                      help='profile of --config to use (default: "default"), '
+                           'options given on the command line override it')
+    opts.add_argument('--holiday-cache', dest='holiday_cache', type=str,
+                      help='JSON file to keep computed holidays in between runs')
+
+    opts.add_argument('--seed', dest='seed', type=str,
+                      help='distribute the hours reproducibly: the days are '
+                           'drawn with a seed derived from SEED, the name and '
+                           'the month, so the same SEED gives the same report '
+                           'on every run')
+
+    opts.add_argument('--renderer', dest='renderer', type=str, default='wkhtmltopdf',
+                      choices=['wkhtmltopdf', 'native'],
+                      help='convert HTML with wkhtmltopdf or draw the PDF '
+                           'directly without external programs')
+
+    opts.add_argument('--batch', dest='batch', type=str, metavar='MANIFEST',
+                      help='CSV or JSONL file with one report per row '
+                           '(columns: firstname, lastname, hours, year, month '
+                           'and optionally first, last, monthly, institution, '
+                           'signature, logo, state, seed, begin, max_day, '
+                           'max_week, blocked, profile)')
+    opts.add_argument('--combined', dest='combined', type=str, metavar='FILE',
+                      help='write all reports of the batch as pages of one PDF '
+                           'file (needs --renderer native)')
+    opts.add_argument('--bookmarks', dest='bookmarks', action='store_true',
+                      help='add a bookmark per report to the combined PDF')
+    opts.add_argument('--serve', dest='serve', type=str, metavar='[HOST:]PORT',
+                      help='run as HTTP service, reports are requested with '
+                           'POST /report and a JSON object like a manifest row')
+    opts.add_argument('--workers', dest='workers', type=int,
+                      help='number of wkhtmltopdf processes in batch mode and '
+                           'reports built at once by the service '
+                           '(default: number of CPU cores)')
+    opts.add_argument('--check', dest='check', action='store_true',
+                      help='only validate the arguments or the manifest and '
+                           'compute the schedules, nothing is written')
+    opts.add_argument('--export', dest='export', type=str, metavar='FILE',
+                      help='only write the worked days of the report(s) to FILE, '
+                           'as CSV if it ends in .csv and JSON Lines otherwise '
+                           '(- for stdout), no HTML or PDF is created')
+    opts.add_argument('--processes', dest='processes', type=int,
+                      help='create the reports of a batch in this many worker '
+                           'processes, results are reported in manifest order')
+    opts.add_argument('--asyncio', dest='asyncio', action='store_true',
+                      help='convert a batch with one wkhtmltopdf process per '
+                           'report, at most WORKERS at once, while the HTML '
+                           'of the next reports is built')
+    opts.add_argument('--checkpoint', dest='checkpoint', type=str, metavar='FILE',
+                      help='record finished rows of a batch in FILE and skip '
+                           'them when the batch is run again, the file is '
+                           'removed once all rows succeeded')
+    opts.add_argument('--timeout', dest='timeout', type=float, default=120,
+                      help='seconds a single PDF conversion may take')
+    opts.add_argument('--cache', dest='cache', type=str, metavar='DIR',
+                      help='keep generated PDFs in DIR and reuse them while '
+                           'the inputs of a report do not change')
+    opts.add_argument('--cache-size', dest='cache_size', type=float, default=200,
+                      metavar='MB',
+                      help='remove the least recently used cache entries above '
+                           'this size (default: 200)')
+    opts.add_argument('--cache-list', dest='cache_list', action='store_true',
+                      help='list the entries of the cache and exit')
+    opts.add_argument('--cache-invalidate', dest='cache_invalidate', type=str,
+                      metavar='PATTERN',
+                      help='remove the cache entries whose report file matches '
+                           'PATTERN (e.g. "doe-*" or "*-2017-01.pdf") and exit')
+    opts.add_argument('--timings', dest='timings', type=str, nargs='?', const='-',
+                      metavar='FILE',
+                      help='print the time spent per stage and the HTML/PDF '
+                           'sizes to stderr, or write them as JSON to FILE')
+    opts.add_argument('--profile', dest='profile', type=str, metavar='FILE',
+                      help='write cProfile statistics of the run to FILE '
+                           '(read them with python3 -m pstats FILE)')
+
     args = opts.parse_args()
+    if args.combined and not args.batch:
+        opts.error('--combined can only be used with --batch')
+    if args.check and args.serve:
+        opts.error('--check can not be used with --serve')
+    if args.all_months and (args.batch or args.serve):
+        opts.error('--all-months can not be used with --batch or --serve')
+    if args.combined and args.renderer != 'native':
+        opts.error('--combined needs --renderer native')
+    if args.combined and (args.processes or args.checkpoint):
+        opts.error('--combined can not be used with --processes or --checkpoint')
+    if args.asyncio and (args.renderer != 'wkhtmltopdf' or args.processes or args.combined):
+        opts.error('--asyncio only works with --renderer wkhtmltopdf and without '
+                   '--processes or --combined')
+    if args.processes is not None and args.processes < 1:
+        opts.error('--processes needs at least 1')
+    if (args.cache_list or args.cache_invalidate) and not args.cache:
+        opts.error('--cache-list and --cache-invalidate need --cache DIR')
+    if args.batch or args.serve or args.cache_list or args.cache_invalidate:
+        return args
+
+    if args.annual and not args.all_months:
+        opts.error('--annual can only be used with --all-months')
+    missing = [name for name in REPORT_FIELDS if getattr(args, name) is None
+               and not (name == 'month' and args.all_months)]
+    if missing:
+        opts.error('the following arguments are required: {}'.format(
+            ', '.join(name.upper() for name in missing)))
+    if not args.monthly and not args.annual:
+        args.monthly = args.hours
+
+    return args
+
+
+# Batch mode
+
+REPORT_FIELDS = ['firstname', 'lastname', 'hours', 'year', 'month']
+OPTIONAL_FIELDS = ['first', 'last', 'monthly', 'institution', 'signature', 'logo', 'state', 'seed',
+                   'begin', 'max_day', 'max_week', 'blocked']
+INT_FIELDS = ['hours', 'year', 'month', 'first', 'last', 'monthly', 'begin', 'max_day', 'max_week']
+
+
+def read_manifest(filename):
+    """
+    Yields the rows of a batch manifest. Files ending in '.csv' are read as
+    CSV with a header line, everything else as JSON Lines. JSON rows are
+    yielded unparsed, so a broken line only fails its own report.
+    """
+    with open(filename, newline='', encoding='utf-8') as f:
+        if filename.lower().endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def manifest_rows(filename):
+    """Yields (row number, row) of a manifest."""
+    return enumerate(read_manifest(filename), 1)
+
+
+def row_digest(row):
+    """Identifies a manifest row by its content, so a checkpoint notices edits."""
+    if not isinstance(row, str):
+        row = json.dumps(row, sort_keys=True)
+    return hashlib.sha256(row.strip().encode('utf-8')).hexdigest()[:16]
+
+
+def read_checkpoint(filename):
+    """
+    Returns {row number: row digest} of the rows a checkpoint file lists as
+    done. Its lines are row number, row digest and report file, tab separated.
+    """
+    done = {}
+    try:
+        with open(filename, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    num, digest = line.split('\t')[:2]
+                    done[int(num)] = digest
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def report_args(row, defaults):
+    """
+    Args:
+        row (dict|str):             One manifest row, JSON lines as str.
+        defaults (Namespace):       Command line arguments, used for every
+                                    optional field missing in the row.
+
+    A row with a "profile" column takes the fields of that profile it does
+    not set itself from the profile instead of the command line.
+
+    Returns a Namespace that looks like the one of read_args().
+    """
+    if isinstance(row, str):
+        row = json.loads(row)
+
+    args = argparse.Namespace()
+    for name in REPORT_FIELDS:
+        if row.get(name) in (None, ''):
+            raise ValueError('missing column "{}"'.format(name))
+        setattr(args, name, row[name])
+    profile = None
+    if row.get('profile') not in (None, ''):
+        profile = get_profile(row['profile'])
+    args.config_profile = defaults.config_profile if profile is None else profile.name
+    for name in OPTIONAL_FIELDS:
+        value = row.get(name)
+        if value in (None, ''):
+            value = getattr(profile if profile and name in PROFILE_FIELDS else defaults, name)
+        setattr(args, name, value)
+    for name in INT_FIELDS:
+        if getattr(args, name) is not None:
+            setattr(args, name, int(getattr(args, name)))
     if not args.monthly:
-        args.monthly = args.hours    
+        args.monthly = args.hours
 
     return args
 
 
-def main():
-    lt = localtime()
-    jahr, monat, tag = lt[0:3]
+def run_batch(args, datum, cache=None):
+    start = perf_counter()
+    num_ok, num_cached, failed = 0, 0, []
+    filenames = {}
 
-    datum = '%02i.%02i.%04i' % (tag, monat, jahr)
-    args = read_args()
-    days = days_of_month(args.year, args.month)
+    done = {}
+    digests = {}
+    checkpoint = None
+    if args.checkpoint:
+        done = read_checkpoint(args.checkpoint)
+        if done:
+            print('Skipping the unchanged ones of {} rows already done according to "{}"'.format(
+                len(done), args.checkpoint))
+        checkpoint = open(args.checkpoint, 'a', encoding='utf-8')
 
-    def is_in_working_day_range(date):
-        return date.day >= args.first and date.day <= args.last
+    def unfinished_rows():
+        for num, row in manifest_rows(args.batch):
+            if checkpoint is not None:
+                digest = digests[num] = row_digest(row)
+                if done.get(num) == digest:
+                    continue
+                if num in done:
+                    print('[{}] Row changed since it was done, creating it again'.format(num))
+            yield num, row
+    rows = unfinished_rows()
 
-    days_in_range = list(filter(is_in_working_day_range, days))
-    workdays = list(filter(is_workday, days_in_range))
+    def report_result(num, error, cached=False):
+        nonlocal num_ok, num_cached
+        if error is None and checkpoint is not None:
+            checkpoint.write('{}\t{}\t{}\n'.format(num, digests.pop(num), filenames[num]))
+            checkpoint.flush()
+        if cached:
+            num_ok += 1
+            num_cached += 1
+            print('[{}] Report unchanged, reused "{}"'.format(num, filenames.pop(num)))
+        elif error is None:
+            num_ok += 1
+            print('[{}] Report written to "{}"'.format(num, filenames.pop(num)))
+        else:
+            failed.append(num)
+            filenames.pop(num, None)
+            print('[{}] FAILED: {}'.format(num, error))
 
-    # Distribute hours onto the days
-    used_days = random_distribution(workdays, args.hours)
+    try:
+        if args.combined:
+            with open(args.combined, 'wb') as f:
+                pdf = PDFDocument(f)
+                run_native(args, datum, rows, filenames, report_result, pdf)
+                pdf.close()
+        elif args.processes:
+            run_processes(args, datum, rows, filenames, report_result, cache)
+        elif args.asyncio:
+            run_async(args, datum, rows, filenames, report_result, cache)
+        elif args.renderer == 'native':
+            run_native(args, datum, rows, filenames, report_result, cache=cache)
+        else:
+            run_pool(args, datum, rows, filenames, report_result, cache)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    if checkpoint is not None and not failed:
+        # a complete run starts from the first row again next time
+        os.remove(args.checkpoint)
 
-    # Merge assigned days and non-workdays
-    day_to_hours = {day: hours for day, hours in used_days}
-    days_and_hours = [(day, day_to_hours.get(day, 0)) for day in days]
-    # Make output table
-    table = default_tabulation(days_and_hours, args.month, args.year)
+    elapsed = perf_counter() - start
+    total = num_ok + len(failed)
+    print('{} of {} reports written in {:.1f}s ({:.1f} reports/s){}'.format(
+        num_ok, total, elapsed, total / elapsed if elapsed else 0,
+        ', {} reused from cache'.format(num_cached) if num_cached else ''))
+    if failed:
+        print('Failed rows: {}'.format(', '.join(map(str, sorted(failed)))))
 
-    # Generate html output
+    return not failed
 
-    def val2str(val):
-        return "" if val is None else val
 
-    def hours2string(hours):
-        return "" if hours is None else '{:02d}:00'.format(hours)
+def run_native(args, datum, rows, filenames, report_result, pdf=None, cache=None):
+    """
+    Renders the reports with the native renderer, either into one file per
+    report or as pages of the combined document pdf.
+    """
+    for num, row in rows:
+        try:
+            report = report_args(row, args)
+            if pdf is None:
+                filenames[num] = report_filename(report)
+                if cache is not None and cache.fetch(report, filenames[num]):
+                    report_result(num, None, cached=True)
+                    continue
+                write_native_pdf(report, report_table(report), datum, filenames[num])
+                if cache is not None:
+                    cache.store(report, filenames[num])
+            else:
+                filenames[num] = '{}, page {}'.format(args.combined, len(pdf.pages) + 1)
+                page = render_native(report, report_table(report), datum, pdf)
+                if args.bookmarks:
+                    pdf.add_bookmark('{}, {} {:02d}/{:04d}'.format(
+                        report.lastname, report.firstname, report.month, report.year), page)
+        except Exception as e:
+            report_result(num, e)
+        else:
+            report_result(num, None)
 
-    column_heads = [
-        'Kalendartag',
-        'Beginn (Uhrzeit)',
-        'Pause (Dauer)',
-        'Ende (Uhrzeit)',
-        'Dauer (Summe)',
-        'aufgezeichnet am',
-        'Bemerkung'
-    ]
-
-    doc, tag, text = Doc().tagtext()
-
-    with tag('html'):
-        with tag('head'):
-            doc.asis('<meta charset="utf-8">')
-            with tag('style'):
-                doc.asis("""
-                    body { font-size:9pt; }
-                    table { width:100%; }
-                    .dates { border-collapse:collapse; }
-                    .dates td { border:1pt solid black; padding:3pt; }
-                    .formhead { width:40%; padding-right:10pt; }
-                    .formval { border-bottom:1pt solid black; }
-                    .sig { border-top:1pt solid black; width:45%; vertical-align:top; }
-                    td { font-size:9pt; }
-                """)
-        with tag('body'):
-            doc.stag('br')
-            doc.stag('br')
-            doc.stag('br')
-            doc.stag('img', src='data:image/svg+xml;base64,{}'.format(UNI_LOGO),
-                     style='width:150pt;')
-
-            with tag('h2'):
-                text('Erfassung der geleisteten Arbeitszeiten')
-            with tag('table'):
-                with tag('tr'):
-                    with tag('td', klass='formhead'):
-                        text('Name, Vorname der Hilfskraft')
-                    with tag('td', klass='formval'):
-                        text(args.lastname, ', ', args.firstname)
-                with tag('tr'):
-                    with tag('td', klass='formhead'):
-                        text('Fachbereich / Organisationseinheit')
-                    with tag('td', klass='formval'):
-                        text(args.institution)
-                with tag('tr'):
-                    with tag('td', klass='formhead'):
-                        text('Monat / Jahr')
-                    with tag('td', klass='formval'):
-                        text(args.month, ' / ', args.year)
-                with tag('tr'):
-                    with tag('td', klass='formhead'):
-                        text('Monatsarbeitszeit laut Arbeitsvertrag')
-                    with tag('td', klass='formval'):
-                        text(args.monthly, 'h')
-
-            for _ in range(3): doc.stag('br')
-
-            with tag('table', klass='dates'):
-                with tag('tr'):
-                    for column_head in column_heads[:-1]:
-                        with tag('td'):
-                            text(column_head)
-                    with tag('td', style='width:30%;'):
-                        text(column_heads[-1])
-
-                for row in table:
-                    with tag('tr'):
-                        with tag('td'):
-                            text(val2str(row['day']))
-                        with tag('td'):
-                            text(hours2string(row['begin']))
-                        with tag('td'):
-                            text(hours2string(row['pause']))
-                        with tag('td'):
-                            text(hours2string(row['end']))
-                        with tag('td'):
-                            text(hours2string(row['duration']))
-                        with tag('td'):
-                            text(str(row['noted'] or ""))
-                        with tag('td'):
-                            pass
-
-                # Sum row
-                with tag('tr'):
-                    with tag('td'):
-                        with tag('strong'):
-                            text('Summe')
-                    for _ in range(3):
-                        with tag('td'):
-                            pass
-                    with tag('td'):
-                        text(hours2string(args.hours))
-                    for _ in range(2):
-                        with tag('td'):
-                            pass
-
-            for _ in range(5): doc.stag('br')
-
-            with tag('table'):
-                with tag('tr'):
-                    with tag('td'):
-                        text(datum)
-                        if args.signature != '':
-                            sig = ''
-                            if args.signature[0] == '/':
-                                sig = args.signature
-                            else:
-                                sig = os.path.dirname(os.path.abspath(__file__)) + '/' + args.signature
-                            print(sig)
-                            doc.stag('img', src='{}'.format(sig), style='width:150pt;')
-                    with tag('td'):
-                        pass
-                with tag('tr'):
-                    with tag('td', klass='sig'):
-                        text('Datum, Unterschrift der Hilfskraft')
-                    with tag('td'):
-                        pass
-                    with tag('td', klass='sig'):
-                        text('Datum, Unterschrift der Leiterin / des Leiters der OE')
-                        doc.stag('br')
-                        text('alternativ: Vorgesetzte / Vorgesetzter')
 
-    # Generate report..
+def run_pool(args, datum, rows, filenames, report_result, cache=None):
+    pool = ConverterPool(args.workers, args.timeout)
+    if not args.logo:
+        # all reports without their own logo reference one shared file
+        args = argparse.Namespace(**vars(args))
+        args.logo = write_builtin_logo(pool.tmpdir)
+    reports = {}
+
+    def converted(num, error):
+        report = reports.pop(num)
+        if error is None and cache is not None:
+            cache.store(report, filenames[num])
+        report_result(num, error)
+
+    try:
+        for num, row in rows:
+            try:
+                report = report_args(row, args)
+                filenames[num] = report_filename(report)
+                if cache is not None and cache.fetch(report, filenames[num]):
+                    report_result(num, None, cached=True)
+                    continue
+                html = iter_html(report, report_table(report), datum)
+                reports[num] = report
+            except Exception as e:
+                report_result(num, e)
+                continue
+            pool.submit(num, html, filenames[num])
+
+            done = pool.result(block=False)
+            while done:
+                converted(*done)
+                done = pool.result(block=False)
+
+        while reports:
+            converted(*pool.result())
+    finally:
+        pool.close()
+
+
+def run_async(args, datum, rows, filenames, report_result, cache=None):
+    import asyncio
+    with tempfile.TemporaryDirectory(prefix='workhour-report-') as tmpdir:
+        if not args.logo:
+            args = argparse.Namespace(**vars(args))
+            args.logo = write_builtin_logo(tmpdir)
+        asyncio.run(convert_async(args, datum, rows, filenames, report_result, cache))
+
+
+async def convert_async(args, datum, rows, filenames, report_result, cache=None):
+    """
+    Builds the next report in a thread while up to args.workers wkhtmltopdf
+    processes convert the previous ones.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(args.workers or os.cpu_count() or 1)
+    tasks = set()
+
+    def build(num, row):
+        report = report_args(row, args)
+        filenames[num] = report_filename(report)
+        if cache is not None and cache.fetch(report, filenames[num]):
+            return report, None
+        return report, iter_html(report, report_table(report), datum)
+
+    async def convert(num, report, html):
+        try:
+            error = await write_pdf_async(html, filenames[num], args.timeout)
+        except Exception as e:
+            # also errors of html, which is only built while it is converted
+            error = e
+        finally:
+            slots.release()
+        if error is None and cache is not None:
+            cache.store(report, filenames[num])
+        report_result(num, error)
+
+    for num, row in rows:
+        try:
+            # in a thread, so the event loop keeps feeding the running conversions
+            report, html = await loop.run_in_executor(None, build, num, row)
+        except Exception as e:
+            report_result(num, e)
+            continue
+        if html is None:
+            report_result(num, None, cached=True)
+            continue
+
+        await slots.acquire()
+        task = asyncio.create_task(convert(num, report, html))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks)
+
+
+def init_worker(holiday_index, assets, profiles, timings):
+    global ASSET_DIR, TIMINGS
+    HOLIDAYS.update(holiday_index)
+    PROFILES.update(profiles)
+    ASSET_DIR = assets
+    TIMINGS = Timings() if timings else None
+
+
+def render_report(report, datum, renderer, filename):
+    """
+    Creates one report in a worker process. Returns its error message or
+    None, and with --timings what Timings.collected() recorded for it.
+    """
+    global TIMINGS
+    if TIMINGS is not None:
+        TIMINGS = Timings()
+    error = None
+    try:
+        table = report_table(report)
+        if renderer == 'native':
+            write_native_pdf(report, table, datum, filename)
+        elif not write_pdf(iter_html(report, table, datum), filename):
+            error = 'wkhtmltopdf failed'
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    return error, None if TIMINGS is None else TIMINGS.collected()
+
+
+def run_processes(args, datum, rows, filenames, report_result, cache=None):
+    """
+    Creates the reports in args.processes worker processes. Rows are read
+    from the manifest only while fewer than two per process are in flight,
+    and their results are reported in manifest order.
+
+    When a worker process dies, the rows in flight fail and the following
+    ones get a new pool of processes.
+    """
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    window = 2 * args.processes
+    pending = deque()   # (num, report, future, cached) in manifest order
+
+    def finished(error):
+        future = Future()
+        future.set_result((error, None))
+        return future
+
+    def start():
+        return ProcessPoolExecutor(args.processes, initializer=init_worker, initargs=(
+            dict(HOLIDAYS), asset_dir(), dict(PROFILES), TIMINGS is not None))
+
+    def report_oldest():
+        num, report, future, cached = pending.popleft()
+        try:
+            error, timings = future.result()
+        except BrokenProcessPool as e:
+            error, timings = e, None
+        if timings is not None and TIMINGS is not None:
+            TIMINGS.merge(timings)
+        if error is None and report is not None and cache is not None:
+            cache.store(report, filenames[num])
+        report_result(num, error, cached)
+
+    executor = start()
+    try:
+        for num, row in rows:
+            try:
+                report = report_args(row, args)
+                filenames[num] = report_filename(report)
+                if cache is not None and cache.fetch(report, filenames[num]):
+                    pending.append((num, None, finished(None), True))
+                else:
+                    job = (render_report, report, datum, args.renderer, filenames[num])
+                    try:
+                        future = executor.submit(*job)
+                    except BrokenProcessPool:
+                        executor.shutdown(wait=False)
+                        executor = start()
+                        future = executor.submit(*job)
+                    pending.append((num, report, future, False))
+            except Exception as e:
+                pending.append((num, None, finished(e), False))
+
+            while pending and (len(pending) >= window or pending[0][2].done()):
+                report_oldest()
+
+        while pending:
+            report_oldest()
+    finally:
+        executor.shutdown()
+
+
+# Year mode
+
+def year_workdays(year, state='NI'):
+    """Fills the workday index of all months of year in one pass over its days."""
+    days_off = holiday_dates(state, year)
+    months = [[] for _ in range(12)]
+    for ordinal in range(datetime.date(year, 1, 1).toordinal(),
+                         datetime.date(year, 12, 31).toordinal() + 1):
+        date = datetime.date.fromordinal(ordinal)
+        if date.weekday() < 5 and date not in days_off:
+            months[date.month - 1].append(date)
+    for month, dates in enumerate(months, 1):
+        WORKDAYS.setdefault((state, year, month), (dates, [date.day for date in dates]))
+
+
+def spread_hours(total, weights):
+    """Splits total hours into whole hours proportional to weights, summing up to total."""
+    whole = sum(weights)
+    if not whole:
+        raise ValueError('there are no workdays to spread {}h across'.format(total))
+    shares = [total * weight // whole for weight in weights]
+    largest_remainders = sorted(range(len(weights)), key=lambda i: -(total * weights[i] % whole))
+    for i in largest_remainders[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def year_reports(args):
+    """
+    Returns (args, table) for the twelve months of args.year. args.hours are
+    the hours of every month, or with args.annual the hours of the whole
+    year, which are spread across the months by their number of workdays
+    between args.first and args.last. Without --monthly the reports of an
+    annual contract show a twelfth of it as the monthly hours.
+    """
+    year_workdays(args.year, args.state)
+    if args.annual:
+        weights = []
+        for month in range(1, 13):
+            dates, _ = month_workdays(args.year, month, args.state)
+            blocked = blocked_dates(args.blocked, args.year, month)
+            weights.append(sum(1 for date in dates if args.first <= date.day <= args.last
+                               and date not in blocked))
+        hours = spread_hours(args.hours, weights)
+    else:
+        hours = [args.hours] * 12
+
+    reports = []
+    for month, month_hours in enumerate(hours, 1):
+        report = argparse.Namespace(**vars(args))
+        report.month = month
+        report.hours = month_hours
+        report.monthly = args.monthly or round(args.hours / 12)
+        reports.append((report, report_table(report)))
+    return reports
+
+
+def print_contracted(args, reports):
+    """
+    Compares the hours of the year with the contracted ones, which are 12
+    times --monthly, or HOURS of an annual contract without it.
+    """
+    total = sum(report.hours for report, _ in reports)
+    if args.monthly:
+        contracted = 12 * args.monthly
+        print('{}h in {}, contracted are 12 x {}h = {}h'.format(total, args.year, args.monthly, contracted))
+    else:
+        contracted = args.hours
+        print('{}h in {}, contracted are {}h'.format(total, args.year, contracted))
+    if total != contracted:
+        print('Warning: {}h {} than contracted'.format(
+            abs(total - contracted), 'more' if total > contracted else 'less'))
+
+
+def year_filename(args):
+    return '{}-{:04d}.pdf'.format(args.lastname.lower(), args.year)
+
+
+def run_year(args, datum):
+    """Writes the reports of all months of args.year as the pages of one PDF."""
+    try:
+        reports = year_reports(args)
+    except ValueError as e:
+        print('FAILED: {}'.format(e))
+        return False
+    print_contracted(args, reports)
+
+    filename = year_filename(args)
+    if args.renderer == 'native':
+        try:
+            with open(filename, 'wb') as f:
+                pdf = PDFDocument(f)
+                for report, table in reports:
+                    page = render_native(report, table, datum, pdf)
+                    pdf.add_bookmark('{:02d}/{:04d}'.format(report.month, report.year), page)
+                pdf.close()
+        except Exception:
+            os.remove(filename)
+            raise
+        ok = True
+    else:
+        ok = write_pdf_pages([iter_html(report, table, datum) for report, table in reports],
+                             filename)
+    if not ok:
+        print('Some error occurred during report generation :(')
+    else:
+        print('Report written to "{}"'.format(filename))
+    return ok
+
+
+# Report generation
+
+def blocked_dates(spec, year, month):
+    """
+    Returns the dates of a --blocked value like '3,10-14,2017-02-01:2017-02-03'
+    as a set. Plain day numbers and day ranges are days of month of year,
+    dates and date ranges (from:to) are ISO dates.
+    """
+    blocked = set()
+    for token in str(spec or '').replace(' ', '').split(','):
+        try:
+            if ':' in token:
+                start, end = map(datetime.date.fromisoformat, token.split(':'))
+                blocked.update(datetime.date.fromordinal(ordinal)
+                               for ordinal in range(start.toordinal(), end.toordinal() + 1))
+            elif re.fullmatch(r'\d{4}-\d\d-\d\d', token):
+                blocked.add(datetime.date.fromisoformat(token))
+            elif '-' in token:
+                first, last = map(int, token.split('-'))
+                blocked.update(datetime.date(year, month, day) for day in range(first, last + 1))
+            elif token:
+                blocked.add(datetime.date(year, month, int(token)))
+        except ValueError:
+            raise ValueError('invalid blocked day "{}"'.format(token))
+    return blocked
+
 
-    report_filename = '{}-{:04d}-{:02d}.pdf'.format(
+def report_table(args):
+    days = days_of_month(args.year, args.month)
+
+    # Distribute hours onto the free workdays between first and last
+    used_days, = distribute_hours(
+        [(args.year, args.month, args.hours, args.first, args.last, args.state,
+          blocked_dates(args.blocked, args.year, args.month))],
+        seed=report_seed(args), max_hours_per_day=args.max_day,
+        max_hours_per_week=args.max_week)
+    if isinstance(used_days, ValueError):
+        raise used_days
+
+    # Merge assigned days and non-workdays
+    day_to_hours = {day: hours for day, hours in used_days}
+    days_and_hours = [(day, day_to_hours.get(day, 0)) for day in days]
+    # Make output table
+    table = default_tabulation(days_and_hours, args.month, args.year,
+                               get_profile(args.config_profile).language, args.begin)
+    late = [row for row in table if row.end is not None and row.end > 24]
+    if late:
+        raise ValueError('starting at {}h, {} would end after midnight'.format(
+            args.begin, late[0].day))
+    return table
+
+
+def report_filename(args):
+    return '{}-{:04d}-{:02d}.pdf'.format(
         args.lastname.lower(),
         args.year,
         args.month
     )
+
+
+# Columns of --export, one record per worked day
+EXPORT_FIELDS = ['firstname', 'lastname', 'year', 'month', 'date', 'begin', 'end', 'pause', 'duration']
+
+
+def export_records(args, table):
+    """Yields the worked days of a report as dicts with the EXPORT_FIELDS."""
+    for row in table:
+        if row.duration is not None:
+            yield {
+                'firstname': args.firstname,
+                'lastname': args.lastname,
+                'year': args.year,
+                'month': args.month,
+                'date': row.date.isoformat(),
+                'begin': row.begin,
+                'end': row.end,
+                'pause': row.pause,
+                'duration': row.duration,
+            }
+
+
+def run_export(args):
+    """
+    Writes the worked days of the report, or of all reports of the batch,
+    to args.export without building HTML or PDF. Files ending in '.csv' get
+    CSV, everything else JSON Lines, '-' is stdout. Messages go to stderr.
+    """
+    if args.export == '-':
+        out = sys.stdout
+    else:
+        out = open(args.export, 'w', newline='', encoding='utf-8')
+    if args.export.lower().endswith('.csv'):
+        writer = csv.DictWriter(out, EXPORT_FIELDS)
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(record):
+            out.write(json.dumps(record) + '\n')
+
+    try:
+        if not args.batch:
+            try:
+                reports = year_reports(args) if args.all_months else [(args, report_table(args))]
+            except ValueError as e:
+                print('FAILED: {}'.format(e), file=sys.stderr)
+                return False
+            for report, table in reports:
+                for record in export_records(report, table):
+                    write(record)
+            return True
+
+        num_ok, failed = 0, []
+        for num, row in manifest_rows(args.batch):
+            try:
+                report = report_args(row, args)
+                for record in export_records(report, report_table(report)):
+                    write(record)
+            except Exception as e:
+                failed.append(num)
+                print('[{}] FAILED: {}'.format(num, e), file=sys.stderr)
+            else:
+                num_ok += 1
+        print('{} of {} reports exported'.format(num_ok, num_ok + len(failed)), file=sys.stderr)
+        if failed:
+            print('Failed rows: {}'.format(', '.join(map(str, failed))), file=sys.stderr)
+        return not failed
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+@instrumented('wkhtmltopdf')
+def write_pdf(html, report_filename):
+    """
+    Converts html, a str or an iterable of str pieces like iter_html()
+    yields, streaming the pieces into wkhtmltopdf's stdin.
+    """
     proc = subprocess.Popen(['wkhtmltopdf', '-', '--enable-local-file-access', report_filename], stdin=subprocess.PIPE)
-    proc.communicate(input=bytes(doc.getvalue(), encoding='utf-8'))
+    try:
+        size = write_html(html, proc.stdin)
+        proc.stdin.close()
+    except BrokenPipeError:
+        # wkhtmltopdf gave up early, its exit code tells
+        size = 0
+    except BaseException:
+        # building the HTML failed, the truncated document must not be converted
+        proc.kill()
+        proc.wait()
+        remove_partial(report_filename)
+        raise
+    proc.wait()
+
+    if TIMINGS is not None:
+        count('html_bytes', size)
+        if proc.returncode == 0:
+            count('pdf_bytes', os.path.getsize(report_filename))
+    return proc.returncode == 0
+
+
+def remove_partial(report_filename):
+    """Removes what a killed wkhtmltopdf may have written of report_filename."""
+    try:
+        os.remove(report_filename)
+    except FileNotFoundError:
+        pass
+
+
+async def write_pdf_async(html, report_filename, timeout=120):
+    """Like write_pdf(), but returns an error message or None."""
+    import asyncio
+
+    async def feed(proc):
+        size = 0
+        try:
+            for chunk in html_chunks(html):
+                data = chunk.encode('utf-8')
+                proc.stdin.write(data)
+                size += len(data)
+                await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        return size
+
+    async def converted(proc):
+        size, stderr = await asyncio.gather(feed(proc), proc.stderr.read())
+        await proc.wait()
+        return size, stderr
+
+    with timed('wkhtmltopdf'):
+        proc = await asyncio.create_subprocess_exec(
+            'wkhtmltopdf', '-', '--enable-local-file-access', report_filename,
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            size, stderr = await asyncio.wait_for(converted(proc), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return 'timed out after {}s'.format(timeout)
+        except BaseException:
+            # like in write_pdf(), also ends the read of stderr
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            remove_partial(report_filename)
+            raise
 
     if proc.returncode != 0:
-        print('Some error occurred during report generation :(')
-        exit(1)
-    else:
-        print('Report written to "{}"'.format(report_filename))
+        errors = [line for line in stderr.decode('utf-8', 'replace').splitlines()
+                  if line.startswith(('Error', 'Exit with code'))]
+        return errors[-1] if errors else 'wkhtmltopdf exited with code {}'.format(proc.returncode)
+    if TIMINGS is not None:
+        count('html_bytes', size)
+        count('pdf_bytes', os.path.getsize(report_filename))
+    return None
+
+
+@instrumented('wkhtmltopdf')
+def write_pdf_pages(htmls, report_filename):
+    """
+    Converts HTML documents into the pages of one PDF with one wkhtmltopdf
+    run. Every document is streamed into its own temporary file.
+    """
+    with tempfile.TemporaryDirectory(prefix='workhour-report-') as tmpdir:
+        filenames = []
+        for num, html in enumerate(htmls, 1):
+            filenames.append(os.path.join(tmpdir, '{:02d}.html'.format(num)))
+            with open(filenames[-1], 'wb') as f:
+                count('html_bytes', write_html(html, f))
+        ok = subprocess.call(
+            ['wkhtmltopdf', '--enable-local-file-access'] + filenames + [report_filename]) == 0
+    if ok:
+        count('pdf_bytes', os.path.getsize(report_filename))
+    return ok
+
+
+class ConverterPool:
+    """
+    Keeps a number of wkhtmltopdf processes alive. Every worker reads its
+    conversions from stdin (--read-args-from-stdin), so WebKit is started
+    once per worker instead of once per report.
+
+    Args:
+        workers (int):      Number of wkhtmltopdf processes, defaults to the
+                            number of CPU cores.
+        timeout (float):    Seconds a single conversion may take before its
+                            worker is killed and restarted.
+
+    wkhtmltopdf prints the "Exit with code ..." line of a failed conversion
+    after its "Done", and handles the lines of stdin one after another. So a
+    conversion is only reported once the next one printed its first line,
+    or once wkhtmltopdf ended. A worker without a next job ends its process
+    for that and starts a new one with the next job.
+    """
+
+    def __init__(self, workers=None, timeout=120):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.jobs = queue.Queue(maxsize=2 * self.workers)
+        self.results = queue.Queue()
+        self.tmpdir = tempfile.mkdtemp(prefix='workhour-')
+        self.threads = [threading.Thread(target=self._work, daemon=True)
+                        for _ in range(self.workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, key, html, report_filename):
+        """
+        Queues a report, blocks while all workers are busy and the queue is
+        full. The result is later returned with the same key.
+        """
+        self.jobs.put((key, html, report_filename, self.results))
+
+    def convert(self, html, report_filename):
+        """
+        Converts a single report and waits for it, can be called from many
+        threads at once. Returns the error or None on success.
+        """
+        done = queue.Queue(maxsize=1)
+        self.jobs.put((None, html, report_filename, done))
+        return done.get()[1]
+
+    def result(self, block=True):
+        """
+        Returns (key, error) of the next finished report, error is None on
+        success. Returns None if block is False and nothing is finished yet.
+        """
+        try:
+            return self.results.get(block)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _start(self):
+        proc = subprocess.Popen(['wkhtmltopdf', '--read-args-from-stdin'],
+                                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
+        lines = queue.Queue()
+
+        def read_stderr():
+            for line in iter(proc.stderr.readline, b''):
+                for part in line.replace(b'\r', b'\n').splitlines():
+                    lines.put(part.decode('utf-8', 'replace').strip())
+            lines.put(None)
+
+        threading.Thread(target=read_stderr, daemon=True).start()
+        return proc, lines
+
+    def _work(self):
+        proc = lines = None
+        # (key, results, report_filename) of the conversion that printed
+        # "Done" last, until it is known whether an exit line follows
+        pending = None
+
+        def finish(error):
+            nonlocal pending
+            key, results, report_filename = pending
+            pending = None
+            if error is None and TIMINGS is not None:
+                count('pdf_bytes', os.path.getsize(report_filename))
+            results.put((key, error))
+
+        def stop():
+            """Ends proc after its last lines, returns the exit line among them."""
+            nonlocal proc, lines
+            error = None
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+            deadline = monotonic() + self.timeout
+            while True:
+                try:
+                    line = lines.get(timeout=max(deadline - monotonic(), 0))
+                except queue.Empty:
+                    proc.kill()
+                    break
+                if line is None:
+                    break
+                if line.startswith('Exit with code'):
+                    error = line
+            proc.wait()
+            proc = lines = None
+            return error
+
+        def convert(html, report_filename):
+            """Returns the error of the conversion, or None once it printed "Done"."""
+            fd, html_filename = tempfile.mkstemp(suffix='.html', dir=self.tmpdir)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    count('html_bytes', write_html(html, f))
+                job_args = ['--enable-local-file-access', html_filename, report_filename]
+                proc.stdin.write(bytes(' '.join(map(stdin_quote, job_args)) + '\n',
+                                       encoding='utf-8'))
+                proc.stdin.flush()
+
+                deadline = monotonic() + self.timeout
+                error = 'wkhtmltopdf exited with code {}'
+                while True:
+                    try:
+                        line = lines.get(timeout=max(deadline - monotonic(), 0))
+                    except queue.Empty:
+                        if pending is not None:
+                            # nothing at all came after its "Done"
+                            finish(None)
+                        # waited for, so the next job starts a new process
+                        proc.kill()
+                        proc.wait()
+                        return 'timed out after {}s'.format(self.timeout)
+                    if pending is not None:
+                        # the first line after "Done" tells whether it failed
+                        if line is not None and line.startswith('Exit with code'):
+                            finish(line)
+                            continue
+                        finish(None)
+                    if line is None:
+                        return error.format(proc.wait())
+                    if line == 'Done':
+                        return None
+                    if line.startswith('Exit with code'):
+                        return line
+                    if line.startswith('Error'):
+                        error = line
+            finally:
+                os.remove(html_filename)
+
+        while True:
+            if pending is not None and self.jobs.empty():
+                finish(stop())
+            job = self.jobs.get()
+            if job is None:
+                break
+            key, html, report_filename, results = job
+
+            try:
+                if proc is not None and proc.poll() is not None:
+                    error = stop()
+                    if pending is not None:
+                        finish(error)
+                if proc is None:
+                    proc, lines = self._start()
+                with timed('wkhtmltopdf'):
+                    error = convert(html, report_filename)
+            except Exception as e:
+                # also errors of html, when it is a generator
+                error = str(e) or type(e).__name__
+            if error is None:
+                pending = (key, results, report_filename)
+            else:
+                results.put((key, error))
+
+        if proc is not None:
+            error = stop()
+            if pending is not None:
+                finish(error)
+
+
+def stdin_quote(arg):
+    """Escapes an argument for a line read by wkhtmltopdf --read-args-from-stdin."""
+    return ''.join('\\' + c if c in ' \t\\"\'' else c for c in arg)
+
+
+# HTML template
+#
+# The report is one fixed form, so its static parts are put together once
+# per profile and every report only fills in its escaped values.
+
+COLUMN_HEADS = [
+    'Kalendartag',
+    'Beginn (Uhrzeit)',
+    'Pause (Dauer)',
+    'Ende (Uhrzeit)',
+    'Dauer (Summe)',
+    'aufgezeichnet am',
+    'Bemerkung'
+]
+
+# Texts of the form, a profile can replace any of them
+LABELS = {
+    'title': 'Erfassung der geleisteten Arbeitszeiten',
+    'name': 'Name, Vorname der Hilfskraft',
+    'institution': 'Fachbereich / Organisationseinheit',
+    'month': 'Monat / Jahr',
+    'monthly': 'Monatsarbeitszeit laut Arbeitsvertrag',
+    'columns': COLUMN_HEADS,
+    'sum': 'Summe',
+    'signature': 'Datum, Unterschrift der Hilfskraft',
+    'supervisor': 'Datum, Unterschrift der Leiterin / des Leiters der OE',
+    'supervisor_alt': 'alternativ: Vorgesetzte / Vorgesetzter',
+}
+
+HTML_STYLE = """
+                    body { font-size:9pt; }
+                    table { width:100%; }
+                    .dates { border-collapse:collapse; }
+                    .dates td { border:1pt solid black; padding:3pt; }
+                    .formhead { width:40%; padding-right:10pt; }
+                    .formval { border-bottom:1pt solid black; }
+                    .sig { border-top:1pt solid black; width:45%; vertical-align:top; }
+                    td { font-size:9pt; }
+                """
+
+
+def template_text(value):
+    """Escapes a label for HTML and for str.format()."""
+    return html_escape(value).replace('{', '{{').replace('}', '}}')
+
+
+def html_form(labels):
+    """The form and the table head, the values are left as format fields."""
+    text = {key: template_text(value) for key, value in labels.items() if key != 'columns'}
+    columns = [template_text(head) for head in labels['columns']]
+    return (
+        '<h2>{}</h2>'.format(text['title']) +
+        '<table>'
+        '<tr><td class="formhead">' + text['name'] + '</td>'
+        '<td class="formval">{lastname}, {firstname}</td></tr>'
+        '<tr><td class="formhead">' + text['institution'] + '</td>'
+        '<td class="formval">{institution}</td></tr>'
+        '<tr><td class="formhead">' + text['month'] + '</td>'
+        '<td class="formval">{month} / {year}</td></tr>'
+        '<tr><td class="formhead">' + text['monthly'] + '</td>'
+        '<td class="formval">{monthly}h</td></tr>'
+        '</table>'
+        '<br /><br /><br />'
+        '<table class="dates"><tr>'
+        + ''.join('<td>{}</td>'.format(head) for head in columns[:-1])
+        + '<td style="width:30%;">{}</td></tr>'.format(columns[-1])
+    )
+
+
+HTML_ROW = ('<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td>'
+            '<td>{}</td><td></td></tr>')
+
+
+def html_foot(labels):
+    """The sum row and the signatures, hours, datum and signature are format fields."""
+    text = {key: template_text(value) for key, value in labels.items() if key != 'columns'}
+    return (
+        '<tr><td><strong>' + text['sum'] + '</strong></td><td></td><td></td><td></td>'
+        '<td>{hours}</td><td></td><td></td></tr>'
+        '</table>'
+        '<br /><br /><br /><br /><br />'
+        '<table>'
+        '<tr><td>{datum}{signature}</td><td></td></tr>'
+        '<tr><td class="sig">' + text['signature'] + '</td><td></td>'
+        '<td class="sig">' + text['supervisor'] +
+        '<br />' + text['supervisor_alt'] + '</td></tr>'
+        '</table>'
+        '</body></html>'
+    )
+
+
+HTML_SIGNATURE = '<img src="{}" style="width:150pt;" />'
+
+
+# Configuration profiles
+#
+# A profile bundles what differs between departments: the holiday state,
+# the institution, the labels and language of the form, the stylesheet,
+# the logo and the working-time rules. Profiles are read from the JSON
+# file of --config, an object of profile names and their settings, e.g.
+#
+#   {"default": {"institution": "FB Physik"},
+#    "bayern": {"state": "BY", "logo": "tum.svg", "max_week": 40,
+#               "language": "en", "labels": {"sum": "Total"}}}
+#
+# Settings a profile leaves out keep their built-in values. Paths are
+# relative to the config file.
+
+# Settings of a profile and their built-in values
+PROFILE_SETTINGS = {
+    'state': 'NI',
+    'institution': 'FB Mathematik/Informatik, Institut für Informatik',
+    'logo': '',
+    'begin': 8,
+    'max_day': 10,
+    'max_week': 48,
+    'language': 'de',
+    'stylesheet': '',
+    'labels': {},
+}
+# Settings that are report arguments as well, command line options and
+# manifest columns take precedence over the profile
+PROFILE_FIELDS = ['state', 'institution', 'logo', 'begin', 'max_day', 'max_week']
+
+
+class Profile:
+    """
+    The settings of one profile, checked and with its HTML templates and
+    head put together once, so reports only look it up by name.
+    """
+
+    def __init__(self, name, settings=None, directory=''):
+        settings = dict(settings or {})
+        unknown = sorted(set(settings) - set(PROFILE_SETTINGS))
+        if unknown:
+            raise ValueError('unknown setting(s) {} in profile "{}"'.format(', '.join(unknown), name))
+        self.name = name
+        for key, default in PROFILE_SETTINGS.items():
+            setattr(self, key, settings.get(key, default))
+        for key in ['begin', 'max_day', 'max_week']:
+            setattr(self, key, int(getattr(self, key)))
+
+        if self.language not in WEEKDAY_LABELS:
+            raise ValueError('unknown language "{}" in profile "{}", known are {}'.format(
+                self.language, name, ', '.join(sorted(WEEKDAY_LABELS))))
+        unknown = sorted(set(self.labels) - set(LABELS))
+        if unknown:
+            raise ValueError('unknown label(s) {} in profile "{}"'.format(', '.join(unknown), name))
+        self.labels = dict(LABELS, **self.labels)
+        if len(self.labels['columns']) != len(COLUMN_HEADS):
+            raise ValueError('profile "{}" needs {} column labels'.format(name, len(COLUMN_HEADS)))
+
+        if self.logo:
+            self.logo = os.path.join(directory, self.logo)
+        self.style = HTML_STYLE
+        if self.stylesheet:
+            with open(os.path.join(directory, self.stylesheet), encoding='utf-8') as f:
+                self.style = f.read()
+
+        self.form = html_form(self.labels)
+        self.foot = html_foot(self.labels)
+        self.heads = {}
+        # Part of the cache key of its reports, as the profile changes their output
+        self.digest = hashlib.sha256(json.dumps(
+            [self.language, self.labels, self.style], sort_keys=True).encode('utf-8')).hexdigest()
+
+    def html_head(self, logo=''):
+        """
+        Everything up to the form, including the style and the logo. The logo
+        is referenced by its path, the built-in one is inlined if logo is ''.
+        """
+        if logo not in self.heads:
+            src = attr_escape(logo) if logo else 'data:image/svg+xml;base64,' + uni_logo()
+            self.heads[logo] = ''.join([
+                '<html><head><meta charset="utf-8"><style>', self.style,
+                '</style></head><body><br /><br /><br />',
+                '<img src="', src, '" style="width:150pt;" />'
+            ])
+        return self.heads[logo]
+
+
+# Profiles by name, filled once per process by load_config()
+PROFILES = {}
+
+
+def load_config(filename):
+    """Creates the profiles of a config file, see above."""
+    with open(filename, encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError('expected an object of profiles')
+    directory = os.path.dirname(os.path.abspath(filename))
+    for name, settings in config.items():
+        PROFILES[name] = Profile(name, settings, directory)
+
+
+def get_profile(name=None):
+    """Returns the profile name, the built-in one is "default" unless the config replaces it."""
+    name = name or 'default'
+    if name not in PROFILES:
+        if name != 'default':
+            raise ValueError('unknown profile "{}"'.format(name))
+        PROFILES[name] = Profile(name)
+    return PROFILES[name]
+
+
+def apply_profile(args):
+    """Fills the report arguments the command line left out from the profile of args."""
+    profile = get_profile(args.config_profile)
+    args.config_profile = profile.name
+    for name in PROFILE_FIELDS:
+        if getattr(args, name) is None:
+            setattr(args, name, getattr(profile, name))
+
+
+def write_builtin_logo(directory):
+    """
+    Writes the built-in logo into directory, so reports can share the file
+    instead of each inlining it. Returns the path of the file.
+    """
+    filename = os.path.join(directory, 'uni-logo.svg')
+    with open(filename, 'wb') as f:
+        f.write(base64.b64decode(uni_logo()))
+    return filename
+
+
+def html_escape(value):
+    return str(value).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def attr_escape(value):
+    return str(value).replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;')
+
+
+def asset_path(filename):
+    if filename == '':
+        return ''
+    if filename[0] == '/':
+        return filename
+    return os.path.dirname(os.path.abspath(__file__)) + '/' + filename
+
+
+def signature_path(args):
+    """Returns the signature image the renderers should use, '' for none."""
+    if not args.signature:
+        return ''
+    return normalized_signature(asset_path(args.signature))
+
+
+@instrumented('html')
+def iter_html(args, table, datum):
+    """
+    Yields the HTML of a report in pieces of at most one table row, so it
+    can be written to a file or pipe without holding the whole document.
+    """
+
+    def hours2string(hours):
+        return "" if hours is None else '{:02d}:00'.format(hours)
+
+    signature = ''
+    sig = signature_path(args)
+    if sig:
+        signature = HTML_SIGNATURE.format(attr_escape(sig))
+
+    profile = get_profile(args.config_profile)
+    yield profile.html_head(asset_path(args.logo))
+    yield profile.form.format(
+        lastname=html_escape(args.lastname),
+        firstname=html_escape(args.firstname),
+        institution=html_escape(args.institution),
+        month=html_escape(args.month),
+        year=html_escape(args.year),
+        monthly=html_escape(args.monthly))
+    for row in table:
+        yield HTML_ROW.format(
+            html_escape("" if row.day is None else row.day),
+            hours2string(row.begin),
+            hours2string(row.pause),
+            hours2string(row.end),
+            hours2string(row.duration),
+            html_escape(row.noted or ""))
+    yield profile.foot.format(
+        hours=hours2string(args.hours),
+        datum=html_escape(datum),
+        signature=signature)
+
+
+def build_html(args, table, datum):
+    # Generate html output
+    return ''.join(iter_html(args, table, datum))
+
+
+def html_chunks(html):
+    """Returns html, a str or an iterable of str pieces, as an iterable of pieces."""
+    return (html,) if isinstance(html, str) else html
+
+
+def write_html(html, f):
+    """Writes html (see html_chunks()) UTF-8 encoded to the binary file f, returns the bytes."""
+    size = 0
+    for chunk in html_chunks(html):
+        data = chunk.encode('utf-8')
+        f.write(data)
+        size += len(data)
+    return size
+
+
+# Native PDF renderer
+#
+# Draws the same form as build_html() directly with PDF operators, so no
+# wkhtmltopdf process is needed. Coordinates are CSS points from the top
+# left corner of the page and scaled by ZOOM, which roughly matches the
+# shrinking wkhtmltopdf applies to the HTML.
+
+PAGE_WIDTH, PAGE_HEIGHT = 595.28, 841.89    # A4
+MARGIN = 28.35                              # 10mm, like wkhtmltopdf
+ZOOM = 0.8
+CONTENT_WIDTH = (PAGE_WIDTH - 2 * MARGIN) / ZOOM
+FONT_SIZE = 9
+LINE = FONT_SIZE * 1.2
+ROW = LINE + 2 * 3                          # .dates td { padding:3pt; }
+IMAGE_WIDTH = 150
+
+# Relative column widths of the day table, the last column has 30%
+COLUMN_WIDTHS = [0.16] + [0.108] * 5 + [0.30]
+
+
+def pdf_string(value):
+    data = str(value).encode('cp1252', 'replace')
+    data = data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return b'(' + data + b')'
+
+
+def pdf_number(value):
+    return ('%.6f' % value).rstrip('0').rstrip('.').encode('ascii')
+
+
+class PDFCanvas:
+    """
+    Collects the content stream of one page. All positions are given in
+    CSS points from the top left corner of the content area.
+    """
+
+    def __init__(self):
+        self.ops = [b'q', b' '.join(map(pdf_number, [
+            ZOOM, 0, 0, ZOOM, MARGIN, PAGE_HEIGHT - MARGIN])) + b' cm']
+        self.xobjects = {}
+
+    def text(self, x, y, value, size=FONT_SIZE, bold=False):
+        """Writes value with its baseline at y."""
+        self.ops.append(b'BT /%s %s Tf %s %s Td %s Tj ET' % (
+            b'F2' if bold else b'F1', pdf_number(size),
+            pdf_number(x), pdf_number(-y), pdf_string(value)))
+
+    def line(self, x1, y1, x2, y2, width=1):
+        self.ops.append(b'%s w %s %s m %s %s l S' % (
+            pdf_number(width), pdf_number(x1), pdf_number(-y1),
+            pdf_number(x2), pdf_number(-y2)))
+
+    def rect(self, x, y, width, height, line_width=1):
+        self.ops.append(b'%s w %s %s %s %s re S' % (
+            pdf_number(line_width), pdf_number(x), pdf_number(-y - height),
+            pdf_number(width), pdf_number(height)))
+
+    def image(self, name, xobject, x, y, width, height):
+        """Draws an XObject of the size 1x1 into the given box."""
+        self.xobjects[name] = xobject
+        self.ops.append(b'q %s 0 0 %s %s %s cm /%s Do Q' % (
+            pdf_number(width), pdf_number(height), pdf_number(x),
+            pdf_number(-y - height), name.encode('ascii')))
+
+    def getvalue(self):
+        return b'\n'.join(self.ops + [b'Q'])
+
+
+class PDFDocument:
+    """
+    Writes a PDF file object by object, so pages do not need to be kept in
+    memory once they are added. Fonts and XObjects are stored once per file
+    and shared by all pages.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.pos = 0
+        self.offsets = []
+        self.pages = []
+        self.bookmarks = []
+        self.xobjects = {}
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self.catalog = self._reserve()
+        self.pages_id = self._reserve()
+        self.fonts = b' '.join(
+            b'/%s %d 0 R' % (name, self.add_object(
+                b'<< /Type /Font /Subtype /Type1 /BaseFont /%s '
+                b'/Encoding /WinAnsiEncoding >>' % font))
+            for name, font in [(b'F1', b'Helvetica'), (b'F2', b'Helvetica-Bold')])
+
+    def _write(self, data):
+        self.f.write(data)
+        self.pos += len(data)
+
+    def _reserve(self):
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def add_object(self, data, num=None):
+        num = num or self._reserve()
+        self.offsets[num - 1] = self.pos
+        self._write(b'%d 0 obj\n%s\nendobj\n' % (num, data))
+        return num
+
+    def add_stream(self, entries, data, compress=True):
+        if compress:
+            data = zlib.compress(data)
+            entries += b' /Filter /FlateDecode'
+        return self.add_object(b'<< %s /Length %d >>\nstream\n%s\nendstream' % (
+            entries, len(data), data))
+
+    def add_page(self, canvas):
+        for name, xobject in canvas.xobjects.items():
+            if name not in self.xobjects:
+                self.xobjects[name] = xobject(self)
+        content = self.add_stream(b'', canvas.getvalue())
+        xobjects = b' '.join(b'/%s %d 0 R' % (name.encode('ascii'), self.xobjects[name])
+                             for name in canvas.xobjects)
+        page = self.add_object(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] /Contents %d 0 R '
+            b'/Resources << /Font << %s >> /XObject << %s >> >> >>' % (
+                self.pages_id, pdf_number(PAGE_WIDTH), pdf_number(PAGE_HEIGHT),
+                content, self.fonts, xobjects))
+        self.pages.append(page)
+        return page
+
+    def add_bookmark(self, title, page):
+        self.bookmarks.append((title, page))
+
+    def _write_outlines(self):
+        outlines = self._reserve()
+        items = [self._reserve() for _ in self.bookmarks]
+        for i, (num, (title, page)) in enumerate(zip(items, self.bookmarks)):
+            links = b''
+            if i > 0:
+                links += b' /Prev %d 0 R' % items[i - 1]
+            if i + 1 < len(items):
+                links += b' /Next %d 0 R' % items[i + 1]
+            self.add_object(b'<< /Title <feff%s> /Parent %d 0 R%s /Dest [%d 0 R /Fit] >>' % (
+                title.encode('utf-16-be').hex().encode('ascii'), outlines, links, page), num)
+        self.add_object(b'<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>' % (
+            items[0], items[-1], len(items)), outlines)
+        return outlines
+
+    def close(self):
+        catalog = b'/Type /Catalog /Pages %d 0 R' % self.pages_id
+        if self.bookmarks:
+            catalog += b' /Outlines %d 0 R /PageMode /UseOutlines' % self._write_outlines()
+        self.add_object(b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            b' '.join(b'%d 0 R' % page for page in self.pages), len(self.pages)),
+            self.pages_id)
+        self.add_object(b'<< %s >>' % catalog, self.catalog)
+        xref = self.pos
+        self._write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(self.offsets) + 1))
+        self._write(b''.join(b'%010d 00000 n \n' % offset for offset in self.offsets))
+        self._write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(self.offsets) + 1, self.catalog, xref))
+
+
+# Images
+
+SVG_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+
+
+SVG_COLORS = {'black': '000', 'white': 'fff', 'gray': '808080', 'grey': '808080',
+              'red': 'f00', 'green': '008000', 'blue': '00f'}
+
+
+def svg_color(value):
+    value = value.strip().lower()
+    if value.startswith('rgb('):
+        return [float(c) / 255 for c in re.findall(SVG_NUMBER, value)[:3]]
+    value = SVG_COLORS.get(value, value).lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return [int(value[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+
+
+def svg_path_ops(d):
+    """Translates the data of an SVG path into PDF path operators."""
+    tokens = re.findall(r'[A-Za-z]|' + SVG_NUMBER, d)
+    ops = []
+    x = y = start_x = start_y = 0
+    ctrl_x = ctrl_y = None
+    i, command = 0, None
+
+    def number():
+        nonlocal i
+        i += 1
+        return float(tokens[i - 1])
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        rel = command.islower()
+        c = command.upper()
+        dx, dy = (x, y) if rel else (0, 0)
+
+        if c == 'Z':
+            ops.append(b'h')
+            x, y = start_x, start_y
+            command = None
+            continue
+        elif c in 'ML':
+            x, y = dx + number(), dy + number()
+            if c == 'M':
+                start_x, start_y = x, y
+                ops.append(b'%s %s m' % (pdf_number(x), pdf_number(y)))
+                # further coordinate pairs are implicit lineto commands
+                command = 'l' if rel else 'L'
+            else:
+                ops.append(b'%s %s l' % (pdf_number(x), pdf_number(y)))
+        elif c == 'H':
+            x = dx + number()
+            ops.append(b'%s %s l' % (pdf_number(x), pdf_number(y)))
+        elif c == 'V':
+            y = dy + number()
+            ops.append(b'%s %s l' % (pdf_number(x), pdf_number(y)))
+        elif c in 'CS':
+            if c == 'C':
+                x1, y1 = dx + number(), dy + number()
+            elif ctrl_x is None:
+                x1, y1 = x, y
+            else:
+                x1, y1 = 2 * x - ctrl_x, 2 * y - ctrl_y
+            x2, y2 = dx + number(), dy + number()
+            x, y = dx + number(), dy + number()
+            ops.append(b' '.join(map(pdf_number, [x1, y1, x2, y2, x, y])) + b' c')
+            ctrl_x, ctrl_y = x2, y2
+            continue
+        else:
+            raise ValueError('unsupported SVG path command "{}"'.format(command))
+        ctrl_x = ctrl_y = None
+
+    return ops
+
+
+def svg_xobject(svg):
+    """
+    Returns (width, height, make_xobject) for an SVG image. Only <path>
+    elements are drawn, which is all the logo and most exported signatures
+    consist of.
+    """
+    root = re.search(r'<svg\b([^>]*)>', svg).group(1)
+    viewbox = re.search(r'viewBox="([^"]*)"', root)
+    if viewbox:
+        _, _, width, height = map(float, re.findall(SVG_NUMBER, viewbox.group(1)))
+    else:
+        width, height = (float(re.search(r'\b%s="(%s)' % (name, SVG_NUMBER), root).group(1))
+                         for name in ('width', 'height'))
+
+    # Flip the y axis and scale to 1x1 like an image XObject
+    ops = [b'%s 0 0 %s 0 1 cm' % (pdf_number(1 / width), pdf_number(-1 / height))]
+    for attrs in re.findall(r'<path\b([^>]*)>', svg):
+        attrs = dict(re.findall(r'([\w-]+)="([^"]*)"', attrs))
+        fill = attrs.get('fill', '#000000')
+        stroke = attrs.get('stroke', 'none')
+        ops.append(b'q')
+        if fill != 'none':
+            ops.append(b'%s %s %s rg' % tuple(map(pdf_number, svg_color(fill))))
+        if stroke != 'none':
+            ops.append(b'%s %s %s RG %s w' % (
+                tuple(map(pdf_number, svg_color(stroke))) +
+                (pdf_number(float(attrs.get('stroke-width', 1))),)))
+        ops.extend(svg_path_ops(attrs.get('d', '')))
+        ops.append({(True, True): b'B', (True, False): b'f',
+                    (False, True): b'S', (False, False): b'n'}[
+                        fill != 'none', stroke != 'none'])
+        ops.append(b'Q')
+    content = b'\n'.join(ops)
+
+    def make_xobject(pdf):
+        return pdf.add_stream(b'/Type /XObject /Subtype /Form /BBox [0 0 1 1]', content)
+
+    return width, height, make_xobject
+
+
+def jpeg_xobject(data):
+    pos = 2
+    while pos < len(data):
+        marker, length = data[pos + 1], int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            height = int.from_bytes(data[pos + 5:pos + 7], 'big')
+            width = int.from_bytes(data[pos + 7:pos + 9], 'big')
+            components = data[pos + 9]
+            break
+        pos += 2 + length
+    else:
+        raise ValueError('no JPEG frame header found')
+    colorspace = {1: b'/DeviceGray', 3: b'/DeviceRGB', 4: b'/DeviceCMYK'}[components]
+
+    def make_xobject(pdf):
+        return pdf.add_stream(
+            b'/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s '
+            b'/BitsPerComponent 8 /Filter /DCTDecode' % (width, height, colorspace),
+            data, compress=False)
+
+    return width, height, make_xobject
+
+
+def png_unfilter(raw, width, height, bpp):
+    stride = width * bpp
+    out = bytearray()
+    prev = bytearray(stride)
+    pos = 0
+    for _ in range(height):
+        filter_type = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if filter_type == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xff
+        elif filter_type == 2:
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xff
+        elif filter_type == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xff
+        elif filter_type == 4:
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                line[i] = (line[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xff
+        out += line
+        prev = line
+    return out
+
+
+def png_chunks(data):
+    """Yields (kind, body) of the chunks of a PNG file."""
+    pos = 8
+    while pos < len(data):
+        length = int.from_bytes(data[pos:pos + 4], 'big')
+        yield data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def png_chunk(kind, body):
+    return len(body).to_bytes(4, 'big') + kind + body + zlib.crc32(kind + body).to_bytes(4, 'big')
+
+
+def png_header(data):
+    """Returns (width, height, depth, color type, interlace, palette, idat) of a PNG file."""
+    idat, palette = [], b''
+    for kind, body in png_chunks(data):
+        if kind == b'IHDR':
+            width, height = int.from_bytes(body[0:4], 'big'), int.from_bytes(body[4:8], 'big')
+            depth, color_type, interlace = body[8], body[9], body[12]
+        elif kind == b'PLTE':
+            palette = body
+        elif kind == b'IDAT':
+            idat.append(body)
+    return width, height, depth, color_type, interlace, palette, b''.join(idat)
+
+
+def png_xobject(data):
+    width, height, depth, color_type, interlace, palette, idat = png_header(data)
+    if interlace:
+        raise ValueError('interlaced PNG images are not supported')
+    colors = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    colorspace = {0: b'/DeviceGray', 2: b'/DeviceRGB', 3: b'[/Indexed /DeviceRGB %d <%s>]' % (
+        len(palette) // 3 - 1, palette.hex().encode('ascii')), 4: b'/DeviceGray', 6: b'/DeviceRGB'}[color_type]
+    image = b'/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s ' \
+            b'/BitsPerComponent %d' % (width, height, colorspace, depth)
+
+    if color_type in (0, 2, 3):
+        # PDF understands the PNG row filters itself
+        def make_xobject(pdf):
+            return pdf.add_stream(image + b' /Filter /FlateDecode /DecodeParms << '
+                                  b'/Predictor 15 /Colors %d /BitsPerComponent %d /Columns %d >>' % (
+                                      colors, depth, width), idat, compress=False)
+
+        return width, height, make_xobject
+
+    if depth != 8:
+        raise ValueError('PNG images with alpha channel need 8 bits per channel')
+    pixels = png_unfilter(zlib.decompress(idat), width, height, colors)
+    alpha = pixels[colors - 1::colors]
+    color = bytearray(len(pixels) // colors * (colors - 1))
+    for i in range(colors - 1):
+        color[i::colors - 1] = pixels[i::colors]
+
+    def make_xobject(pdf):
+        smask = pdf.add_stream(b'/Type /XObject /Subtype /Image /Width %d /Height %d '
+                               b'/ColorSpace /DeviceGray /BitsPerComponent 8' % (
+                                   width, height), bytes(alpha))
+        return pdf.add_stream(image + b' /SMask %d 0 R' % smask, bytes(color))
+
+    return width, height, make_xobject
+
+
+def load_image(filename):
+    """Returns (width, height, make_xobject) for an SVG, PNG or JPEG file."""
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if data.startswith(b'\x89PNG'):
+        return png_xobject(data)
+    if data.startswith(b'\xff\xd8'):
+        return jpeg_xobject(data)
+    return svg_xobject(data.decode('utf-8'))
+
+
+def scale_pixels(pixels, width, height, bpp, new_width, new_height, average=True):
+    """
+    Shrinks 8 bit pixels to new_width x new_height. Every new pixel is the
+    average of the block of pixels it covers, or its top left pixel if
+    average is False (for palette indices).
+    """
+    stride = width * bpp
+    xs = [x * width // new_width for x in range(new_width + 1)]
+    ys = [y * height // new_height for y in range(new_height + 1)]
+    out = bytearray()
+    for y0, y1 in zip(ys, ys[1:]):
+        if not average:
+            row = pixels[y0 * stride:(y0 + 1) * stride]
+            for x0 in xs[:-1]:
+                out += row[x0 * bpp:(x0 + 1) * bpp]
+            continue
+        sums = pixels[y0 * stride:(y0 + 1) * stride]
+        for y in range(y0 + 1, y1):
+            sums = [a + b for a, b in zip(sums, pixels[y * stride:(y + 1) * stride])]
+        for x0, x1 in zip(xs, xs[1:]):
+            n = (x1 - x0) * (y1 - y0)
+            for c in range(bpp):
+                out.append((sum(sums[x0 * bpp + c:x1 * bpp:bpp]) + n // 2) // n)
+    return out
+
+
+def scale_png(data, max_width):
+    """Returns the PNG file data scaled down to max_width pixels, or unchanged if not wider."""
+    width, height, depth, color_type, interlace, palette, idat = png_header(data)
+    if width <= max_width or depth != 8 or interlace:
+        return data
+    bpp = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    new_height = max(1, round(height * max_width / width))
+    pixels = scale_pixels(png_unfilter(zlib.decompress(idat), width, height, bpp),
+                          width, height, bpp, max_width, new_height, average=color_type != 3)
+
+    stride = max_width * bpp
+    raw = bytearray()
+    for pos in range(0, len(pixels), stride):
+        raw.append(0)
+        raw += pixels[pos:pos + stride]
+    chunks = [png_chunk(b'IHDR', max_width.to_bytes(4, 'big') + new_height.to_bytes(4, 'big') +
+                        bytes([8, color_type, 0, 0, 0]))]
+    chunks += [png_chunk(kind, body) for kind, body in png_chunks(data) if kind in (b'PLTE', b'tRNS')]
+    chunks += [png_chunk(b'IDAT', zlib.compress(bytes(raw), 9)), png_chunk(b'IEND', b'')]
+    return data[:8] + b''.join(chunks)
+
+
+LOGOS = {}
+
+
+def logo_image(filename=''):
+    """Like load_image(), but cached per process. '' is the built-in logo."""
+    if filename not in LOGOS:
+        if filename:
+            LOGOS[filename] = load_image(filename)
+        else:
+            LOGOS[filename] = svg_xobject(base64.b64decode(uni_logo()).decode('utf-8'))
+    return LOGOS[filename]
+
+
+# Signatures are printed IMAGE_WIDTH points wide, their normalized copies
+# keep 300 dpi of that
+SIGNATURE_PIXELS = IMAGE_WIDTH * 300 // 72
+
+# Directory of the normalized signatures, a temporary one unless --cache is used
+ASSET_DIR = None
+SIGNATURES = {}
+
+
+def asset_dir():
+    global ASSET_DIR
+    if ASSET_DIR is None:
+        ASSET_DIR = tempfile.mkdtemp(prefix='workhour-assets-')
+        atexit.register(shutil.rmtree, ASSET_DIR, True)
+    return ASSET_DIR
+
+
+def normalized_signature(filename):
+    """
+    Returns the path of a copy of the signature image that is scaled down to
+    the size it is printed at. The copy is made once per file content and
+    shared by all reports and renderers, SVG and JPEG files are copied as
+    they are.
+    """
+    digest = file_digest(filename)
+    if digest == 'missing':
+        return filename
+    if digest not in SIGNATURES:
+        with open(filename, 'rb') as f:
+            data = f.read()
+        extension = '.png' if data.startswith(b'\x89PNG') else \
+            '.jpg' if data.startswith(b'\xff\xd8') else '.svg'
+        path = os.path.join(asset_dir(), 'signature-' + digest[:32] + extension)
+        if not os.path.exists(path):
+            if extension == '.png':
+                data = scale_png(data, SIGNATURE_PIXELS)
+            fd, tmp = tempfile.mkstemp(dir=asset_dir())
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        SIGNATURES[digest] = path
+    return SIGNATURES[digest]
+
+
+@instrumented('native')
+def render_native(args, table, datum, pdf):
+    """Draws the report of one person and month as a new page of pdf."""
+
+    def hours2string(hours):
+        return "" if hours is None else '{:02d}:00'.format(hours)
+
+    labels = get_profile(args.config_profile).labels
+    page = PDFCanvas()
+    y = 3 * LINE
+
+    logo_file = asset_path(args.logo)
+    width, height, logo = logo_image(logo_file)
+    height = IMAGE_WIDTH * height / width
+    page.image('Logo' + hashlib.sha1(logo_file.encode('utf-8')).hexdigest()[:12] if logo_file else 'Logo',
+               logo, 0, y, IMAGE_WIDTH, height)
+    y += height
+
+    # h2, 1.5em with 0.83em margins
+    y += 0.83 * 1.5 * FONT_SIZE + 1.5 * FONT_SIZE
+    page.text(0, y, labels['title'], 1.5 * FONT_SIZE, bold=True)
+    y += 0.83 * 1.5 * FONT_SIZE + 0.2 * 1.5 * FONT_SIZE
+
+    value_x = 0.4 * CONTENT_WIDTH
+    for head, value in [
+            (labels['name'], '{}, {}'.format(args.lastname, args.firstname)),
+            (labels['institution'], args.institution),
+            (labels['month'], '{} / {}'.format(args.month, args.year)),
+            (labels['monthly'], '{}h'.format(args.monthly))]:
+        y += LINE + 2
+        page.text(0, y - 3, head)
+        page.text(value_x, y - 3, value)
+        page.line(value_x, y, CONTENT_WIDTH, y)
+
+    y += 3 * LINE
+
+    columns = [0]
+    for width in COLUMN_WIDTHS:
+        columns.append(columns[-1] + width * CONTENT_WIDTH)
+
+    def table_row(values, height=ROW, bold_first=False):
+        nonlocal y
+        for x, next_x, value in zip(columns, columns[1:], values):
+            page.rect(x, y, next_x - x, height)
+            for num, part in enumerate(value):
+                page.text(x + 3, y + 3 + (num + 0.8) * LINE, part,
+                          bold=bold_first and x == 0)
+        y += height
+
+    table_row([head.rsplit(' ', 1) if ' ' in head else [head] for head in labels['columns']],
+              2 * LINE + 6)
+    for row in table:
+        table_row([[value] for value in [
+            "" if row.day is None else row.day,
+            hours2string(row.begin),
+            hours2string(row.pause),
+            hours2string(row.end),
+            hours2string(row.duration),
+            str(row.noted or ""),
+            ""]])
+    table_row([[labels['sum']], [], [], [], [hours2string(args.hours)], [], []], bold_first=True)
+
+    y += 5 * LINE
+
+    signature = signature_path(args)
+    if signature:
+        width, height, image = logo_image(signature)
+        height = IMAGE_WIDTH * height / width
+        text_width = 0.6 * FONT_SIZE * len(datum)
+        y += max(LINE, height)
+        page.text(0, y - 0.2 * LINE, datum)
+        # named after the normalized file, so pages with the same signature share it
+        name = 'Sig' + hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]
+        page.image(name, image, text_width, y - height, IMAGE_WIDTH, height)
+    else:
+        y += LINE
+        page.text(0, y - 0.2 * LINE, datum)
+
+    y += 4
+    sig_width = 0.45 * CONTENT_WIDTH
+    page.line(0, y, sig_width, y)
+    page.line(CONTENT_WIDTH - sig_width, y, CONTENT_WIDTH, y)
+    page.text(0, y + LINE, labels['signature'])
+    page.text(CONTENT_WIDTH - sig_width, y + LINE, labels['supervisor'])
+    page.text(CONTENT_WIDTH - sig_width, y + 2 * LINE, labels['supervisor_alt'])
+
+    return pdf.add_page(page)
+
+
+def write_native_pdf(args, table, datum, report_filename):
+    try:
+        with open(report_filename, 'wb') as f:
+            pdf = PDFDocument(f)
+            render_native(args, table, datum, pdf)
+            pdf.close()
+            count('pdf_bytes', pdf.pos)
+    except Exception:
+        os.remove(report_filename)
+        raise
+
+
+# Output cache
+
+# Part of every cache key, bump it whenever the HTML template or the native
+# renderer produce different output for the same inputs.
+TEMPLATE_VERSION = 1
+
+# Content hashes of signature and logo files per (path, size, mtime)
+FILE_DIGESTS = {}
+
+
+def file_digest(filename):
+    if not filename:
+        return ''
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return 'missing'
+    key = (filename, stat.st_size, stat.st_mtime_ns)
+    if key not in FILE_DIGESTS:
+        with open(filename, 'rb') as f:
+            FILE_DIGESTS[key] = hashlib.sha256(f.read()).hexdigest()
+    return FILE_DIGESTS[key]
+
+
+class ReportCache:
+    """
+    Keeps finished PDFs in a directory, named by a hash of everything the
+    report depends on. A report whose inputs did not change since the last
+    run is copied from there instead of being generated again.
+
+    The creation date printed on the report is not part of the key, a
+    reused report keeps the date it was first generated on.
+
+    index.json lists the entries with their report file name, size and last
+    use. When the entries get bigger than max_bytes the least recently used
+    ones are removed.
+    """
+
+    def __init__(self, directory, max_bytes, renderer):
+        self.directory = directory
+        self.renderer = renderer
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self._path('index.json'), encoding='utf-8') as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+        self.changed = False
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def key(self, args):
+        inputs = [
+            TEMPLATE_VERSION, self.renderer,
+            args.firstname, args.lastname, args.hours, args.year, args.month,
+            args.first, args.last, args.monthly, args.institution, args.state,
+            report_seed(args), args.begin, args.max_day, args.max_week,
+            sorted(date.isoformat() for date in blocked_dates(args.blocked, args.year, args.month)),
+            file_digest(asset_path(args.signature)), file_digest(asset_path(args.logo)),
+            get_profile(args.config_profile).digest,
+        ]
+        return hashlib.sha256(json.dumps(inputs).encode('utf-8')).hexdigest()
+
+    def fetch(self, args, report_filename):
+        """Copies the cached PDF of args to report_filename, returns False on a miss."""
+        key = self.key(args)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return False
+            try:
+                shutil.copyfile(self._path(key + '.pdf'), report_filename)
+            except FileNotFoundError:
+                del self.index[key]
+                self.changed = True
+                return False
+            entry['used'] = time()
+            self.changed = True
+        return True
+
+    def store(self, args, report_filename):
+        key = self.key(args)
+        with self.lock:
+            shutil.copyfile(report_filename, self._path(key + '.pdf'))
+            self.index[key] = {
+                'report': os.path.basename(report_filename),
+                'size': os.path.getsize(report_filename),
+                'used': time(),
+            }
+            self.changed = True
+
+    def remove(self, key):
+        try:
+            os.remove(self._path(key + '.pdf'))
+        except FileNotFoundError:
+            pass
+        del self.index[key]
+        self.changed = True
+
+    def invalidate(self, pattern):
+        """Removes the entries whose report file name matches pattern, returns their number."""
+        with self.lock:
+            keys = [key for key, entry in self.index.items() if fnmatch(entry['report'], pattern)]
+            for key in keys:
+                self.remove(key)
+        return len(keys)
+
+    def evict(self):
+        with self.lock:
+            total = sum(entry['size'] for entry in self.index.values())
+            for key, entry in sorted(self.index.items(), key=lambda item: item[1]['used']):
+                if total <= self.max_bytes:
+                    break
+                total -= entry['size']
+                self.remove(key)
+
+    def save(self):
+        self.evict()
+        if not self.changed:
+            return
+        filename = self._path('index.json')
+        with open(filename + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(filename + '.tmp', filename)
+        self.changed = False
+
+    def print_entries(self):
+        entries = sorted(self.index.items(), key=lambda item: item[1]['report'])
+        for key, entry in entries:
+            print('{}  {:>9}  {}  {}'.format(
+                key[:16], entry['size'], strftime('%Y-%m-%d %H:%M', localtime(entry['used'])),
+                entry['report']))
+        print('{} entries, {} bytes'.format(len(entries), sum(entry['size'] for _, entry in entries)))
+
+
+# Report service
+
+def today():
+    lt = localtime()
+    jahr, monat, tag = lt[0:3]
+    return '%02i.%02i.%04i' % (tag, monat, jahr)
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, ceil(p / 100 * len(values)) - 1))]
+
+
+class ReportService:
+    """
+    Serves reports over HTTP. POST /report takes a JSON object with the
+    same fields as a batch manifest row plus an optional "format" ("pdf",
+    "html" or "json") and returns the report, "json" being just the worked
+    days. GET /stats returns request latencies.
+
+    At most args.workers reports are built at the same time, further
+    requests wait up to args.timeout seconds for a free slot.
+
+    Like ReportHandler it is mixed into its http.server class by serve(),
+    so http.server is only imported when the service runs.
+    """
+
+    daemon_threads = True
+    max_latencies = 10000
+
+    def __init__(self, address, args, handler):
+        super().__init__(address, handler)
+        self.args = args
+        self.slots = threading.BoundedSemaphore(args.workers or os.cpu_count() or 1)
+        self.pool = None
+        if args.renderer == 'wkhtmltopdf':
+            self.pool = ConverterPool(args.workers, args.timeout)
+            if not args.logo:
+                self.args = argparse.Namespace(**vars(args))
+                self.args.logo = write_builtin_logo(self.pool.tmpdir)
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+
+        # Warm up the holiday index for the years most requests are about
+        year = localtime()[0]
+        for y in range(year - 1, year + 2):
+            holiday_dates(args.state, y)
+
+    def server_close(self):
+        super().server_close()
+        if self.pool is not None:
+            self.pool.close()
+
+    def record(self, endpoint, status, seconds):
+        with self.lock:
+            latencies = self.latencies.setdefault(endpoint, deque(maxlen=self.max_latencies))
+            latencies.append(seconds)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def stats(self):
+        with self.lock:
+            latencies = {endpoint: sorted(values) for endpoint, values in self.latencies.items()}
+            statuses = dict(self.statuses)
+        return {
+            'status': statuses,
+            'latency_ms': {
+                endpoint: {
+                    'count': len(values),
+                    'mean': 1000 * sum(values) / len(values),
+                    'p50': 1000 * percentile(values, 50),
+                    'p90': 1000 * percentile(values, 90),
+                    'p99': 1000 * percentile(values, 99),
+                    'max': 1000 * values[-1],
+                } for endpoint, values in latencies.items() if values
+            }
+        }
+
+    def render(self, row):
+        """Returns (content type, body) for one report request."""
+        report = report_args(row, self.args)
+        table = report_table(report)
+        datum = today()
+
+        if row.get('format', 'pdf') == 'html':
+            return 'text/html; charset=utf-8', build_html(report, table, datum).encode('utf-8')
+        if row.get('format', 'pdf') == 'json':
+            return 'application/json', json.dumps(list(export_records(report, table))).encode('utf-8')
+        if row.get('format', 'pdf') != 'pdf':
+            raise ValueError('unknown format "{}"'.format(row['format']))
+
+        if self.pool is None:
+            f = io.BytesIO()
+            pdf = PDFDocument(f)
+            render_native(report, table, datum, pdf)
+            pdf.close()
+            return 'application/pdf', f.getvalue()
+
+        fd, filename = tempfile.mkstemp(suffix='.pdf', dir=self.pool.tmpdir)
+        os.close(fd)
+        try:
+            error = self.pool.convert(iter_html(report, table, datum), filename)
+            if error:
+                raise RuntimeError(error)
+            with open(filename, 'rb') as f:
+                return 'application/pdf', f.read()
+        finally:
+            os.remove(filename)
+
+
+class ReportHandler:
+
+    def send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def send_json(self, status, value):
+        return self.send(status, 'application/json', json.dumps(value).encode('utf-8'))
+
+    def do_GET(self):
+        start = perf_counter()
+        if self.path == '/stats':
+            status = self.send_json(200, self.server.stats())
+        else:
+            status = self.send_json(404, {'error': 'not found'})
+        self.server.record('GET ' + self.path, status, perf_counter() - start)
+
+    def do_POST(self):
+        start = perf_counter()
+        if self.path != '/report':
+            status = self.send_json(404, {'error': 'not found'})
+        elif not self.server.slots.acquire(timeout=self.server.args.timeout):
+            status = self.send_json(503, {'error': 'too many requests'})
+        else:
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    row = json.loads(self.rfile.read(length))
+                    if not isinstance(row, dict):
+                        raise ValueError('expected a JSON object')
+                    content_type, body = self.server.render(row)
+                except (ValueError, TypeError) as e:
+                    status = self.send_json(400, {'error': str(e)})
+                except Exception as e:
+                    status = self.send_json(500, {'error': str(e)})
+                else:
+                    status = self.send(200, content_type, body)
+            finally:
+                self.server.slots.release()
+        self.server.record('POST /report', status, perf_counter() - start)
+
+
+def serve(args):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(ReportHandler, BaseHTTPRequestHandler):
+        pass
+
+    class Service(ReportService, ThreadingHTTPServer):
+        pass
+
+    host, _, port = args.serve.rpartition(':')
+    service = Service((host or '127.0.0.1', int(port)), args, Handler)
+    print('Serving reports on http://{}:{}/report'.format(*service.server_address))
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.server_close()
+
+
+def check_summary(report, table):
+    days = sum(1 for row in table if row.duration is not None)
+    return '{}, {} {:02d}/{:04d}: {}h on {} days'.format(
+        report.lastname, report.firstname, report.month, report.year, report.hours, days)
+
+
+def run_check(args):
+    """
+    Validates the report(s) and computes their schedules, but neither
+    builds HTML nor writes a PDF.
+    """
+    if not args.batch:
+        try:
+            reports = year_reports(args) if args.all_months else [(args, report_table(args))]
+        except ValueError as e:
+            print('FAILED: {}'.format(e))
+            return False
+        for report, table in reports:
+            print('OK {}'.format(check_summary(report, table)))
+        if args.all_months:
+            print_contracted(args, reports)
+        return True
+
+    num_ok, failed = 0, []
+    for num, row in manifest_rows(args.batch):
+        try:
+            report = report_args(row, args)
+            summary = check_summary(report, report_table(report))
+        except Exception as e:
+            failed.append(num)
+            print('[{}] FAILED: {}'.format(num, e))
+        else:
+            num_ok += 1
+            print('[{}] OK {}'.format(num, summary))
+    print('{} of {} rows are valid'.format(num_ok, num_ok + len(failed)))
+    if failed:
+        print('Failed rows: {}'.format(', '.join(map(str, failed))))
+    return not failed
+
+
+def run(args, datum, cache=None):
+    """Creates the report(s) of args, returns False if any of them failed."""
+    if args.serve:
+        serve(args)
+        return True
+
+    if args.cache_list:
+        cache.print_entries()
+        return True
+    if args.cache_invalidate:
+        print('{} cache entries removed'.format(cache.invalidate(args.cache_invalidate)))
+        return True
+
+    if args.check:
+        return run_check(args)
+    if args.export:
+        return run_export(args)
+    if args.all_months:
+        return run_year(args, datum)
+    if args.batch:
+        return run_batch(args, datum, cache)
+
+    filename = report_filename(args)
+    try:
+        # the cache key already needs the blocked dates
+        if cache is not None and cache.fetch(args, filename):
+            print('Report unchanged, reused "{}"'.format(filename))
+            return True
+        table = report_table(args)
+    except ValueError as e:
+        print('FAILED: {}'.format(e))
+        return False
+
+    # Generate report..
+
+    if args.renderer == 'native':
+        try:
+            write_native_pdf(args, table, datum, filename)
+        except Exception as e:
+            # e.g. a missing or unsupported logo or signature, like in batch mode
+            print('FAILED: {}'.format(e))
+            return False
+        ok = True
+    else:
+        ok = write_pdf(iter_html(args, table, datum), filename)
+    if not ok:
+        print('Some error occurred during report generation :(')
+    else:
+        print('Report written to "{}"'.format(filename))
+        if cache is not None:
+            cache.store(args, filename)
+    return ok
+
+
+def main():
+    global TIMINGS, ASSET_DIR
+    datum = today()
+    args = read_args()
+    if args.timings:
+        TIMINGS = Timings()
+    if args.holiday_cache:
+        load_holiday_cache(args.holiday_cache)
+    try:
+        if args.config:
+            load_config(args.config)
+        apply_profile(args)
+    except (OSError, ValueError) as e:
+        print('Invalid configuration: {}'.format(e))
+        exit(1)
+    cache = None
+    if args.cache:
+        cache = ReportCache(args.cache, int(args.cache_size * 1024 * 1024), args.renderer)
+        ASSET_DIR = os.path.join(args.cache, 'signatures')
+        os.makedirs(ASSET_DIR, exist_ok=True)
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        ok = run(args, datum, cache)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if TIMINGS is not None:
+            TIMINGS.write(args.timings)
+
+    if args.holiday_cache:
+        save_holiday_cache(args.holiday_cache)
+    if cache is not None:
+        cache.save()
+    if not ok:
+        exit(1)
 
 
 if __name__ == '__main__':